@@ -1,189 +1,176 @@
-import streamlit as st
-import PyPDF2
-import pandas as pd
-from datetime import date, timedelta
-import json
-import joblib
-import logging
-from backend.llm_utils import generate_tasks_with_llm,example
-from backend.classification_embeddings import get_embeddings
-
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
-
-def extract_text_from_pdfs(files):
-    text = ""
-    for file in files:
-        try:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        except Exception as e:
-            logger.error(f"Error reading PDF file {file.name}: {str(e)}")
-            st.warning(f"⚠️ Error reading PDF file {file.name}: {str(e)}")
-    if not text.strip() and files:
-        st.warning("⚠️ No text extracted from uploaded PDFs. Please check the files.")
-    return text
-
-def get_working_days(start, end):
-    working = []
-    current = start
-    while current <= end:
-        if current.weekday() < 5:  # Monday to Friday
-            working.append(current)
-        current += timedelta(days=1)
-    return working
-
-@st.cache_resource
-def load_model(model_path):
-    try:
-        return joblib.load(model_path)
-    except Exception as e:
-        logger.error(f"Error loading model {model_path}: {str(e)}")
-        st.error(f"❌ Error loading model: {str(e)}. Please ensure the model file exists.")
-        return None
-
-def classify_module(task_name, model):
-    try:
-        embeddings = get_embeddings()
-        query_result = embeddings.embed_query(task_name)
-        return model.predict([query_result])[0]
-    except Exception as e:
-        logger.error(f"Classification Error for task '{task_name}': {str(e)}")
-        st.error(f"Classification Error for task '{task_name}': {str(e)}")
-        return "Uncategorized"
-
-# Streamlit UI
-st.set_page_config(page_title="Project Work Planner", layout="wide", page_icon="assets/project-logo.png")
-st.title("📅 AI Project Analysis")
-
-# File Upload & Description
-col1, col2, col3 = st.columns([5, 0.2, 2])
-with col1:
-    st.session_state.project_name = st.text_input("Project Name")
-    col1_1, col1_2 = st.columns([5, 2])
-    st.session_state.description = col1_1.text_area(
-        "📝 Project Description / Specifications",
-        height=160,
-        key="desc_input",
-        placeholder="Enter a brief overview of your project (or type 'na' / 'none' if not available)"
-    )
-    st.session_state.files_uploaded = col1_2.file_uploader(
-        "Upload Project Files (PDF)", type="pdf", accept_multiple_files=True, key="uploadedFile"
-    )
-
-with col3:
-    try:
-        st.image("assets/AI-project.png", width=290, use_container_width=False)
-    except Exception as e:
-        logger.warning(f"Error loading image: {str(e)}")
-        st.warning("⚠️ Could not load logo image")
-
-col4, col5 = st.columns([1, 1])
-project_domain = col4.selectbox("Project Domain", ["Game Development", "Web Development", "App Development" , "Custom"])
-st.session_state.sprint = col5.selectbox("Sprint Timeline", ["Weekly", "Biweekly", "Monthly"])
-
-# Date Inputs
-with st.form("setup_form"):
-    col6, col7 = st.columns([1, 1])
-    start_date = col6.date_input("📅 Project Start Date", value=date.today())
-    end_date = col7.date_input("🏁 Estimated End Date")
-    submitted = st.form_submit_button("✅ Confirm Date Range")
-
-# Save Dates and Load Model
-if submitted:
-    if start_date >= end_date:
-        st.error("⚠️ End date must be after start date.")
-        st.stop()
-    if start_date < date.today():
-        st.warning("⚠️ Start date is in the past. Please confirm this is intentional.")
-    if (end_date - start_date).days > 365:
-        st.warning("⚠️ Date range exceeds 1 year. Please confirm this is intentional.")
-    st.session_state.start_date = start_date
-    st.session_state.end_date = end_date
-
-    # Load appropriate model based on domain
-    if project_domain == "Game Development":
-        model = load_model("models/game_dev.pkl")
-    elif project_domain in ["Web Development", "App Development"]:
-        model = load_model("models/web_dev.pkl")
-    else:
-        model = load_model("models/modelsvm.pkl")
-
-    if model is None:
-        st.error("❌ Failed to load model. Please check the model files.")
-        st.stop()
-    st.session_state.model = model  # Store model for potential reuse
-
-# Holiday Selection & Task Generation
-if "start_date" in st.session_state and "end_date" in st.session_state:
-    with st.form("task_generation_form"):
-        all_working_days = get_working_days(st.session_state.start_date, st.session_state.end_date)
-        selected_holidays = st.multiselect(
-            "🎉 Select Custom Holidays (Optional)",
-            options=all_working_days,
-            format_func=lambda x: x.strftime("%A %d-%b-%Y"),
-            key="selected_holidays"
-        )
-        net_working_days = [d for d in all_working_days if d not in selected_holidays]
-        st.session_state.net_working_days = net_working_days
-        st.info(f"🧮 Total Net Working Days: `{len(net_working_days)}`")
-
-        confirm = st.form_submit_button("🧠 Generate Tasks")
-
-        if confirm:
-            if not st.session_state.files_uploaded and (not st.session_state.description or st.session_state.description.lower() in ["na", "none"]):
-                st.warning("📌 Please provide either a project description or upload at least one PDF.")
-                st.stop()
-            if not st.session_state.project_name or st.session_state.project_name == " ":
-                st.warning("Please enter the project name !!")
-
-            pdf_text = extract_text_from_pdfs(st.session_state.files_uploaded) if st.session_state.files_uploaded else ""
-            working_day_strs = [d.strftime("%Y-%m-%d") for d in net_working_days]
-
-            context = f"""
-Project Description:
-{st.session_state.description}
-
-Extracted Document Content:
-{pdf_text}
-
-Start Date: {st.session_state.start_date}
-End Date: {st.session_state.end_date}
-Net Working Days (excluding weekends + custom holidays):
-{working_day_strs}
-"""
-
-            with st.spinner("🔍 Generating tasks..."):
-                try:
-                    llm_response = generate_tasks_with_llm(context, st.session_state.sprint)
-                    task_list = json.loads(llm_response)
-                    if not task_list:
-                        st.error("❌ LLM returned an empty task list. Please try again.")
-                        st.stop()
-                    df = pd.DataFrame(task_list)
-                except (ValueError, json.JSONDecodeError) as e:
-                    logger.error(f"LLM response causing error: {repr(llm_response)}")
-                    st.error(f"❌ Failed to parse LLM output: {str(e)}. Using default tasks.")
-                    default_tasks = [{"Task": "Default Task", "Module": "Uncategorized"}]
-                    df = pd.DataFrame(default_tasks)
-
-            with st.spinner("🧠 Classifying tasks into modules..."):
-                if "model" not in st.session_state or st.session_state.model is None:
-                    st.error("❌ No model loaded. Task classification skipped.")
-                    df["Module"] = "Uncategorized"
-                else:
-                    df["Module"] = df["Task"].apply(lambda x: classify_module(x, st.session_state.model))
-                    if "Task" in df.columns and "Module" in df.columns:
-                        cols = df.columns.tolist()
-                        task_idx = cols.index("Task")
-                        cols.insert(task_idx + 1, cols.pop(cols.index("Module")))
-                        df = df[cols]
-                st.session_state.tasks_df = df
-                st.session_state.is_ai_generated = True
-                st.success("✅ Tasks Generated Successfully")
-
-            st.write(example(pdf_text,st.session_state.description))
+import streamlit as st
+import pandas as pd
+from datetime import date
+import logging
+from backend.home_utils import get_working_days, model_path_for_domain, load_domain_model
+from backend.pipeline import order_columns
+from backend.task_frame import to_task_frame
+from backend.job_queue import JobQueue
+from backend.feedback_utils import get_feedback_store
+from backend.perf_panel import render_perf_panel
+
+# Set up logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# load_domain_model keeps one model per path and picks up models updated from editor corrections
+def load_model(model_path):
+    try:
+        return load_domain_model(model_path)
+    except Exception as e:
+        logger.error(f"Error loading model {model_path}: {str(e)}")
+        st.error(f"❌ Error loading model: {str(e)}. Please ensure the model file exists.")
+        return None
+
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
+
+# Streamlit UI
+st.set_page_config(page_title="Project Work Planner", layout="wide", page_icon="assets/project-logo.png")
+st.title("📅 AI Project Analysis")
+render_perf_panel()
+get_feedback_store()  # applies module corrections left from earlier sessions in the background
+
+# File Upload & Description
+col1, col2, col3 = st.columns([5, 0.2, 2])
+with col1:
+    st.session_state.project_name = st.text_input("Project Name")
+    col1_1, col1_2 = st.columns([5, 2])
+    st.session_state.description = col1_1.text_area(
+        "📝 Project Description / Specifications",
+        height=160,
+        key="desc_input",
+        placeholder="Enter a brief overview of your project (or type 'na' / 'none' if not available)"
+    )
+    st.session_state.files_uploaded = col1_2.file_uploader(
+        "Upload Project Files (PDF)", type="pdf", accept_multiple_files=True, key="uploadedFile"
+    )
+
+with col3:
+    try:
+        st.image("assets/AI-project.png", width=290, use_container_width=False)
+    except Exception as e:
+        logger.warning(f"Error loading image: {str(e)}")
+        st.warning("⚠️ Could not load logo image")
+
+col4, col5 = st.columns([1, 1])
+project_domain = col4.selectbox("Project Domain", ["Game Development", "Web Development", "App Development" , "Custom"])
+st.session_state.sprint = col5.selectbox("Sprint Timeline", ["Weekly", "Biweekly", "Monthly"])
+
+# Date Inputs
+with st.form("setup_form"):
+    col6, col7 = st.columns([1, 1])
+    start_date = col6.date_input("📅 Project Start Date", value=date.today())
+    end_date = col7.date_input("🏁 Estimated End Date")
+    submitted = st.form_submit_button("✅ Confirm Date Range")
+
+# Save Dates and Load Model
+if submitted:
+    if start_date >= end_date:
+        st.error("⚠️ End date must be after start date.")
+        st.stop()
+    if start_date < date.today():
+        st.warning("⚠️ Start date is in the past. Please confirm this is intentional.")
+    if (end_date - start_date).days > 365:
+        st.warning("⚠️ Date range exceeds 1 year. Please confirm this is intentional.")
+    st.session_state.start_date = start_date
+    st.session_state.end_date = end_date
+
+    # Load appropriate model based on domain
+    model = load_model(model_path_for_domain(project_domain))
+
+    if model is None:
+        st.error("❌ Failed to load model. Please check the model files.")
+        st.stop()
+    st.session_state.model = model  # Store model for potential reuse
+
+# Holiday Selection & Task Generation
+if "start_date" in st.session_state and "end_date" in st.session_state:
+    with st.form("task_generation_form"):
+        all_working_days = get_working_days(st.session_state.start_date, st.session_state.end_date)
+        selected_holidays = st.multiselect(
+            "🎉 Select Custom Holidays (Optional)",
+            options=all_working_days,
+            format_func=lambda x: x.strftime("%A %d-%b-%Y"),
+            key="selected_holidays"
+        )
+        net_working_days = [d for d in all_working_days if d not in selected_holidays]
+        st.session_state.net_working_days = net_working_days
+        st.info(f"🧮 Total Net Working Days: `{len(net_working_days)}`")
+
+        confirm = st.form_submit_button("🧠 Generate Tasks")
+
+        if confirm:
+            if not st.session_state.files_uploaded and (not st.session_state.description or st.session_state.description.lower() in ["na", "none"]):
+                st.warning("📌 Please provide either a project description or upload at least one PDF.")
+                st.stop()
+            if not st.session_state.project_name or st.session_state.project_name == " ":
+                st.warning("Please enter the project name !!")
+
+            # Queue the generation pipeline; it runs in a background worker
+            params = {
+                "project_name": st.session_state.project_name,
+                "description": st.session_state.description,
+                "sprint": st.session_state.sprint,
+                "domain": project_domain,
+                "model_path": model_path_for_domain(project_domain),
+                "start_date": str(st.session_state.start_date),
+                "end_date": str(st.session_state.end_date),
+                "net_working_days": [d.strftime("%Y-%m-%d") for d in net_working_days],
+            }
+            files = [(f.name, f.getvalue()) for f in st.session_state.files_uploaded or []]
+            job_id = get_job_queue().submit(st.session_state.project_name, params, files)
+            if "job_ids" not in st.session_state:
+                st.session_state.job_ids = []
+            st.session_state.job_ids.append(job_id)
+            st.success(f"🚀 Generation job #{job_id} queued. You can keep working while it runs.")
+
+# Generation Jobs (polled while any are running)
+def load_job_result(job):
+    st.session_state.tasks_df = to_task_frame(order_columns(pd.DataFrame(job["result"]["tasks"])))
+    st.session_state.project_name = job["project_name"]
+    st.session_state.is_ai_generated = True
+    st.session_state.plan_table_md = job["result"]["table_md"]
+    st.session_state.plan_warnings = job["result"]["warnings"]
+    st.session_state.loaded_job_id = job["id"]
+    # Stage timings of this session's own jobs go to its performance panel
+    if job["id"] in st.session_state.get("job_ids", []):
+        st.session_state.setdefault("trace_records", []).extend(job["result"].get("trace", []))
+    st.session_state.pop("module_baseline", None)
+    st.session_state.pop("persisted_project", None)  # a new plan is saved in full the first time
+
+def show_generation_jobs():
+    jobs = get_job_queue().recent()
+    if not jobs:
+        return
+    if polling and not any(job["status"] in ("queued", "running") for job in jobs):
+        st.rerun()  # the last job finished: redraw without the timer
+    st.markdown("### ⏳ Generation Jobs")
+    for job in jobs:
+        label = f"#{job['id']} · {job['project_name'] or 'Untitled'}"
+        if job["status"] in ("queued", "running"):
+            st.progress(job["progress"] / 100, text=f"{label} — {job['stage']}")
+        elif job["status"] == "failed":
+            st.error(f"❌ {label} failed: {job['error']}")
+        else:
+            # Plans started from this session are loaded as soon as they finish
+            if job["id"] in st.session_state.get("job_ids", []) and job["id"] > st.session_state.get("loaded_job_id", 0):
+                load_job_result(job)
+                st.rerun()
+            col_a, col_b = st.columns([4, 1])
+            loaded = st.session_state.get("loaded_job_id") == job["id"]
+            col_a.success(f"✅ {label} — {len(job['result']['tasks'])} tasks" + (" (loaded)" if loaded else ""))
+            if not loaded and col_b.button("📥 Load plan", key=f"load_job_{job['id']}"):
+                load_job_result(job)
+                st.rerun()
+
+# Poll every 2 s only while a job is queued or running
+polling = any(job["status"] in ("queued", "running") for job in get_job_queue().recent())
+st.fragment(show_generation_jobs, run_every=2 if polling else None)()
+
+if "loaded_job_id" in st.session_state:
+    for warning in st.session_state.get("plan_warnings", []):
+        st.info(f"ℹ️ {warning}")
+    st.success("✅ Tasks Generated Successfully")
+    st.write(st.session_state.plan_table_md)
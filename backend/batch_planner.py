@@ -0,0 +1,156 @@
+"""Headless batch planning for many project specs.
+
+    python -m backend.batch_planner specs/ --output-dir plans/ --workers 8 --llm-concurrency 4
+    python -m backend.batch_planner manifest.json --mongo
+    python -m backend.batch_planner specs/ --output-dir plans/ --replay llm_replay.jsonl
+
+--replay serves LLM responses recorded with LLM_RECORD=1 instead of calling Groq,
+for load tests and benchmarks without network access.
+
+A spec is a JSON object:
+
+    {"project_name": "Space Shooter", "description": "...", "domain": "Game Development",
+     "sprint": "Biweekly", "start_date": "2026-11-02", "end_date": "2027-01-29",
+     "holidays": ["2026-12-25"], "pdfs": ["space_shooter_gdd.pdf"]}
+
+A directory argument loads every *.json spec in it; a file argument is a manifest
+holding a list of specs. PDF paths are relative to the spec/manifest file.
+"""
+import os
+import json
+import time
+import argparse
+import logging
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+from backend.home_utils import get_working_days
+from backend.llm_utils import set_llm_concurrency
+from backend.llm_provider import ReplayProvider, set_provider
+from backend.pipeline import generate_plan, order_columns
+
+logger = logging.getLogger(__name__)
+
+
+#*********Loading specs...************
+
+def load_specs(path):
+    specs = []
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".json"):
+                with open(os.path.join(path, name), encoding="utf-8") as f:
+                    spec = json.load(f)
+                spec.setdefault("project_name", os.path.splitext(name)[0])
+                specs.append((spec, path))
+    else:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        base = os.path.dirname(os.path.abspath(path))
+        specs = [(spec, base) for spec in (manifest if isinstance(manifest, list) else manifest["projects"])]
+    return specs
+
+#Turn a spec into the parameters generate_plan expects
+def spec_to_params(spec):
+    start = date.fromisoformat(spec["start_date"])
+    end = date.fromisoformat(spec["end_date"])
+    if start >= end:
+        raise ValueError("end_date must be after start_date")
+    holidays = {date.fromisoformat(h) for h in spec.get("holidays", [])}
+    net_working_days = [d for d in get_working_days(start, end) if d not in holidays]
+    return {
+        "project_name": spec["project_name"],
+        "description": spec.get("description", "na"),
+        "sprint": spec.get("sprint", "Weekly"),
+        "domain": spec.get("domain", "Custom"),
+        "start_date": str(start),
+        "end_date": str(end),
+        "net_working_days": [d.strftime("%Y-%m-%d") for d in net_working_days],
+    }
+
+
+#*********Running one project...************
+
+def plan_project(spec, base_dir, args, db=None):
+    started = time.perf_counter()
+    name = spec.get("project_name", "Untitled")
+    summary = {"project": name, "status": "ok", "tasks": 0, "seconds": 0.0, "error": ""}
+    files = []
+    try:
+        params = spec_to_params(spec)
+        files = [open(os.path.join(base_dir, p), "rb") for p in spec.get("pdfs", [])]
+        result = generate_plan(params, files)
+        df = order_columns(pd.DataFrame(result["tasks"]))
+        summary["tasks"] = len(df)
+        for warning in result["warnings"]:
+            logger.warning(f"{name}: {warning}")
+
+        if args.output_dir:
+            safe_name = "".join(c if c.isalnum() or c in "-_ " else "_" for c in name).strip()
+            df.to_csv(os.path.join(args.output_dir, f"{safe_name}.csv"), index=False)
+            with open(os.path.join(args.output_dir, f"{safe_name}.json"), "w", encoding="utf-8") as f:
+                json.dump({"params": params, **result}, f, indent=2, default=str)
+        if db is not None:
+            from backend.db_utils import save_project_tasks
+            save_project_tasks(db, name, df)
+    except Exception as e:
+        logger.error(f"Planning failed for {name}: {str(e)}")
+        summary.update(status="failed", error=str(e))
+    finally:
+        for f in files:
+            f.close()
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    return summary
+
+def print_summary(summaries, wall_seconds):
+    print(f"\n{'Project':<32}{'Status':<8}{'Tasks':>7}{'Latency (s)':>13}")
+    for s in summaries:
+        print(f"{s['project'][:31]:<32}{s['status']:<8}{s['tasks']:>7}{s['seconds']:>13.2f}  {s['error']}")
+    done = [s for s in summaries if s["status"] == "ok"]
+    latencies = sorted(s["seconds"] for s in done)
+    total_tasks = sum(s["tasks"] for s in done)
+    print(f"\n{len(done)}/{len(summaries)} projects planned in {wall_seconds:.1f}s "
+          f"({60 * len(done) / max(wall_seconds, 1e-9):.1f} projects/min, {total_tasks / max(wall_seconds, 1e-9):.1f} tasks/s)")
+    if latencies:
+        print(f"Latency per project: min {latencies[0]:.1f}s, "
+              f"median {latencies[len(latencies) // 2]:.1f}s, max {latencies[-1]:.1f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate project plans for many specs without the UI.")
+    parser.add_argument("specs", help="Directory of *.json specs or a JSON manifest")
+    parser.add_argument("--output-dir", help="Write <project>.csv and <project>.json here")
+    parser.add_argument("--mongo", action="store_true", help="Save each plan to its MongoDB project collection")
+    parser.add_argument("--workers", type=int, default=4, help="Projects processed in parallel")
+    parser.add_argument("--llm-concurrency", type=int, default=2, help="Simultaneous Groq requests")
+    parser.add_argument("--replay", help="Replay recorded LLM responses from this JSONL instead of calling Groq")
+    parser.add_argument("--replay-latency-ms", type=float, default=0, help="Simulated latency of each replayed call")
+    args = parser.parse_args(argv)
+
+    if not args.output_dir and not args.mongo:
+        parser.error("choose at least one destination: --output-dir and/or --mongo")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    db = None
+    if args.mongo:
+        from backend.db_utils import get_db
+        db = get_db()
+    if args.replay:
+        set_provider(ReplayProvider(args.replay, latency_ms=args.replay_latency_ms))
+    set_llm_concurrency(args.llm_concurrency)
+
+    specs = load_specs(args.specs)
+    started = time.perf_counter()
+    summaries = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(plan_project, spec, base, args, db) for spec, base in specs]
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries.append(summary)
+            print(f"[{len(summaries)}/{len(specs)}] {summary['project']}: {summary['status']} in {summary['seconds']}s")
+    print_summary(summaries, time.perf_counter() - started)
+    return 0 if all(s["status"] == "ok" for s in summaries) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    raise SystemExit(main())
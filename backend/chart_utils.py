@@ -0,0 +1,179 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from backend.tracing import span
+
+
+#*********Functions for building the project charts...************
+
+# --- Status-to-Progress & Color Maps ---
+status_to_progress = {
+    "PENDING": 0,
+    "IN PROGRESS": 50,
+    "COMPLETED": 100,
+    "BLOCKED": 0
+}
+
+# Built figures kept per process (least recently used dropped first)
+FIGURE_CACHE_SIZE = 32
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+TIMELINE_COLUMNS = ["Task", "Start", "End", "Sprint", "Resource", "Progress", "Task_Dependency", "Module"]
+GANTT_COLUMNS = ["Task_ID", "Task", "Start", "End", "Resource", "Progress", "Task_Dependency", "Y_Index"]
+
+def clear_figure_cache():
+    with _figures_lock:
+        _figures.clear()
+
+#Content hash of the columns a chart reads
+def frame_hash(df, columns):
+    view = df[[c for c in columns if c in df.columns]].astype(str)
+    digest = hashlib.sha1(",".join(view.columns).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(view, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def _cached_figure(key, build):
+    with _figures_lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+            return fig
+    with span("chart.build", chart=key[0]):
+        fig = build()
+    with _figures_lock:
+        _figures[key] = fig
+        while len(_figures) > FIGURE_CACHE_SIZE:
+            _figures.popitem(last=False)
+    return fig
+
+#Timeline of every sprint; plotly express makes one trace per sprint, which the sprint filter reuses
+def _full_timeline(df):
+    fig = px.timeline(
+        df,
+        x_start="Start",
+        x_end="End",
+        y="Task",
+        color="Sprint",
+        title="🗓️ Project Timeline",
+        hover_data=["Resource", "Progress", "Task_Dependency", "Module"]
+    )
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+#Sprint-coloured timeline shown below the task editor, memoized on the data and the selected sprints
+def build_timeline_chart(df, sprints=None):
+    content = frame_hash(df, TIMELINE_COLUMNS)
+    sprints = sorted(df["Sprint"].astype(str).unique()) if sprints is None else sorted(str(s) for s in sprints)
+
+    def build():
+        full = _cached_figure(("timeline-all", content), lambda: _full_timeline(df))
+        traces = [trace for trace in full.data if str(trace.name) in sprints]
+        fig = go.Figure(data=traces, layout=full.layout)
+        fig.update_layout(height=min(800, 40 * int(df["Sprint"].astype(str).isin(sprints).sum())))
+        return fig
+
+    return _cached_figure(("timeline", content, tuple(sprints)), build)
+
+#Task IDs whose dates can't be plotted; checked on every run since the figure itself is memoized
+def invalid_task_ids(df):
+    starts = pd.to_datetime(df["Start"], errors="coerce")
+    ends = pd.to_datetime(df["End"], errors="coerce")
+    invalid = starts.isna() | ends.isna()
+    return list(df.loc[invalid, "Task_ID"]) if "Task_ID" in df.columns else []
+
+#Resource-coloured Gantt chart with progress bars and dependency arrows, memoized on the data
+def build_gantt_chart(df):
+    return _cached_figure(("gantt", frame_hash(df, GANTT_COLUMNS)), lambda: _gantt_chart(df))
+
+def _gantt_chart(df):
+    # --- Base Gantt chart ---
+    fig = px.timeline(
+        df,
+        x_start="Start",
+        x_end="End",
+        y="Y_Index",
+        color="Resource",
+        hover_data=["Task", "Task_ID", "Task_Dependency", "Progress"]
+    )
+
+    # --- Y-axis formatting ---
+    fig.update_yaxes(
+        tickfont=dict(size=14, color="#367178"),
+        tickvals=df["Y_Index"],
+        ticktext=df["Task"],
+        autorange="reversed",
+        showgrid=True,
+        gridcolor="#2b6170"
+    )
+
+    # --- X-axis formatting ---
+    fig.update_xaxes(showgrid=True, gridcolor="#2b6170", dtick="D1")
+
+    # --- Overlay progress bars (one trace, segments separated by gaps) ---
+    starts = pd.to_datetime(df["Start"], errors="coerce")
+    ends = pd.to_datetime(df["End"], errors="coerce")
+    progress = df["Progress"].astype(str).str.strip().str.upper() if "Progress" in df.columns else pd.Series("PENDING", index=df.index)
+    fraction = progress.map(status_to_progress).fillna(0) / 100
+    # If 0% progress, make a tiny visible bar
+    progress_ends = (starts + (ends - starts) * fraction).where(fraction > 0, starts + pd.Timedelta(hours=0.1))
+    valid = starts.notna() & ends.notna()
+    x, y = [], []
+    for start_date, progress_end, y_index in zip(starts[valid], progress_ends[valid], df.loc[valid, "Y_Index"]):
+        x += [start_date, progress_end, None]
+        y += [y_index, y_index, None]
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=y,
+        mode="lines",
+        line=dict(color= "black", width=6),
+        showlegend=False,
+        hoverinfo="skip"
+    ))
+
+    # --- Dependency Arrows ---
+    task_pos = {
+        str(row.Task_ID): {"x_start": row.Start, "x_end": row.End, "y": row.Y_Index}
+        for row in df.itertuples()
+    }
+
+    arrows = []
+    for row in df.itertuples():
+        dependencies = row.Task_Dependency if "Task_Dependency" in df.columns else []
+        if isinstance(dependencies, str):
+            dependencies = [dep.strip() for dep in dependencies.split(",") if dep.strip()]
+        if isinstance(dependencies, list) and dependencies:
+            for dep_id in dependencies:
+                dep_id = str(dep_id).strip()
+                if dep_id in task_pos and str(row.Task_ID) in task_pos:
+                    dep = task_pos[dep_id]
+                    cur = task_pos[str(row.Task_ID)]
+                    arrows.append(dict(
+                        x=cur["x_start"],
+                        y=cur["y"],
+                        ax=dep["x_end"],
+                        ay=dep["y"],
+                        xref="x",
+                        yref="y",
+                        axref="x",
+                        ayref="y",
+                        showarrow=True,
+                        arrowhead=3,
+                        arrowsize=1,
+                        arrowwidth=3,
+                        arrowcolor="#9769cf",
+                    ))
+
+    # --- Final Layout Fixes ---
+    fig.update_layout(
+        annotations=arrows,  # set in one go; add_annotation per arrow re-validates the whole layout
+        height=min(800, 40 * len(df)),  # Uniform row height
+        bargap=0.2,
+        title="📌 Gantt Chart with Task Progress and Dependencies",
+        yaxis_title="Task",
+        plot_bgcolor="#d5eaf0"
+    )
+    return fig
@@ -0,0 +1,55 @@
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from backend.tracing import traced
+
+
+#*********Functions for keeping the Help chatbot context bounded...************
+
+# Token budget for the verbatim chat window sent with every question
+HISTORY_TOKEN_BUDGET = 1500
+
+#Cheap token estimate (~4 characters per token for English text)
+def estimate_tokens(text):
+    return len(text) // 4 + 1
+
+#Split history into (older, window) where window is the newest messages that fit the budget
+def split_history(history, budget=HISTORY_TOKEN_BUDGET):
+    used = 0
+    start = len(history)
+    while start > 0:
+        cost = estimate_tokens(history[start - 1]["content"])
+        if used + cost > budget and start < len(history):
+            break
+        used += cost
+        start -= 1
+    return history[:start], history[start:]
+
+#System prompt + rolling summary + recent user/assistant turns as chat messages
+def build_chat_messages(system_prompt, summary, window):
+    messages = [SystemMessage(content=system_prompt)]
+    if summary:
+        messages.append(SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+    for msg in window:
+        if msg["role"] == "user":
+            messages.append(HumanMessage(content=msg["content"]))
+        else:
+            messages.append(AIMessage(content=msg["content"]))
+    return messages
+
+#Fold messages that left the window into the rolling summary (llm is an LLMProvider)
+@traced("groq.help_summary")
+def update_summary(llm, summary, messages):
+    prompt = ChatPromptTemplate.from_template(
+        """Update the running summary of a help-desk conversation about the Project Work Planner.
+Keep the user's goals, facts they shared and answers already given. Use at most 120 words.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}
+
+Updated summary:"""
+    )
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    return llm.invoke(prompt, {"summary": summary or "(empty)", "messages": transcript}, call="help_summary").strip()
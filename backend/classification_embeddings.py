@@ -1,6 +1,87 @@
-from langchain_huggingface import HuggingFaceEmbeddings
-
-def get_embeddings():
-    embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-    return embeddings
-
+import os
+import logging
+from functools import lru_cache
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+#*********The sentence embedding model shared by classification, dedup, search & training...************
+
+# Hub name or a local directory (servers without hub access)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# "fp32" (default) or "int8": the model's Linear layers dynamically quantized for faster CPU inference
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "fp32")
+# Torch intra-op threads used for embedding (0 keeps the torch default of one per core); set once per process
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+# The int8 model is only used if its embeddings of PROBE_TEXTS stay this close (mean cosine) to fp32
+INT8_MIN_COSINE = float(os.getenv("INT8_MIN_COSINE", "0.98"))
+PROBE_TEXTS = [
+    "Design the main menu UI",
+    "Implement player movement and collision",
+    "Set up the REST API for user login",
+    "Rig and animate the boss character",
+    "Write unit tests for the payment service",
+    "Create particle effects for explosions",
+    "Optimize database queries for the dashboard",
+    "Review sprint backlog with the team",
+]
+
+# Backend actually in use (int8 falls back to fp32 when it fails the probe check) and the probe cosine
+_info = {}
+
+#Same embed_documents/embed_query interface as HuggingFaceEmbeddings, over a SentenceTransformer we hold
+class SentenceEmbeddings:
+    def __init__(self, model):
+        self.model = model
+
+    def embed_documents(self, texts):
+        texts = [str(t).replace("\n", " ") for t in texts]
+        return self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False).tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+#Mean cosine similarity of matching rows
+def mean_cosine(a, b):
+    a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+    norms = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    return float(np.mean(np.sum(a * b, axis=1) / np.maximum(norms, 1e-12)))
+
+#Quantize the model's Linear layers to int8; kept only if it embeds PROBE_TEXTS like the fp32 model
+def _int8_embeddings():
+    import torch
+    from sentence_transformers import SentenceTransformer
+    full = SentenceEmbeddings(SentenceTransformer(EMBEDDING_MODEL, device="cpu"))
+    try:
+        quantized = SentenceEmbeddings(torch.ao.quantization.quantize_dynamic(full.model, {torch.nn.Linear}, dtype=torch.qint8))
+    except Exception as e:
+        # Eager-mode quantization is deprecated in recent torch releases
+        logger.warning(f"int8 quantization of {EMBEDDING_MODEL} failed ({str(e)}); using fp32")
+        return full, "fp32", None
+    cosine = mean_cosine(quantized.embed_documents(PROBE_TEXTS), full.embed_documents(PROBE_TEXTS))
+    if cosine < INT8_MIN_COSINE:
+        logger.warning(f"int8 {EMBEDDING_MODEL} drifts from fp32 (probe cosine {cosine:.4f} < {INT8_MIN_COSINE}); using fp32")
+        return full, "fp32", cosine
+    return quantized, "int8", cosine
+
+#The shared embeddings instance, built once per process from EMBEDDING_BACKEND / EMBEDDING_THREADS
+@lru_cache(maxsize=None)
+def get_embeddings():
+    if EMBEDDING_THREADS:
+        import torch
+        torch.set_num_threads(EMBEDDING_THREADS)
+    cosine = None
+    if EMBEDDING_BACKEND == "int8":
+        embeddings, backend, cosine = _int8_embeddings()
+    else:
+        if EMBEDDING_BACKEND != "fp32":
+            logger.warning(f"Unknown EMBEDDING_BACKEND {EMBEDDING_BACKEND!r}; using fp32")
+        from langchain_huggingface import HuggingFaceEmbeddings
+        embeddings, backend = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL, model_kwargs={"device": "cpu"}), "fp32"
+    _info.update(backend=backend, threads=EMBEDDING_THREADS, probe_cosine=cosine)
+    logger.info(f"Loaded {EMBEDDING_MODEL} embeddings ({backend}, {EMBEDDING_THREADS or 'default'} threads)")
+    return embeddings
+
+def embedding_info():
+    return dict(_info)
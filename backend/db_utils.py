@@ -0,0 +1,112 @@
+import os
+import pandas as pd
+from datetime import datetime, date, time
+import logging
+from urllib.parse import quote_plus
+from dotenv import load_dotenv
+from pymongo import MongoClient, ReplaceOne, DeleteMany
+from backend.tracing import traced, mongo_listener
+from backend.task_frame import task_records
+from backend.workload_utils import WORKLOAD_COLLECTION, update_project_workload
+from backend.plan_history import HISTORY_COLLECTION, record_version
+
+logger = logging.getLogger(__name__)
+
+
+#*********Functions for reading & writing project collections...************
+
+# Collections that are not projects
+SYSTEM_COLLECTIONS = {"resources", WORKLOAD_COLLECTION, HISTORY_COLLECTION}
+
+#Connect to the project database configured in .env (MONGO_USER / MONGO_PASS / MONGO_CLUSTER / MONGO_DB)
+def get_db():
+    load_dotenv()
+    username = quote_plus(os.getenv("MONGO_USER"))
+    password = quote_plus(os.getenv("MONGO_PASS"))
+    cluster = os.getenv("MONGO_CLUSTER")
+    db_name = os.getenv("MONGO_DB")
+    uri = f"mongodb+srv://{username}:{password}@{cluster}/{db_name}?retryWrites=true&w=majority"
+    client = MongoClient(uri, serverSelectionTimeoutMS=5000, event_listeners=[mongo_listener])
+    client.server_info()  # Test connection
+    return client[db_name]
+
+#Names of the project collections
+def list_projects(db):
+    return [name for name in db.list_collection_names() if name not in SYSTEM_COLLECTIONS]
+
+#Convert a task record into something MongoDB can store
+def fix_for_mongo(record):
+    record.pop("_id", None)
+    for k in ["Start", "End"]:
+        if record.get(k) is pd.NaT:
+            record[k] = None
+        elif isinstance(record.get(k), date) and not isinstance(record.get(k), datetime):
+            record[k] = datetime.combine(record[k], time.min)
+        elif isinstance(record.get(k), str):
+            try:
+                record[k] = pd.to_datetime(record[k]).to_pydatetime()
+            except ValueError:
+                logger.error(f"Invalid date format for {k}: {record.get(k)}")
+                record[k] = datetime.combine(date.today(), time.min)
+    if isinstance(record.get("Task_Dependency"), str):
+        record["Task_Dependency"] = [x.strip() for x in record["Task_Dependency"].split(",") if x.strip()]
+    elif not isinstance(record.get("Task_Dependency"), list):
+        record["Task_Dependency"] = []
+    return record
+
+#Version the saved tasks; runs only after the write succeeded, and a history failure never fails the save
+def _record_history(db, project_name, records):
+    try:
+        record_version(db, project_name, records)
+    except Exception as e:
+        logger.error(f"Recording plan history for {project_name} failed: {str(e)}")
+
+#Refresh the saved project's entries in the historical duration index (in a background thread)
+def _update_duration_index(project_name, df):
+    from backend.duration_index import update_index_async
+    update_index_async(project_name, df)
+
+#Replace the stored tasks of a project with the given DataFrame; update_index=False leaves the duration index alone
+@traced("db.save_project_tasks")
+def save_project_tasks(db, project_name, df, update_index=True):
+    collection = db[project_name]
+    records = task_records(df)
+    cleaned = [fix_for_mongo(r) for r in records]
+    collection.delete_many({})  # Clear existing data
+    if cleaned:
+        collection.insert_many(cleaned)
+    _record_history(db, project_name, cleaned)
+    update_project_workload(db, project_name, df)
+    if update_index:
+        _update_duration_index(project_name, df)
+    return len(cleaned)
+
+#Write only the given tasks of a project (upserted by Task_ID) and delete removed ones in one bulk_write
+@traced("db.save_task_changes")
+def save_task_changes(db, project_name, df, changed_ids, deleted_ids=(), update_index=True):
+    ids = df["Task_ID"].astype(str).str.strip()
+    if (ids == "").any() or ids.duplicated().any():
+        # Rows cannot be matched by Task_ID: rewrite the project
+        return save_project_tasks(db, project_name, df, update_index)
+    collection = db[project_name]
+    collection.create_index("Task_ID")
+    records = [fix_for_mongo(r) for r in task_records(df)]
+    changed_ids = {str(i) for i in changed_ids}
+    operations = [ReplaceOne({"Task_ID": r["Task_ID"]}, r, upsert=True) for r in records if str(r["Task_ID"]) in changed_ids]
+    if deleted_ids:
+        operations.append(DeleteMany({"Task_ID": {"$in": list(deleted_ids)}}))
+    if operations:
+        collection.bulk_write(operations, ordered=False)
+    _record_history(db, project_name, records)
+    update_project_workload(db, project_name, df)
+    if update_index:
+        _update_duration_index(project_name, df)
+    return len(operations)
+
+#Load every task of a project as a DataFrame (empty if the project has none)
+@traced("db.load_project_tasks")
+def load_project_tasks(db, project_name):
+    data = list(db[project_name].find({}))
+    for doc in data:
+        doc.pop("_id", None)
+    return pd.DataFrame(data)
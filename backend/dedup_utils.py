@@ -0,0 +1,126 @@
+import logging
+import numpy as np
+from backend.tracing import span, traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********Functions for merging near-duplicate generated tasks...************
+
+# Cosine similarity of MiniLM task embeddings above which two tasks are treated as the same work
+DUPLICATE_THRESHOLD = 0.85
+# Rows compared per matrix product; keeps memory at BLOCK_SIZE x n floats
+BLOCK_SIZE = 1024
+
+#Embed every task text in one batch and L2-normalise the rows
+def embed_tasks(texts, embeddings):
+    with span("embedding.embed_documents", count=len(texts)):
+        vectors = np.asarray(embeddings.embed_documents(list(texts)), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+#Group rows whose cosine similarity exceeds the threshold (blocked upper-triangle search + union-find)
+def find_duplicate_clusters(vectors, threshold=DUPLICATE_THRESHOLD, block_size=BLOCK_SIZE):
+    n = len(vectors)
+    parent = np.arange(n)
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        # Only compare against later rows so each pair is scored once
+        sims = vectors[start:stop] @ vectors[start:].T
+        rows, cols = np.nonzero(np.triu(sims, k=1) >= threshold)
+        for i, j in zip(rows + start, cols + start):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                # The earliest task of a cluster stays its representative
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    roots = np.array([find(i) for i in range(n)])
+    clusters = {}
+    for i, root in enumerate(roots):
+        clusters.setdefault(int(root), []).append(i)
+    return [members for members in clusters.values() if len(members) > 1]
+
+def _as_list(deps):
+    if isinstance(deps, str):
+        return [d.strip() for d in deps.split(",") if d.strip()]
+    if isinstance(deps, (list, tuple, np.ndarray)):
+        return [str(d).strip() for d in deps if str(d).strip()]
+    return []
+
+#Drop dependency edges that close a cycle (merging can turn A->B->A' into A->B->A)
+def _break_cycles(deps_by_id):
+    state = {}
+
+    for root in deps_by_id:
+        if root in state:
+            continue
+        stack = [(root, iter(list(deps_by_id[root])))]
+        state[root] = "visiting"
+        while stack:
+            node, children = stack[-1]
+            for dep in children:
+                if dep not in deps_by_id:
+                    continue
+                if state.get(dep) == "visiting":
+                    logger.warning(f"Dropping dependency {node} -> {dep}: it creates a cycle after merging duplicates")
+                    deps_by_id[node].remove(dep)
+                elif dep not in state:
+                    state[dep] = "visiting"
+                    stack.append((dep, iter(list(deps_by_id[dep]))))
+                    break
+            else:
+                state[node] = "done"
+                stack.pop()
+    return deps_by_id
+
+#Merge near-duplicate tasks, keeping the first of each cluster and rewriting Task_Dependency references
+@traced("dedup.tasks")
+def deduplicate_tasks(df, embeddings, threshold=DUPLICATE_THRESHOLD):
+    if len(df) < 2 or "Task" not in df.columns:
+        return df, []
+    vectors = embed_tasks(df["Task"].astype(str).tolist(), embeddings)
+    clusters = find_duplicate_clusters(vectors, threshold)
+    if not clusters:
+        return df, []
+
+    has_ids = "Task_ID" in df.columns
+    has_deps = "Task_Dependency" in df.columns
+    ids = df["Task_ID"].astype(str).tolist() if has_ids else [str(i) for i in range(len(df))]
+    deps = [_as_list(d) for d in df["Task_Dependency"]] if has_deps else [[] for _ in range(len(df))]
+
+    replaced_by = {}
+    dropped = set()
+    for members in clusters:
+        keep = members[0]
+        for other in members[1:]:
+            replaced_by[ids[other]] = ids[keep]
+            dropped.add(other)
+            # The kept task inherits the prerequisites of the tasks merged into it
+            deps[keep].extend(deps[other])
+
+    kept_rows = [i for i in range(len(df)) if i not in dropped]
+    deps_by_id = {}
+    for i in kept_rows:
+        rewritten = []
+        for dep in deps[i]:
+            dep = replaced_by.get(dep, dep)
+            if dep != ids[i] and dep not in rewritten:
+                rewritten.append(dep)
+        deps_by_id[ids[i]] = rewritten
+    deps_by_id = _break_cycles(deps_by_id)
+
+    result = df.iloc[kept_rows].reset_index(drop=True)
+    if has_deps:
+        result["Task_Dependency"] = [deps_by_id[ids[i]] for i in kept_rows]
+
+    merged = [[df["Task"].iloc[i] for i in members] for members in clusters]
+    logger.info(f"Merged {len(dropped)} duplicate tasks into {len(clusters)} clusters")
+    return result, merged
@@ -0,0 +1,187 @@
+import os
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from backend.classification_embeddings import get_embeddings
+from backend.tracing import span, traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********k-NN duration estimates from completed tasks of past projects...************
+
+INDEX_PATH = os.getenv("DURATION_INDEX_PATH", "duration_index.npz")
+DEFAULT_K = 5
+# Neighbours less similar than this are ignored
+MIN_SIMILARITY = 0.5
+# Minimum neighbours before relaxing the domain/module filter
+MIN_NEIGHBOURS = 3
+
+#Completed tasks of one project as (text, module, domain, working days)
+def completed_tasks(project_name, df):
+    if df.empty or not {"Task", "Start", "End", "Progress"} <= set(df.columns):
+        return pd.DataFrame(columns=["Task", "Module", "Domain", "Days"])
+    done = df[df["Progress"].astype(str).str.upper() == "COMPLETED"]
+    starts = pd.to_datetime(done["Start"], errors="coerce").values.astype("datetime64[D]")
+    ends = pd.to_datetime(done["End"], errors="coerce").values.astype("datetime64[D]")
+    valid = ~(np.isnat(starts) | np.isnat(ends)) & (ends >= starts)
+    done = done[valid]
+    return pd.DataFrame({
+        "Task": done["Task"].astype(str).values,
+        "Module": (done["Module"] if "Module" in done.columns else pd.Series("", index=done.index)).astype(str).values,
+        "Domain": (done["Domain"] if "Domain" in done.columns else pd.Series("", index=done.index)).fillna("").astype(str).values,
+        "Days": np.busday_count(starts[valid], ends[valid] + 1).astype(np.float32),
+    })
+
+class DurationIndex:
+    def __init__(self, embeddings=None, path=INDEX_PATH):
+        self._embeddings = embeddings
+        self.path = path
+        self._lock = threading.Lock()
+        self.vectors = np.zeros((0, 0), dtype=np.float16)
+        self.texts = np.array([], dtype=object)
+        self.projects = np.array([], dtype=object)
+        self.modules = np.array([], dtype=object)
+        self.domains = np.array([], dtype=object)
+        self.days = np.array([], dtype=np.float32)
+        if path and os.path.exists(path):
+            self._load()
+
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            self._embeddings = get_embeddings()
+        return self._embeddings
+
+    def __len__(self):
+        return len(self.days)
+
+    def _embed(self, texts):
+        with span("embedding.embed_documents", count=len(texts)):
+            vectors = np.asarray(self.embeddings.embed_documents(list(texts)), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _load(self):
+        try:
+            data = np.load(self.path, allow_pickle=True)
+            self.vectors = data["vectors"]
+            self.texts, self.projects = data["texts"], data["projects"]
+            self.modules, self.domains, self.days = data["modules"], data["domains"], data["days"]
+        except Exception as e:
+            logger.error(f"Could not load duration index {self.path}: {str(e)}")
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            np.savez(self.path, vectors=self.vectors, texts=self.texts, projects=self.projects,
+                     modules=self.modules, domains=self.domains, days=self.days)
+
+    #Replace one project's entries; only task texts not already in the index are embedded
+    @traced("duration_index.update_project")
+    def update_project(self, project_name, df):
+        tasks = completed_tasks(project_name, df)
+        with self._lock:
+            known = {text: i for i, text in enumerate(self.texts)}
+        new_texts = [t for t in dict.fromkeys(tasks["Task"]) if t not in known]
+        new_vectors = self._embed(new_texts).astype(np.float16) if new_texts else None
+
+        with self._lock:
+            known = {text: i for i, text in enumerate(self.texts)}
+            fresh = {t: i for i, t in enumerate(new_texts)}
+            rows = []
+            for text in tasks["Task"]:
+                rows.append(new_vectors[fresh[text]] if text in fresh else self.vectors[known[text]])
+            keep = self.projects != project_name
+            if rows:
+                dim = rows[0].shape[0]
+                self.vectors = np.vstack([self.vectors[keep].reshape(-1, dim), np.array(rows, dtype=np.float16)])
+            else:
+                # Nothing completed: only drop the project's old entries (the index may still be empty)
+                self.vectors = self.vectors[keep]
+            self.texts = np.concatenate([self.texts[keep], tasks["Task"].to_numpy(dtype=object)])
+            self.projects = np.concatenate([self.projects[keep], np.full(len(tasks), project_name, dtype=object)])
+            self.modules = np.concatenate([self.modules[keep], tasks["Module"].to_numpy(dtype=object)])
+            self.domains = np.concatenate([self.domains[keep], tasks["Domain"].to_numpy(dtype=object)])
+            self.days = np.concatenate([self.days[keep], tasks["Days"].to_numpy(dtype=np.float32)])
+        return len(tasks)
+
+    #Index every project collection in the database
+    def build_from_db(self, db):
+        from backend.db_utils import list_projects, load_project_tasks
+        for name in list_projects(db):
+            self.update_project(name, load_project_tasks(db, name))
+        self.save()
+
+    #Similarity-weighted mean duration (working days) of the k nearest completed tasks; NaN when unknown
+    @traced("duration_index.predict")
+    def predict(self, texts, modules, domain=None, k=DEFAULT_K):
+        texts = list(texts)
+        result = np.full(len(texts), np.nan)
+        if not len(self) or not texts:
+            return result
+        queries = self._embed(texts)
+        modules = np.asarray([str(m) for m in modules], dtype=object)
+        with self._lock:
+            vectors, days = self.vectors, self.days
+            same_domain = self.domains == (domain or "")
+            for module in np.unique(modules):
+                rows = np.nonzero(modules == module)[0]
+                same_module = self.modules == module
+                # Narrowest filter with enough history wins
+                for mask in (same_module & same_domain, same_module, same_domain, np.ones(len(days), dtype=bool)):
+                    if mask.sum() >= MIN_NEIGHBOURS:
+                        break
+                candidates = np.nonzero(mask)[0]
+                sims = queries[rows] @ vectors[candidates].astype(np.float32).T
+                kk = min(k, len(candidates))
+                top = np.argpartition(-sims, kk - 1, axis=1)[:, :kk]
+                top_sims = np.take_along_axis(sims, top, axis=1)
+                weights = np.where(top_sims >= MIN_SIMILARITY, top_sims, 0.0)
+                top_days = days[candidates][top]
+                total = weights.sum(axis=1)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    result[rows] = np.where(total > 0, (weights * top_days).sum(axis=1) / total, np.nan)
+        return result
+
+_index = None
+_index_lock = threading.Lock()
+_bootstrapped = False
+
+#Process-wide index, loaded from disk on first use
+def get_duration_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DurationIndex(path=INDEX_PATH)
+        return _index
+
+#Refresh a saved project's entries in the background so saving stays fast
+def update_index_async(project_name, df):
+    def run():
+        try:
+            index = get_duration_index()
+            index.update_project(project_name, df)
+            index.save()
+        except Exception as e:
+            logger.error(f"Duration index update failed for {project_name}: {str(e)}")
+    threading.Thread(target=run, name="duration-index-update", daemon=True).start()
+
+#Index every stored project once per process when nothing has been indexed yet
+def bootstrap_index_async(db):
+    global _bootstrapped
+    with _index_lock:
+        if _bootstrapped:
+            return
+        _bootstrapped = True
+    def run():
+        try:
+            index = get_duration_index()
+            if not len(index):
+                index.build_from_db(db)
+        except Exception as e:
+            logger.error(f"Duration index build failed: {str(e)}")
+    threading.Thread(target=run, name="duration-index-build", daemon=True).start()
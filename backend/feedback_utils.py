@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+import numpy as np
+from backend.classification_embeddings import get_embeddings
+from backend.home_utils import model_path_for_domain, load_base_model, overlay_path, swap_domain_model
+from backend.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********Learning from Module corrections made in the task editor...************
+
+FEEDBACK_DB_PATH = os.getenv("FEEDBACK_DB_PATH", "feedback.sqlite3")
+# Seconds between background model updates
+MODEL_UPDATE_INTERVAL = int(os.getenv("MODEL_UPDATE_INTERVAL", "300"))
+# Pending corrections that trigger an update before the interval is up
+MODEL_UPDATE_BATCH = int(os.getenv("MODEL_UPDATE_BATCH", "20"))
+# Corrections count more than the trained model's support vectors they are refit with
+CORRECTION_WEIGHT = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS corrections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    model_path TEXT NOT NULL,
+    domain TEXT,
+    task TEXT NOT NULL,
+    module TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    applied INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL
+);
+"""
+
+#(task text, new module, domain) for rows whose Module changed between two versions of a task table;
+#rows of unknown domain are skipped unless the project's domain is given, so they never train another domain's model
+def find_module_corrections(before, after, domain=None):
+    if "Task_ID" not in before.columns or "Module" not in before.columns or "Module" not in after.columns:
+        return []
+    old = dict(zip(before["Task_ID"].astype(str), before["Module"].astype(str)))
+    domains = after["Domain"].fillna("").astype(str).str.strip() if "Domain" in after.columns else [""] * len(after)
+    corrections = []
+    for task_id, task, module, row_domain in zip(after["Task_ID"].astype(str), after["Task"].astype(str), after["Module"].astype(str), domains):
+        row_domain = row_domain if row_domain and row_domain != "nan" else domain
+        if row_domain and task_id in old and module != old[task_id] and module.strip() and task.strip():
+            corrections.append((task, module, row_domain))
+    return corrections
+
+#Refit the trained model's SVC on its support vectors plus the corrections; the fitted scaler is kept.
+#Always called on the trained model (never on an earlier update), so updates do not compound
+def update_model(model, vectors, labels):
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import SVC
+    scaler, svc = model[:-1], model[-1]
+    support_labels = np.repeat(svc.classes_, svc.n_support_)
+    X = np.vstack([svc.support_vectors_, scaler.transform(vectors)])
+    y = np.concatenate([support_labels, labels])
+    weights = np.concatenate([np.ones(len(support_labels)), np.full(len(labels), CORRECTION_WEIGHT)])
+    updated = SVC(**svc.get_params())
+    updated.fit(X, y, sample_weight=weights)
+    return make_pipeline(*[step for _, step in scaler.steps], updated)
+
+class FeedbackStore:
+    def __init__(self, db_path=FEEDBACK_DB_PATH, interval=MODEL_UPDATE_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+        self._wake = threading.Event()
+        threading.Thread(target=self._updater, name="model-updater", daemon=True).start()
+
+    def _execute(self, sql, args=()):
+        with self._lock, self._conn:
+            return self._conn.execute(sql, args).fetchall()
+
+    #Embed and store corrections; returns how many are waiting for the next update
+    @traced("feedback.record")
+    def record(self, corrections):
+        if not corrections:
+            return self.pending()
+        vectors = np.asarray(get_embeddings().embed_documents([task for task, _, _ in corrections]), dtype=np.float32)
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO corrections (model_path, domain, task, module, vector, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(model_path_for_domain(domain), domain, task, module, vector.tobytes(), now)
+                 for (task, module, domain), vector in zip(corrections, vectors)],
+            )
+        pending = self.pending()
+        if pending >= MODEL_UPDATE_BATCH:
+            self._wake.set()
+        return pending
+
+    def pending(self):
+        return self._execute("SELECT COUNT(*) FROM corrections WHERE applied = 0")[0][0]
+
+    def _updater(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.apply_pending()
+            except Exception as e:
+                logger.error(f"Model update from corrections failed: {str(e)}")
+
+    #Rebuild the corrected copy of every model with new corrections (or whose copy was dropped by a retrain)
+    #from the trained model plus all its stored corrections, and swap it in
+    @traced("feedback.update_models")
+    def apply_pending(self):
+        updated = []
+        for (model_path,) in self._execute("SELECT DISTINCT model_path FROM corrections"):
+            pending = self._execute("SELECT COUNT(*) FROM corrections WHERE applied = 0 AND model_path = ?", (model_path,))[0][0]
+            if not pending and os.path.exists(overlay_path(model_path)):
+                continue
+            rows = self._execute("SELECT id, task, module, vector FROM corrections WHERE model_path = ? ORDER BY id", (model_path,))
+            # The latest correction of a task wins
+            latest = list({row[1]: row for row in rows}.values())
+            vectors = np.vstack([np.frombuffer(row[3], dtype=np.float32) for row in latest])
+            model = update_model(load_base_model(model_path), vectors, np.array([row[2] for row in latest]))
+            swap_domain_model(model_path, model)
+            self._execute("UPDATE corrections SET applied = 1 WHERE model_path = ? AND id <= ?", (model_path, rows[-1][0]))
+            logger.info(f"Updated {model_path} with {len(latest)} module corrections ({pending} new)")
+            updated.append(model_path)
+        return updated
+
+_store = None
+_store_lock = threading.Lock()
+
+#Process-wide store; starting it also starts the background model updater
+def get_feedback_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FeedbackStore()
+        return _store
+
+#Record corrections without holding up the page that saved them
+def record_corrections_async(corrections):
+    if not corrections:
+        return
+    def run():
+        try:
+            get_feedback_store().record(corrections)
+        except Exception as e:
+            logger.error(f"Recording module corrections failed: {str(e)}")
+    threading.Thread(target=run, name="feedback-record", daemon=True).start()
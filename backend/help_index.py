@@ -0,0 +1,115 @@
+import os
+import json
+import logging
+import threading
+import numpy as np
+from backend.classification_embeddings import get_embeddings
+from backend.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+#*********Local vector index over the Help Guide and past chatbot answers...************
+
+# Past question/answer pairs survive restarts in this file. Only answers to a conversation's first question are kept:
+# later answers depend on that user's chat history and must not be served to anyone else
+QA_CACHE_PATH = os.getenv("HELP_QA_CACHE_PATH", "help_qa_cache.json")
+MAX_CACHED_ANSWERS = 1000
+
+# Cosine similarity above which a past answer is reused as-is
+CACHE_SIMILARITY_THRESHOLD = 0.92
+# Very short follow-ups ("why?", "and then?") depend on the conversation, never answer them from cache
+MIN_CACHE_WORDS = 3
+TOP_K_SECTIONS = 3
+
+#Split markdown into retrievable sections at headings and "**Q:" FAQ entries
+def split_markdown_sections(markdown):
+    sections = []
+    current = []
+
+    def flush():
+        text = "\n".join(current).strip()
+        if text and text.strip("-").strip():
+            sections.append(text)
+        current.clear()
+
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("#") or stripped.startswith("**Q:"):
+            flush()
+        if stripped == "---":
+            continue
+        current.append(line)
+    flush()
+    return sections
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class HelpIndex:
+    def __init__(self, sections, embeddings=None, cache_path=QA_CACHE_PATH):
+        self.embeddings = embeddings or get_embeddings()
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+
+        self.sections = list(sections)
+        self.section_vectors = self._embed(self.sections)
+        self.qa_pairs = self._load_cache()
+        self.qa_vectors = self._embed([qa["question"] for qa in self.qa_pairs])
+
+    def _embed(self, texts):
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        with span("embedding.embed_documents", count=len(texts)):
+            vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        return _normalize(vectors)
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return []
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                # Entries from before first-turn-only caching may carry another user's context
+                return [qa for qa in json.load(f) if qa.get("first_turn")][-MAX_CACHED_ANSWERS:]
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read help answer cache {self.cache_path}: {str(e)}")
+            return []
+
+    #Embed the question once; return (cached answer or None, top-k sections, question vector).
+    #The cache is only consulted for first questions (no history), whose answers do not depend on a conversation
+    def search(self, question, k=TOP_K_SECTIONS, first_turn=True):
+        with span("embedding.embed_query"):
+            vector = _normalize(np.asarray([self.embeddings.embed_query(question)], dtype=np.float32))[0]
+
+        cached_answer = None
+        with self._lock:
+            if first_turn and len(question.split()) >= MIN_CACHE_WORDS and len(self.qa_pairs):
+                scores = self.qa_vectors @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= CACHE_SIMILARITY_THRESHOLD:
+                    cached_answer = self.qa_pairs[best]["answer"]
+
+        sections = []
+        if len(self.sections):
+            scores = self.section_vectors @ vector
+            top = np.argsort(-scores)[:k]
+            sections = [self.sections[i] for i in sorted(top)]
+        return cached_answer, sections, vector
+
+    #Remember an LLM answer to a first question so near-duplicate first questions are served locally
+    def add_answer(self, question, answer, vector, first_turn=True):
+        if not first_turn or len(question.split()) < MIN_CACHE_WORDS:
+            return
+        with self._lock:
+            self.qa_pairs.append({"question": question, "answer": answer, "first_turn": True})
+            self.qa_vectors = np.vstack([self.qa_vectors.reshape(-1, vector.shape[0]), vector[None, :]])
+            if len(self.qa_pairs) > MAX_CACHED_ANSWERS:
+                self.qa_pairs = self.qa_pairs[-MAX_CACHED_ANSWERS:]
+                self.qa_vectors = self.qa_vectors[-MAX_CACHED_ANSWERS:]
+            try:
+                with open(self.cache_path, "w", encoding="utf-8") as f:
+                    json.dump(self.qa_pairs, f)
+            except OSError as e:
+                logger.error(f"Could not write help answer cache {self.cache_path}: {str(e)}")
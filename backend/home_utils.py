@@ -0,0 +1,114 @@
+from datetime import timedelta
+import os
+import logging
+import threading
+from backend.classification_embeddings import get_embeddings
+from backend.tracing import span, traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********Functions used by the Home page while generating a plan...************
+
+#Read the text of every uploaded PDF; problems are appended to `warnings` (this runs in job workers, away from the page)
+@traced("pdf.extract_text")
+def extract_text_from_pdfs(files, warnings=None):
+    import PyPDF2
+    warnings = warnings if warnings is not None else []
+    text = ""
+    for file in files:
+        try:
+            reader = PyPDF2.PdfReader(file)
+            for page in reader.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
+        except Exception as e:
+            logger.error(f"Error reading PDF file {file.name}: {str(e)}")
+            warnings.append(f"Error reading PDF file {file.name}: {str(e)}")
+    if not text.strip() and files:
+        warnings.append("No text extracted from uploaded PDFs. Please check the files.")
+    return text
+
+#List every weekday between start and end (inclusive)
+def get_working_days(start, end):
+    working = []
+    current = start
+    while current <= end:
+        if current.weekday() < 5:  # Monday to Friday
+            working.append(current)
+        current += timedelta(days=1)
+    return working
+
+#Pick the saved classifier for a project domain
+def model_path_for_domain(project_domain):
+    if project_domain == "Game Development":
+        return "models/game_dev.pkl"
+    elif project_domain in ["Web Development", "App Development"]:
+        return "models/web_dev.pkl"
+    else:
+        return "models/modelsvm.pkl"
+
+# Models updated from editor corrections are written here (untracked) and shadow the trained models in models/
+MODEL_OVERLAY_DIR = os.getenv("MODEL_OVERLAY_DIR", "models/updated")
+
+_models = {}
+_models_lock = threading.Lock()
+
+#Where the corrected copy of a trained model lives
+def overlay_path(model_path):
+    return os.path.join(MODEL_OVERLAY_DIR, os.path.basename(model_path))
+
+#Load a saved classifier once per process, preferring its corrected copy
+def load_domain_model(model_path):
+    with _models_lock:
+        model = _models.get(model_path)
+    if model is None:
+        import joblib
+        path = overlay_path(model_path)
+        with span("model.load"):
+            model = joblib.load(path if os.path.exists(path) else model_path)
+        with _models_lock:
+            model = _models.setdefault(model_path, model)
+    return model
+
+#Load the trained model itself, ignoring corrections
+def load_base_model(model_path):
+    import joblib
+    with span("model.load"):
+        return joblib.load(model_path)
+
+#Save a corrected classifier (atomically) to the overlay and serve it to every later load_domain_model call
+def swap_domain_model(model_path, model):
+    import joblib
+    path = overlay_path(model_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+    with _models_lock:
+        _models[model_path] = model
+
+#After retraining a model: drop the cached copy and the stale corrected copy (corrections are re-applied to the new one)
+def forget_domain_model(model_path):
+    with _models_lock:
+        _models.pop(model_path, None)
+        path = overlay_path(model_path)
+        if os.path.exists(path):
+            os.remove(path)
+
+#Predict the module of a single task with the domain model; failures are appended to `errors`
+@traced("classify_module")
+def classify_module(task_name, model, errors=None):
+    try:
+        with span("embedding.load"):
+            embeddings = get_embeddings()
+        with span("embedding.embed_query"):
+            query_result = embeddings.embed_query(task_name)
+        with span("svm.predict"):
+            return model.predict([query_result])[0]
+    except Exception as e:
+        logger.error(f"Classification Error for task '{task_name}': {str(e)}")
+        if errors is not None:
+            errors.append(f"Classification Error for task '{task_name}': {str(e)}")
+        return "Uncategorized"
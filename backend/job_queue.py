@@ -0,0 +1,132 @@
+import io
+import os
+import json
+import queue
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from backend.pipeline import generate_plan
+from backend.tracing import collect_spans
+
+logger = logging.getLogger(__name__)
+
+
+#*********Background plan generation backed by a small SQLite job table...************
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.sqlite3")
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_name TEXT,
+    status TEXT NOT NULL,          -- queued / running / done / failed
+    progress INTEGER NOT NULL DEFAULT 0,
+    stage TEXT,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_files (
+    job_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    content BLOB NOT NULL
+);
+"""
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+class JobQueue:
+    def __init__(self, db_path=JOBS_DB_PATH, workers=MAX_CONCURRENT_JOBS, runner=generate_plan):
+        self.runner = runner
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+        self._queue = queue.Queue()
+        self._requeue_unfinished()
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"plan-worker-{i}", daemon=True).start()
+
+    def _execute(self, sql, args=()):
+        with self._lock, self._conn:
+            return self._conn.execute(sql, args).fetchall()
+
+    #Jobs interrupted by a restart run again, their inputs are in the table
+    def _requeue_unfinished(self):
+        rows = self._execute("SELECT id FROM jobs WHERE status IN ('queued', 'running') ORDER BY id")
+        for row in rows:
+            self._execute("UPDATE jobs SET status = 'queued', progress = 0, updated_at = ? WHERE id = ?", (_now(), row["id"]))
+            self._queue.put(row["id"])
+
+    #Store a new job with its parameters and PDF bytes; returns the job id
+    def submit(self, project_name, params, files=()):
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO jobs (project_name, status, stage, params, created_at, updated_at) VALUES (?, 'queued', 'Waiting for a worker', ?, ?, ?)",
+                (project_name, json.dumps(params, default=str), _now(), _now()),
+            )
+            job_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO job_files (job_id, name, content) VALUES (?, ?, ?)",
+                [(job_id, name, content) for name, content in files],
+            )
+        self._queue.put(job_id)
+        return job_id
+
+    def get(self, job_id):
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._to_dict(rows[0]) if rows else None
+
+    def recent(self, limit=10):
+        return [self._to_dict(r) for r in self._execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))]
+
+    def _to_dict(self, row):
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _update(self, job_id, **fields):
+        fields["updated_at"] = _now()
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        self._execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id):
+        job = self.get(job_id)
+        if job is None or job["status"] not in ("queued", "running"):
+            return
+        self._update(job_id, status="running", stage="Starting")
+        files = []
+        for row in self._execute("SELECT name, content FROM job_files WHERE job_id = ?", (job_id,)):
+            pdf = io.BytesIO(row["content"])
+            pdf.name = row["name"]
+            files.append(pdf)
+
+        def progress(pct, stage):
+            self._update(job_id, progress=int(pct), stage=stage)
+
+        try:
+            # Worker threads don't see the submitting session's span list; the spans travel with the result
+            with collect_spans() as spans:
+                result = self.runner(job["params"], files, progress)
+            result = {**result, "trace": spans}
+            self._update(job_id, status="done", progress=100, stage="Done", result=json.dumps(result, default=str))
+        except Exception as e:
+            logger.error(f"Plan generation job {job_id} failed: {str(e)}")
+            self._update(job_id, status="failed", stage="Failed", error=str(e))
+        finally:
+            self._execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
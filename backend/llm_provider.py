@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dotenv import load_dotenv
+from backend.tracing import record_span
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+#*********LLM providers: one shared client, bounded concurrency, retries & per-call metrics...************
+
+# "groq" calls the Groq API; "replay" serves responses recorded earlier (no network)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")
+LLM_MODEL = os.getenv("LLM_MODEL", "llama3-70b-8192")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+# JSONL of recorded calls; Groq calls are appended to it when LLM_RECORD=1, the replay provider reads it
+LLM_REPLAY_PATH = os.getenv("LLM_REPLAY_PATH", "llm_replay.jsonl")
+LLM_RECORD = os.getenv("LLM_RECORD", "0") == "1"
+# Simulated latency of replayed calls, for load tests that should feel like the real API
+LLM_REPLAY_LATENCY_MS = float(os.getenv("LLM_REPLAY_LATENCY_MS", "0"))
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+def _estimate_tokens(text):
+    from backend.llm_utils import count_tokens
+    return count_tokens(text)
+
+def _message_dicts(messages):
+    if isinstance(messages, str):
+        return [{"role": "human", "content": messages}]
+    return [m if isinstance(m, dict) else {"role": getattr(m, "type", "human"), "content": str(m.content)} for m in messages]
+
+#Stable key of a prompt, used to match recorded responses
+def prompt_key(messages):
+    return hashlib.sha256(json.dumps(_message_dicts(messages), sort_keys=True).encode("utf-8")).hexdigest()
+
+#Rate limits, timeouts, connection drops and 5xx are worth another attempt; bad requests are not
+def is_retryable(error):
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status in _RETRYABLE_STATUS
+    name = type(error).__name__
+    return any(word in name for word in ("RateLimit", "Timeout", "Connection", "InternalServer", "Unavailable"))
+
+class LLMProvider(ABC):
+    name = "base"
+
+    def __init__(self, max_concurrency=LLM_MAX_CONCURRENCY, max_retries=LLM_MAX_RETRIES, base_delay=1.0, max_delay=30.0):
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def set_concurrency(self, limit):
+        self.slots = threading.BoundedSemaphore(limit)
+        self.max_concurrency = limit
+
+    # Provider-specific single attempt: returns (text, input_tokens, output_tokens); tokens may be None
+    @abstractmethod
+    def _complete(self, messages, call):
+        ...
+
+    def _stream(self, messages, call):
+        text, _, _ = self._complete(messages, call)
+        yield text
+
+    def _backoff(self, attempt):
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+
+    def _record(self, call, started, status, attempts, messages, text, input_tokens=None, output_tokens=None):
+        record_span(
+            "llm.call", (time.perf_counter() - started) * 1000, status,
+            call=call, provider=self.name, attempts=attempts,
+            input_tokens=input_tokens if input_tokens is not None else _estimate_tokens(" ".join(m["content"] for m in _message_dicts(messages))),
+            output_tokens=output_tokens if output_tokens is not None else _estimate_tokens(text or ""),
+        )
+
+    #One completion with a concurrency slot, exponential-backoff retries and a metrics span
+    def complete(self, messages, call="llm"):
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                with self.slots:
+                    text, input_tokens, output_tokens = self._complete(messages, call)
+                self._record(call, started, "ok", attempt + 1, messages, text, input_tokens, output_tokens)
+                return text
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._record(call, started, "error", attempt + 1, messages, "")
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"{call}: {type(e).__name__} from {self.name}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                attempt += 1
+
+    #Stream text chunks; retried only until the first chunk arrives
+    def stream(self, messages, call="llm"):
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            chunks = []
+            try:
+                with self.slots:
+                    for chunk in self._stream(messages, call):
+                        chunks.append(chunk)
+                        yield chunk
+                self._record(call, started, "ok", attempt + 1, messages, "".join(chunks))
+                return
+            except Exception as e:
+                if chunks or attempt >= self.max_retries or not is_retryable(e):
+                    self._record(call, started, "error", attempt + 1, messages, "".join(chunks))
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+
+    #Format a ChatPromptTemplate and complete it
+    def invoke(self, prompt, inputs, call="llm"):
+        return self.complete(prompt.format_messages(**inputs), call)
+
+class GroqProvider(LLMProvider):
+    name = "groq"
+
+    def __init__(self, model=LLM_MODEL, timeout=LLM_TIMEOUT, record_path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.model = model
+        self.timeout = timeout
+        self.record_path = record_path
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._record_lock = threading.Lock()
+
+    # One ChatGroq (and its HTTP connection pool) for every call; retries are ours, not the SDK's
+    @property
+    def client(self):
+        with self._client_lock:
+            if self._client is None:
+                from langchain_groq import ChatGroq
+                self._client = ChatGroq(model_name=self.model, timeout=self.timeout, max_retries=0)
+            return self._client
+
+    def _save(self, messages, call, text):
+        if not self.record_path:
+            return
+        entry = {"key": prompt_key(messages), "call": call, "messages": _message_dicts(messages), "response": text}
+        with self._record_lock, open(self.record_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _complete(self, messages, call):
+        message = self.client.invoke(messages)
+        usage = getattr(message, "usage_metadata", None) or {}
+        self._save(messages, call, message.content)
+        return message.content, usage.get("input_tokens"), usage.get("output_tokens")
+
+    def _stream(self, messages, call):
+        chunks = []
+        for chunk in self.client.stream(messages):
+            chunks.append(chunk.content)
+            yield chunk.content
+        self._save(messages, call, "".join(chunks))
+
+class ReplayProvider(LLMProvider):
+    name = "replay"
+
+    def __init__(self, path=LLM_REPLAY_PATH, latency_ms=LLM_REPLAY_LATENCY_MS, **kwargs):
+        super().__init__(**kwargs)
+        self.latency_ms = latency_ms
+        self.responses = {}
+        self.by_call = {}
+        self._next = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self.add(json.loads(line))
+        logger.info(f"Replay provider loaded {len(self.responses)} recorded responses from {path}")
+
+    #Add a recorded call: {"messages": [...], "response": "...", "call": "..."} ("key" is derived if missing)
+    def add(self, entry):
+        self.responses[entry.get("key") or prompt_key(entry["messages"])] = entry["response"]
+        self.by_call.setdefault(entry.get("call", "llm"), []).append(entry["response"])
+
+    # Exact prompt match first; unseen prompts get the same call's recordings in a fixed rotation
+    def _complete(self, messages, call):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        text = self.responses.get(prompt_key(messages))
+        if text is None:
+            recorded = self.by_call.get(call)
+            if not recorded:
+                raise LookupError(f"No recorded '{call}' responses to replay; record some with LLM_RECORD=1 first")
+            with self._lock:
+                text = recorded[self._next.get(call, 0) % len(recorded)]
+                self._next[call] = self._next.get(call, 0) + 1
+        return text, None, None
+
+PROVIDERS = {"groq": GroqProvider, "replay": ReplayProvider}
+
+_provider = None
+_provider_lock = threading.Lock()
+
+#The process-wide provider selected by LLM_PROVIDER
+def get_provider():
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            if LLM_PROVIDER not in PROVIDERS:
+                raise ValueError(f"Unknown LLM_PROVIDER '{LLM_PROVIDER}', expected one of {list(PROVIDERS)}")
+            kwargs = {"record_path": LLM_REPLAY_PATH} if LLM_PROVIDER == "groq" and LLM_RECORD else {}
+            _provider = PROVIDERS[LLM_PROVIDER](**kwargs)
+            logger.info(f"LLM provider: {_provider.name}")
+        return _provider
+
+#Swap the provider (e.g. a ReplayProvider in benchmarks)
+def set_provider(provider):
+    global _provider
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,188 @@
+import re
+import json
+import logging
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+#*********Salvaging truncated/malformed task JSON from the LLM & merging regenerated parts...************
+
+REQUIRED_FIELDS = ["Sprint", "Task_ID", "Task", "Start", "End"]
+# Follow-up LLM calls allowed for one generation
+MAX_RECOVERY_ROUNDS = 2
+
+_decoder = json.JSONDecoder()
+
+#End of the object starting at text[start] ("{"), or None when the text stops first
+def _object_end(text, start):
+    depth, in_string, escaped = 0, False, False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+#Problem with a parsed task, or None when it is usable
+def task_problem(task):
+    if not isinstance(task, dict):
+        return "not an object"
+    missing = [f for f in REQUIRED_FIELDS if not str(task.get(f) or "").strip()]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    start, end = pd.to_datetime(task["Start"], errors="coerce"), pd.to_datetime(task["End"], errors="coerce")
+    if pd.isna(start) or pd.isna(end):
+        return "invalid dates"
+    if end < start:
+        return "ends before it starts"
+    return None
+
+#Every complete, valid task object in an LLM response, plus the invalid entries, whether the array was cut off
+#and whether the model answered with an empty array
+def salvage_tasks(text):
+    result = {"tasks": [], "invalid": [], "truncated": False, "empty": False}
+    text = text or ""
+    first_object = text.find("{")
+    if first_object < 0:
+        result["empty"] = re.search(r"\[\s*\]", text) is not None
+        return result
+    # Markdown fences or prose before the array are skipped (brackets in the prose too: the array is the last "[" before
+    # the first object); bare objects without an array are accepted
+    array_start = text.rfind("[", 0, first_object)
+    in_array = array_start >= 0
+    pos = array_start + 1 if in_array else first_object
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text):
+            result["truncated"] = in_array  # no closing "]"
+            return result
+        if text[pos] == "]":
+            return result
+        if text[pos] != "{":
+            # Stray text between objects: skip to the next object or the end of the array
+            following = [i for i in (text.find("{", pos), text.find("]", pos)) if i >= 0]
+            if not following:
+                result["truncated"] = in_array
+                return result
+            pos = min(following)
+            continue
+        end = _object_end(text, pos)
+        if end is None:
+            result["truncated"] = True  # the output stopped inside this object
+            return result
+        try:
+            task, _ = _decoder.raw_decode(text, pos)
+            problem = task_problem(task)
+        except json.JSONDecodeError as e:
+            task, problem = None, f"malformed JSON ({e.msg})"
+        if problem:
+            result["invalid"].append({"raw": text[pos:end][:500], "problem": problem})
+        else:
+            result["tasks"].append(task)
+        pos = end
+
+def _id_number(task_id):
+    digits = "".join(ch for ch in str(task_id) if ch.isdigit())
+    return int(digits) if digits else 0
+
+#Add regenerated tasks; ids already taken by a different task are renumbered and references to them remapped
+def merge_tasks(tasks, extra):
+    merged = list(tasks)
+    by_id = {str(t["Task_ID"]): t for t in merged}
+    next_id = max([_id_number(t) for t in by_id] + [_id_number(t["Task_ID"]) for t in extra] + [0]) + 1
+    remap = {}
+    for task in extra:
+        task_id = str(task["Task_ID"])
+        existing = by_id.get(task_id)
+        if existing is not None:
+            if str(existing.get("Task", "")).strip().lower() == str(task.get("Task", "")).strip().lower():
+                continue  # the model repeated a task it had already produced
+            remap[task_id] = f"T{next_id}"
+            next_id += 1
+            task = {**task, "Task_ID": remap[task_id]}
+        by_id[str(task["Task_ID"])] = task
+        merged.append(task)
+    if remap:
+        for task in merged[len(tasks):]:
+            task["Task_Dependency"] = [remap.get(str(d), str(d)) for d in _dependencies(task)]
+    return merged
+
+def _dependencies(task):
+    deps = task.get("Task_Dependency") or []
+    if isinstance(deps, str):
+        deps = deps.split(",")
+    return [str(d).strip() for d in deps if str(d).strip()]
+
+#Drop dependencies on unknown tasks, on the task itself and those closing a cycle; returns the number dropped
+def validate_dependencies(tasks):
+    ids = {str(t["Task_ID"]) for t in tasks}
+    dropped = 0
+    graph = {}
+    for task in tasks:
+        task_id = str(task["Task_ID"])
+        deps = _dependencies(task)
+        kept = list(dict.fromkeys(d for d in deps if d in ids and d != task_id))
+        dropped += len(deps) - len(kept)
+        graph[task_id] = kept
+    # Depth-first walk; an edge back to a task still on the stack closes a cycle
+    state = {}
+    for root in graph:
+        if root in state:
+            continue
+        state[root] = "open"
+        stack = [(root, iter(list(graph[root])))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                state[node] = "done"
+                stack.pop()
+            elif state.get(child) == "open":
+                graph[node].remove(child)
+                dropped += 1
+            elif child not in state:
+                state[child] = "open"
+                stack.append((child, iter(list(graph[child]))))
+    for task in tasks:
+        task["Task_Dependency"] = graph[str(task["Task_ID"])]
+    return dropped
+
+#Parse an LLM task list, asking regenerate(tasks, invalid, truncated) for only what is missing; returns (tasks, notes)
+def recover_task_list(response, regenerate, max_rounds=MAX_RECOVERY_ROUNDS):
+    salvaged = salvage_tasks(response)
+    if salvaged["empty"]:
+        raise RuntimeError("LLM returned an empty task list. Please try again.")
+    tasks, notes = merge_tasks([], salvaged["tasks"]), []
+    rounds = 0
+    while (salvaged["truncated"] or salvaged["invalid"]) and rounds < max_rounds:
+        rounds += 1
+        reason = "was cut off" if salvaged["truncated"] else f"had {len(salvaged['invalid'])} invalid entries"
+        logger.warning(f"LLM task output {reason}; kept {len(tasks)} tasks, requesting the rest (round {rounds})")
+        notes.append(f"Task output {reason}; regenerated only the missing part (kept {len(tasks)} tasks).")
+        try:
+            salvaged = salvage_tasks(regenerate(tasks, salvaged["invalid"], salvaged["truncated"]))
+        except Exception as e:
+            logger.error(f"Task regeneration failed: {str(e)}")
+            notes.append(f"Regeneration failed: {str(e)}")
+            break
+        tasks = merge_tasks(tasks, salvaged["tasks"])
+    if salvaged["truncated"] or salvaged["invalid"]:
+        notes.append("Some tasks could not be recovered; the plan may be incomplete.")
+    dropped = validate_dependencies(tasks)
+    if dropped:
+        notes.append(f"Removed {dropped} invalid or circular task dependencies.")
+    return tasks, notes
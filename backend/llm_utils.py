@@ -1,99 +1,236 @@
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_groq import ChatGroq
-from dotenv import load_dotenv
-
-load_dotenv()
-
-def get_llm():
-    return ChatGroq(model_name="llama3-70b-8192")
-
-def generate_tasks_with_llm(context_text: str,sprints):
-    prompt = ChatPromptTemplate.from_template(
-        """
-     You are an expert project planner AI.
-
-🎯 Objective:
-Generate a structured task breakdown for the project using valid JSON format only.
-
-📦 Sprint Setup:
-- Sprint Duration Type: {sprints} (e.g., weekly = 7 days, biweekly = 14 days, monthly = approx. 30 days)
-- Tasks must be assigned strictly within the boundaries of their respective sprint windows.
-- Sprint 1 should begin on the project start date.
-- Sprint 2 starts after Sprint 1 ends, and so on.
-
-📄 Input Context:
-{context_text}
-
-📌 Output JSON format:
-[
-  {{
-    "Sprint": "Sprint 1",
-    "Task_ID": "T1",
-    "Task": "Design the landing page UI",
-    "Task_Dependency": [],
-    "Estimated Time": "2 days",
-    "Start": "YYYY-MM-DD",
-    "End": "YYYY-MM-DD"
-  }},
-  ...
-]
-
-🚫 Constraints:
-- Output must be pure valid JSON only — no comments, markdown, explanation, or extra text.
-- Use only the working days provided in the context.
-- Exclude weekends and user-defined holidays.
-- Respect task dependencies: a task must start **after** all its dependencies end.
-- Distribute tasks logically across all sprints.
-- Tasks can run in **parallel** (i.e., multiple tasks can occur on the same day) **as long as they do not conflict by dependency.**
-- If the timeline is tight, slightly extend the project end date, but stay close.
-
-     """
-    )
-
-    llm = get_llm()
-    chain = prompt | llm | StrOutputParser()
-    return chain.invoke({"context_text": context_text , "sprints": sprints})
-
-
-def example(pdf_txt,description):
-    prompt = ChatPromptTemplate.from_template(
-
-        """ Prompt for Generating a Project Task Table
-        Prompt:
-        You are a project management assistant tasked with creating a structured table to organize tasks for a given project. The table should have three columns: Planning, Assets, and Feature. Based on the project description provided below, generate a comprehensive list of tasks required to complete the project. Classify each task into one of the three columns (Planning, Assets, or Feature) and list them in the order they should be executed. Ensure the tasks are specific, actionable, and relevant to the project description. Format the output as a markdown table.
-        Project Description:{pdf_txt}
-        Instructions:
-    
-        Analyze the project description to identify all necessary tasks.
-        Categorize each task into one of the following columns:
-        Planning: Tasks related to project strategy, timelines, research, or coordination (e.g., defining scope, creating timelines, stakeholder meetings).
-        Assets: Tasks related to creating or acquiring resources, tools, or materials (e.g., designing assets, purchasing software, gathering data).
-        Feature: Tasks related to developing or implementing specific functionalities or deliverables (e.g., coding a feature, testing a component, deploying a module).
-    
-    
-        List tasks in the chronological order of execution, ensuring dependencies are considered (e.g., planning tasks typically come before asset creation, which precedes feature development).
-        Present the tasks in a markdown table with the columns Planning, Assets, and Feature. If a task does not apply to a column for a given row, leave that cell empty.
-        Ensure the table is clear, concise, and professional, with tasks described in a way that is actionable and specific to the project.
-    
-        Example Output:
-    
-        | Planning                          | Assets                         | Feature                      |
-        |-----------------------------------|--------------------------------|------------------------------|
-        | Define project scope and objectives |                                |                              |
-        | Create project timeline           |                                |                              |
-        |                                   | Design UI mockups             |                              |
-        |                                   | Set up development environment |                              |
-        |                                   |                                | Implement user authentication |
-        |                                   |                                | Test feature compatibility   |
-        |                                   |                                | Deploy project to production  |
-    
-    
-        Project Description for Processing:{description}
-        """)
-
-    llm = get_llm()
-    chain = prompt | llm | StrOutputParser()
-    return chain.invoke({"pdf_txt": pdf_txt, "description": description})
-
-
+# langchain modules are imported inside the functions (and by the provider) so importing this module stays cheap
+from dotenv import load_dotenv
+from backend.tracing import traced
+from backend.llm_provider import get_provider
+from datetime import date, timedelta
+import numpy as np
+import logging
+import re
+import os
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Caps simultaneous LLM requests across all threads (job workers, batch planner)
+def set_llm_concurrency(limit):
+    get_provider().set_concurrency(limit)
+
+#*********Token-budgeted context for the task generation prompt...************
+
+# Tokens allowed for the context block; llama3-70b-8192 shares 8192 tokens between prompt and the JSON answer
+CONTEXT_TOKEN_BUDGET = int(os.getenv("LLM_CONTEXT_TOKENS", "3000"))
+# Share of the budget the project description may keep when the PDF text has to be trimmed too
+DESCRIPTION_SHARE = 0.3
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+#Approximate Llama token count: words, numbers and punctuation marks each count as one token
+def count_tokens(text):
+    return len(_TOKEN_RE.findall(text or ""))
+
+#Working days as Mon-Fri ranges plus the exception dates, instead of every date spelled out
+def compact_calendar(days):
+    days = sorted({d if isinstance(d, date) else date.fromisoformat(str(d)[:10]) for d in days})
+    if not days:
+        return "Working days: none"
+    dates = np.array(days, dtype="datetime64[D]")
+    weekdays = np.arange(dates[0], dates[-1] + 1, dtype="datetime64[D]")
+    weekdays = weekdays[np.is_busday(weekdays)]
+    holidays = np.setdiff1d(weekdays, dates)
+    extra = dates[~np.is_busday(dates)]
+    lines = [f"Working days: Mon-Fri from {days[0]} to {days[-1]} ({len(days)} days)"]
+    if len(holidays):
+        lines.append("Except (holidays): " + ", ".join(str(d) for d in holidays))
+    if len(extra):
+        lines.append("Also working (weekend days): " + ", ".join(str(d) for d in extra))
+    return "\n".join(lines)
+
+#Collapse whitespace and drop repeated lines (PDF page headers/footers)
+def condense_text(text):
+    seen, lines = set(), []
+    for line in (text or "").splitlines():
+        line = " ".join(line.split())
+        key = line.lower()
+        if not line or (key in seen and len(line) < 200):
+            continue
+        seen.add(key)
+        lines.append(line)
+    return "\n".join(lines)
+
+#Cut text to a token budget on a line or sentence boundary, noting how much was dropped
+def trim_to_tokens(text, budget):
+    total = count_tokens(text)
+    if total <= budget:
+        return text
+    budget -= count_tokens(f"[... {total} tokens omitted]")
+    if budget <= 0:
+        return f"[{total} tokens omitted]"
+    cut, used = 0, 0
+    for match in _TOKEN_RE.finditer(text):
+        used += 1
+        if used > budget:
+            break
+        cut = match.end()
+    kept = text[:cut]
+    boundary = max(kept.rfind("\n"), kept.rfind(". "))
+    if boundary > len(kept) // 2:
+        kept = kept[:boundary + 1]
+    return f"{kept.rstrip()}\n[... {total - count_tokens(kept)} tokens omitted]"
+
+#Context for generate_tasks_with_llm within the token budget; returns (context, stats)
+def build_prompt_context(description, pdf_text, start_date, end_date, net_working_days, budget=None):
+    budget = budget or CONTEXT_TOKEN_BUDGET
+    raw_days = [d if isinstance(d, str) else d.strftime("%Y-%m-%d") for d in net_working_days]
+    template = "Project Description:\n{}\n\nExtracted Document Content:\n{}\n\nStart Date: {}\nEnd Date: {}\n{}\n"
+    # What the context used to be: raw text plus every working date spelled out
+    raw_tokens = count_tokens(template.format(description, pdf_text, start_date, end_date, raw_days))
+
+    calendar = compact_calendar(net_working_days)
+    description = condense_text(description)
+    pdf_text = condense_text(pdf_text)
+    room = max(budget - count_tokens(template.format("", "", start_date, end_date, calendar)), 0)
+    description_tokens, pdf_tokens = count_tokens(description), count_tokens(pdf_text)
+    if description_tokens + pdf_tokens > room:
+        # The PDF gives way first; the description keeps at least its share of the room
+        description = trim_to_tokens(description, max(int(room * DESCRIPTION_SHARE), room - pdf_tokens))
+        pdf_text = trim_to_tokens(pdf_text, room - count_tokens(description))
+    context = template.format(description, pdf_text or "(none)", start_date, end_date, calendar)
+    return context, {"raw_tokens": raw_tokens, "tokens": count_tokens(context), "budget": budget}
+
+@traced("groq.generate_tasks")
+def generate_tasks_with_llm(context_text: str,sprints):
+    from langchain_core.prompts import ChatPromptTemplate
+    prompt = ChatPromptTemplate.from_template(
+        """
+     You are an expert project planner AI.
+
+🎯 Objective:
+Generate a structured task breakdown for the project using valid JSON format only.
+
+📦 Sprint Setup:
+- Sprint Duration Type: {sprints} (e.g., weekly = 7 days, biweekly = 14 days, monthly = approx. 30 days)
+- Tasks must be assigned strictly within the boundaries of their respective sprint windows.
+- Sprint 1 should begin on the project start date.
+- Sprint 2 starts after Sprint 1 ends, and so on.
+
+📄 Input Context:
+{context_text}
+
+📌 Output JSON format:
+[
+  {{
+    "Sprint": "Sprint 1",
+    "Task_ID": "T1",
+    "Task": "Design the landing page UI",
+    "Task_Dependency": [],
+    "Estimated Time": "2 days",
+    "Start": "YYYY-MM-DD",
+    "End": "YYYY-MM-DD"
+  }},
+  ...
+]
+
+🚫 Constraints:
+- Output must be pure valid JSON only — no comments, markdown, explanation, or extra text.
+- Use only the working days provided in the context.
+- Exclude weekends and user-defined holidays.
+- Respect task dependencies: a task must start **after** all its dependencies end.
+- Distribute tasks logically across all sprints.
+- Tasks can run in **parallel** (i.e., multiple tasks can occur on the same day) **as long as they do not conflict by dependency.**
+- If the timeline is tight, slightly extend the project end date, but stay close.
+
+     """
+    )
+
+    return get_provider().invoke(prompt, {"context_text": context_text, "sprints": sprints}, call="generate_tasks")
+
+
+#Ask for only the tasks missing from a cut-off answer and replacements for invalid entries
+@traced("groq.regenerate_tasks")
+def regenerate_tasks_with_llm(context_text, sprints, tasks, invalid, truncated, recent=20):
+    from langchain_core.prompts import ChatPromptTemplate
+    prompt = ChatPromptTemplate.from_template(
+        """
+You are an expert project planner AI. An earlier answer to the request below was incomplete.
+
+📄 Input Context:
+{context_text}
+
+📦 Sprint Duration Type: {sprints}
+
+✅ Tasks already generated ({count}): {task_ids}
+The most recent of them:
+{recent_tasks}
+
+🛠️ What is needed:
+{request}
+
+📌 Answer with a JSON array of the new task objects only, in the same format as before:
+{{"Sprint": "...", "Task_ID": "...", "Task": "...", "Task_Dependency": [...], "Estimated Time": "...", "Start": "YYYY-MM-DD", "End": "YYYY-MM-DD"}}
+- Do not repeat tasks that were already generated.
+- Dependencies may refer to the tasks already generated.
+- Use only the working days provided in the context.
+- Output must be pure valid JSON only — no comments, markdown, explanation, or extra text.
+"""
+    )
+    request = []
+    if truncated:
+        last_id = tasks[-1]["Task_ID"] if tasks else "none"
+        request.append(f"- The answer stopped after Task_ID {last_id}. Continue the plan from there until every sprint is covered.")
+    if invalid:
+        entries = "\n".join(f"  {entry['raw']}  ({entry['problem']})" for entry in invalid)
+        request.append(f"- Regenerate these invalid entries, keeping their Task_ID where possible:\n{entries}")
+    recent_tasks = "\n".join(
+        f"{t['Task_ID']} | {t.get('Sprint', '')} | {t.get('Task', '')} | {t.get('Start', '')} to {t.get('End', '')}" for t in tasks[-recent:]
+    )
+    return get_provider().invoke(prompt, {
+        "context_text": context_text,
+        "sprints": sprints,
+        "count": len(tasks),
+        "task_ids": ", ".join(str(t["Task_ID"]) for t in tasks) or "none",
+        "recent_tasks": recent_tasks or "(none)",
+        "request": "\n".join(request),
+    }, call="regenerate_tasks")
+
+
+@traced("groq.example")
+def example(pdf_txt,description):
+    from langchain_core.prompts import ChatPromptTemplate
+    prompt = ChatPromptTemplate.from_template(
+
+        """ Prompt for Generating a Project Task Table
+        Prompt:
+        You are a project management assistant tasked with creating a structured table to organize tasks for a given project. The table should have three columns: Planning, Assets, and Feature. Based on the project description provided below, generate a comprehensive list of tasks required to complete the project. Classify each task into one of the three columns (Planning, Assets, or Feature) and list them in the order they should be executed. Ensure the tasks are specific, actionable, and relevant to the project description. Format the output as a markdown table.
+        Project Description:{pdf_txt}
+        Instructions:
+    
+        Analyze the project description to identify all necessary tasks.
+        Categorize each task into one of the following columns:
+        Planning: Tasks related to project strategy, timelines, research, or coordination (e.g., defining scope, creating timelines, stakeholder meetings).
+        Assets: Tasks related to creating or acquiring resources, tools, or materials (e.g., designing assets, purchasing software, gathering data).
+        Feature: Tasks related to developing or implementing specific functionalities or deliverables (e.g., coding a feature, testing a component, deploying a module).
+    
+    
+        List tasks in the chronological order of execution, ensuring dependencies are considered (e.g., planning tasks typically come before asset creation, which precedes feature development).
+        Present the tasks in a markdown table with the columns Planning, Assets, and Feature. If a task does not apply to a column for a given row, leave that cell empty.
+        Ensure the table is clear, concise, and professional, with tasks described in a way that is actionable and specific to the project.
+    
+        Example Output:
+    
+        | Planning                          | Assets                         | Feature                      |
+        |-----------------------------------|--------------------------------|------------------------------|
+        | Define project scope and objectives |                                |                              |
+        | Create project timeline           |                                |                              |
+        |                                   | Design UI mockups             |                              |
+        |                                   | Set up development environment |                              |
+        |                                   |                                | Implement user authentication |
+        |                                   |                                | Test feature compatibility   |
+        |                                   |                                | Deploy project to production  |
+    
+    
+        Project Description for Processing:{description}
+        """)
+
+    return get_provider().invoke(prompt, {"pdf_txt": pdf_txt, "description": description}, call="example")
+
+
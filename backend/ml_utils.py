@@ -1,36 +1,129 @@
-
-from langchain_huggingface import HuggingFaceEmbeddings
-import pandas as pd
-from sklearn.model_selection import train_test_split
-
-
-
-#*********Functions for dealing with Model related tasks...************
-
-#Read dataset for model creation
-def read_data(data):
-    df = pd.read_csv(data,delimiter=',', header=None)
-    return df
-
-#Create embeddings instance
-def get_embeddings():
-    embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-    return embeddings
-
-#Generating embeddings for our input dataset
-def create_embeddings(df,embeddings):
-    df[2] = df[0].apply(lambda x: embeddings.embed_query(x))
-    return df
-
-#Splitting the data into train & test
-def split_train_test__data(df_sample):
-    # Split into training and testing sets
-    sentences_train, sentences_test, labels_train, labels_test = train_test_split(
-    list(df_sample[2]), list(df_sample[1]), test_size=0.25, random_state=0)
-    print(len(sentences_train))
-    return sentences_train, sentences_test, labels_train, labels_test
-
-#Get the accuracy score on test data
-def get_score(svm_classifier,sentences_test,labels_test):
-    score = svm_classifier.score(sentences_test, labels_test)
-    return score
+import os
+import time
+import shutil
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from backend.classification_embeddings import get_embeddings
+
+
+
+#*********Functions for dealing with Model related tasks...************
+
+#Read dataset for model creation
+def read_data(data):
+    df = pd.read_csv(data,delimiter=',', header=None)
+    return df
+
+#Generating embeddings for our input dataset
+def create_embeddings(df,embeddings):
+    df[2] = df[0].apply(lambda x: embeddings.embed_query(x))
+    return df
+
+#Splitting the data into train & test
+def split_train_test__data(df_sample):
+    from sklearn.model_selection import train_test_split
+    # Split into training and testing sets
+    sentences_train, sentences_test, labels_train, labels_test = train_test_split(
+    list(df_sample[2]), list(df_sample[1]), test_size=0.25, random_state=0)
+    print(len(sentences_train))
+    return sentences_train, sentences_test, labels_train, labels_test
+
+#Get the accuracy score on test data
+def get_score(svm_classifier,sentences_test,labels_test):
+    score = svm_classifier.score(sentences_test, labels_test)
+    return score
+
+
+#*********Training every domain model from one labeled dataset...************
+
+# Fewest rows a domain needs before a model is trained for it
+MIN_DOMAIN_ROWS = 8
+
+#Read a CSV of task text, module, domain (an optional header row is skipped)
+def read_domain_data(data):
+    df = pd.read_csv(data, delimiter=',', header=None, dtype=str).iloc[:, :3]
+    df.columns = ["text", "module", "domain"]
+    df = df.dropna()
+    df = df.assign(domain=df["domain"].str.strip())
+    if len(df) and df.iloc[0]["domain"].lower() == "domain":
+        df = df.iloc[1:]
+    return df.reset_index(drop=True)
+
+#Embed each distinct text once; returns a float32 matrix aligned with texts
+def embed_texts(texts, embeddings):
+    unique, inverse = np.unique(np.asarray(texts, dtype=object).astype(str), return_inverse=True)
+    vectors = np.asarray(embeddings.embed_documents(list(unique)), dtype=np.float32)
+    return vectors[inverse]
+
+#Worker: fit one domain's pipeline on its rows of the shared (memory-mapped) matrix and save it next to the target
+def _train_domain(matrix_path, rows, labels, model_path):
+    import joblib
+    from sklearn.svm import SVC
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.model_selection import train_test_split
+    started = time.perf_counter()
+    vectors = np.load(matrix_path, mmap_mode="r")[rows]
+    sentences_train, sentences_test, labels_train, labels_test = train_test_split(
+        vectors, labels, test_size=0.25, random_state=0)
+    model = make_pipeline(StandardScaler(), SVC(class_weight='balanced'))
+    model.fit(sentences_train, labels_train)
+    accuracy = model.score(sentences_test, labels_test)
+    tmp_path = f"{model_path}.tmp"
+    joblib.dump(model, tmp_path)
+    return {"tmp_path": tmp_path, "train_s": time.perf_counter() - started, "accuracy": accuracy}
+
+#Embed once, train every domain model in parallel processes, then install all artifacts or none
+def train_domain_models(df, embeddings=None, workers=None, path_for_domain=None):
+    from backend.home_utils import model_path_for_domain, forget_domain_model
+    path_for_domain = path_for_domain or model_path_for_domain
+    embeddings = embeddings or get_embeddings()
+    # Worker rows are positions into the embedding matrix, so the index must be 0..n-1
+    df = df.reset_index(drop=True)
+    df = df.assign(domain=df["domain"].astype(str).str.strip())
+
+    started = time.perf_counter()
+    matrix = embed_texts(df["text"], embeddings)
+    embed_s = time.perf_counter() - started
+
+    df = df.assign(model_path=df["domain"].map(path_for_domain))
+    report, jobs = [], {}
+    tmp_dir = tempfile.mkdtemp(prefix="domain_training_")
+    try:
+        matrix_path = os.path.join(tmp_dir, "embeddings.npy")
+        np.save(matrix_path, matrix)
+        # spawn keeps the workers clear of the parent's torch/Streamlit threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers or min(df["model_path"].nunique(), os.cpu_count() or 1), mp_context=context) as pool:
+            for model_path, group in df.groupby("model_path"):
+                entry = {"Model": model_path, "Domains": ", ".join(sorted(group["domain"].unique())),
+                         "Rows": len(group), "Modules": group["module"].nunique()}
+                report.append(entry)
+                if len(group) < MIN_DOMAIN_ROWS or entry["Modules"] < 2:
+                    entry["Error"] = f"needs at least {MIN_DOMAIN_ROWS} rows and 2 modules"
+                    continue
+                jobs[model_path] = pool.submit(_train_domain, matrix_path, group.index.to_numpy(), group["module"].to_numpy(), model_path)
+            for entry in report:
+                future = jobs.get(entry["Model"])
+                if future is None:
+                    continue
+                try:
+                    result = future.result()
+                    entry.update({"Train (s)": round(result["train_s"], 2), "Accuracy": round(result["accuracy"], 4), "tmp_path": result["tmp_path"]})
+                except Exception as e:
+                    entry["Error"] = str(e)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    installed = not any("Error" in entry for entry in report)
+    for entry in report:
+        tmp_path = entry.pop("tmp_path", None)
+        if tmp_path and installed:
+            os.replace(tmp_path, entry["Model"])
+            forget_domain_model(entry["Model"])
+        elif tmp_path:
+            os.remove(tmp_path)
+    return {"report": report, "embed_s": embed_s, "rows": len(df), "installed": installed}
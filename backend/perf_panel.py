@@ -0,0 +1,41 @@
+import streamlit as st
+import pandas as pd
+from backend.tracing import bind_session, stage_stats
+from backend.warmup import start_warmup, warmup_status
+
+
+#*********Optional sidebar panel with per-stage timings of this session...************
+
+#Model readiness shown at the top of the sidebar while the warm-up thread runs
+def render_warmup_status():
+    # serve.py already started it at launch; this only covers a plain `streamlit run Home.py`
+    start_warmup()
+    status = warmup_status()
+    failed = [s["step"] for s in status["steps"] if s["error"]]
+    if status["state"] == "ready":
+        st.sidebar.caption(f"🟢 Models ready (cold start {status['ready_s']:.1f}s)")
+    elif status["state"] == "degraded":
+        st.sidebar.caption(f"🟠 Models ready in {status['ready_s']:.1f}s, failed to load: {', '.join(failed)}")
+    else:
+        st.sidebar.caption(f"🟡 Warming up models ({len(status['steps'])}/{status.get('total', '?')})...")
+
+#Bind this session's span list and, if enabled, show the stats in the sidebar
+def render_perf_panel():
+    if "trace_records" not in st.session_state:
+        st.session_state.trace_records = []
+    bind_session(st.session_state.trace_records)
+    render_warmup_status()
+
+    if not st.sidebar.toggle("⏱️ Performance panel", key="show_perf_panel"):
+        return
+    stats = stage_stats(st.session_state.trace_records)
+    if not stats:
+        st.sidebar.info("ℹ️ No timed stages yet in this session.")
+        return
+    st.sidebar.dataframe(pd.DataFrame(stats), hide_index=True, use_container_width=True)
+    steps = warmup_status()["steps"]
+    if steps:
+        st.sidebar.caption("Warm-up: " + ", ".join(f"{s['step']} {s['seconds']:.1f}s" for s in steps))
+    if st.sidebar.button("🧹 Reset timings", key="reset_perf_panel"):
+        st.session_state.trace_records.clear()
+        st.rerun()
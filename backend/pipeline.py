@@ -0,0 +1,98 @@
+import logging
+import numpy as np
+import pandas as pd
+from backend.llm_utils import generate_tasks_with_llm, regenerate_tasks_with_llm, example, build_prompt_context
+from backend.llm_recovery import recover_task_list
+from backend.home_utils import extract_text_from_pdfs, classify_module, model_path_for_domain, load_domain_model
+from backend.dedup_utils import deduplicate_tasks
+from backend.classification_embeddings import get_embeddings
+from backend.duration_index import get_duration_index
+from backend.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********The "Generate Tasks" pipeline, runnable outside the Streamlit script thread...************
+
+#Context sent to the task generation prompt, compacted to the token budget
+def build_context(description, pdf_text, start_date, end_date, net_working_days):
+    context, stats = build_prompt_context(description, pdf_text, start_date, end_date, net_working_days)
+    saved = stats["raw_tokens"] - stats["tokens"]
+    logger.info(f"Prompt context: {stats['tokens']} tokens (budget {stats['budget']}), "
+                f"saved {saved} of {stats['raw_tokens']} ({saved / max(stats['raw_tokens'], 1):.0%})")
+    return context
+
+#Put the Module column right after Task
+def order_columns(df):
+    if "Task" in df.columns and "Module" in df.columns:
+        cols = df.columns.tolist()
+        task_idx = cols.index("Task")
+        cols.insert(task_idx + 1, cols.pop(cols.index("Module")))
+        df = df[cols]
+    return df
+
+#Run PDF extraction, task generation, dedup, classification and the summary table for one project
+@traced("pipeline.generate_plan")
+def generate_plan(params, pdf_files=None, progress=None):
+    progress = progress or (lambda pct, stage: None)
+    warnings = []
+
+    progress(5, "Extracting PDF text")
+    pdf_text = extract_text_from_pdfs(pdf_files, warnings) if pdf_files else ""
+    context = build_context(
+        params["description"], pdf_text, params["start_date"], params["end_date"], params["net_working_days"]
+    )
+
+    progress(15, "Generating tasks")
+    llm_response = generate_tasks_with_llm(context, params["sprint"])
+    # Keep every complete task and ask only for what is missing or invalid
+    task_list, notes = recover_task_list(
+        llm_response,
+        lambda tasks, invalid, truncated: regenerate_tasks_with_llm(context, params["sprint"], tasks, invalid, truncated),
+    )
+    warnings.extend(notes)
+    if task_list:
+        df = pd.DataFrame(task_list)
+    else:
+        logger.error(f"LLM response causing error: {repr(llm_response)}")
+        warnings.append("Failed to parse LLM output. Using default tasks.")
+        df = pd.DataFrame([{"Task": "Default Task", "Module": "Uncategorized"}])
+
+    progress(50, "Merging duplicate tasks")
+    try:
+        df, merged = deduplicate_tasks(df, get_embeddings())
+        if merged:
+            warnings.append(f"Merged {sum(len(m) - 1 for m in merged)} near-duplicate tasks.")
+    except Exception as e:
+        logger.error(f"Task deduplication failed: {str(e)}")
+
+    progress(60, "Classifying tasks into modules")
+    try:
+        model = load_domain_model(params.get("model_path") or model_path_for_domain(params["domain"]))
+        modules, errors = [], []
+        for i, task in enumerate(df["Task"]):
+            modules.append(classify_module(task, model, errors))
+            progress(60 + 20 * (i + 1) // len(df), "Classifying tasks into modules")
+        df["Module"] = modules
+        if errors:
+            warnings.append(f"{len(errors)} task(s) could not be classified and are Uncategorized. {errors[0]}")
+        df = order_columns(df)
+    except Exception as e:
+        logger.error(f"Error loading model for {params.get('domain')}: {str(e)}")
+        warnings.append("No model loaded. Task classification skipped.")
+        df["Module"] = "Uncategorized"
+    df["Domain"] = params["domain"]
+
+    progress(80, "Estimating durations from past projects")
+    try:
+        index = get_duration_index()
+        if len(index):
+            df["Historical Days"] = np.round(index.predict(df["Task"], df["Module"], params["domain"]), 1)
+    except Exception as e:
+        logger.error(f"Historical duration estimate failed: {str(e)}")
+
+    progress(85, "Building task table")
+    table_md = example(pdf_text, params["description"])
+
+    progress(100, "Done")
+    return {"tasks": df.to_dict("records"), "table_md": table_md, "warnings": warnings}
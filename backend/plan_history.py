@@ -0,0 +1,196 @@
+import zlib
+import logging
+from datetime import datetime
+import bson
+from pymongo.errors import DuplicateKeyError
+from backend.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********Plan version history: periodic base snapshots plus per-save deltas keyed by Task_ID...************
+
+HISTORY_COLLECTION = "plan_history"
+# A full snapshot is written every this many versions so a rebuild never replays more deltas than this
+REBASE_EVERY = 20
+# ...or sooner when a single save touches more than this share of the tasks
+REBASE_CHANGE_SHARE = 0.5
+# Attempts at taking the next version number when another save takes it first
+RECORD_ATTEMPTS = 5
+
+# Latest reconstructed state per project: (version, {key: record}, [key order]); keys are Task_IDs made unique
+_latest = {}
+_indexed = False
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and a != a and b != b:
+        return True  # NaN
+    return a == b
+
+def _pack(tasks):
+    return bson.Binary(zlib.compress(bson.encode({"tasks": tasks})))
+
+def _unpack(blob):
+    return bson.decode(zlib.decompress(blob))["tasks"]
+
+#Key of every record: its Task_ID, made unique for repeated IDs ("T4#2") and blank ones ("#<row>") so none are lost
+def _history_keys(records):
+    keys, seen = [], {}
+    for row, record in enumerate(records):
+        task_id = str(record.get("Task_ID") or "").strip()
+        if task_id.lower() in ("", "nan", "none"):
+            keys.append(f"#{row + 1}")
+            continue
+        seen[task_id] = seen.get(task_id, 0) + 1
+        keys.append(task_id if seen[task_id] == 1 else f"{task_id}#{seen[task_id]}")
+    return keys
+
+def _state(records):
+    tasks = {key: {k: v for k, v in r.items() if k != "_id"} for key, r in zip(_history_keys(records), records)}
+    return tasks, list(tasks)
+
+#Changes between two states: new/changed fields per Task_ID, removed Task_IDs, and the order if it moved
+def compute_delta(old_tasks, old_order, new_tasks, new_order):
+    changed = {}
+    for task_id, record in new_tasks.items():
+        before = old_tasks.get(task_id)
+        if before is None:
+            changed[task_id] = dict(record)
+            continue
+        fields = {k: v for k, v in record.items() if k not in before or not _same(before[k], v)}
+        fields.update({k: None for k in before if k not in record})
+        if fields:
+            changed[task_id] = fields
+    # Stored as [Task_ID, fields] pairs so Task_IDs never become document keys
+    delta = {"changed": [[t, fields] for t, fields in changed.items()], "removed": [t for t in old_order if t not in new_tasks]}
+    if new_order != old_order:
+        delta["order"] = new_order
+    return delta
+
+def apply_delta(tasks, order, delta, only=None):
+    for task_id in delta["removed"]:
+        tasks.pop(task_id, None)
+    for task_id, fields in delta["changed"]:
+        if only is not None and task_id not in only:
+            continue
+        tasks.setdefault(task_id, {}).update(fields)
+    if "order" in delta:
+        order = [t for t in delta["order"] if only is None or t in only]
+    return tasks, order
+
+def _latest_version(db, project_name):
+    doc = db[HISTORY_COLLECTION].find_one({"project": project_name}, {"version": 1}, sort=[("version", -1)])
+    return doc["version"] if doc else 0
+
+#Record a saved state as a new version; returns the version number, or None when nothing changed
+@traced("history.record")
+def record_version(db, project_name, records):
+    global _indexed
+    collection = db[HISTORY_COLLECTION]
+    if not _indexed:
+        collection.create_index([("project", 1), ("version", 1)], unique=True)
+        _indexed = True
+    new_tasks, new_order = _state(records)
+    # The unique index allocates version numbers: a concurrent save taking the same one makes this one retry on top of it
+    for attempt in range(RECORD_ATTEMPTS):
+        version = _insert_version(collection, db, project_name, new_tasks, new_order)
+        if version is not False:
+            return version
+        logger.info(f"Version of {project_name} taken by a concurrent save, retrying ({attempt + 1}/{RECORD_ATTEMPTS})")
+    raise RuntimeError(f"Could not record a version of {project_name} after {RECORD_ATTEMPTS} attempts")
+
+#One attempt at recording the next version; False when another save took the number first
+def _insert_version(collection, db, project_name, new_tasks, new_order):
+    latest = _latest_version(db, project_name)
+    cached = _latest.get(project_name)
+    if latest == 0:
+        old_tasks, old_order = {}, []
+    elif cached and cached[0] == latest:
+        old_tasks, old_order = cached[1], cached[2]
+    else:
+        old_tasks, old_order = load_version(db, project_name, latest)
+
+    delta = compute_delta(old_tasks, old_order, new_tasks, new_order)
+    if latest and not delta["changed"] and not delta["removed"] and "order" not in delta:
+        return None
+    version = latest + 1
+    last_base = collection.find_one({"project": project_name, "kind": "base"}, {"version": 1}, sort=[("version", -1)])
+    rebase = (last_base is None or version - last_base["version"] >= REBASE_EVERY
+              or len(delta["changed"]) + len(delta["removed"]) > REBASE_CHANGE_SHARE * max(len(new_tasks), 1))
+    doc = {
+        "project": project_name,
+        "version": version,
+        "kind": "base" if rebase else "delta",
+        "saved_at": datetime.now(),
+        "tasks_count": len(new_tasks),
+        "changed_count": len(delta["changed"]),
+        "removed_count": len(delta["removed"]),
+        # Deltas are kept on bases too, so diffs can always walk the delta chain
+        "delta": delta,
+    }
+    if rebase:
+        doc["snapshot"] = _pack([new_tasks[t] for t in new_order])
+    try:
+        collection.insert_one(doc)
+    except DuplicateKeyError:
+        return False
+    _latest[project_name] = (version, new_tasks, new_order)
+    return version
+
+#Rebuild a version from its nearest base and the deltas after it, optionally only for some Task_IDs
+@traced("history.load_version")
+def load_version(db, project_name, version, only=None):
+    collection = db[HISTORY_COLLECTION]
+    base = collection.find_one({"project": project_name, "kind": "base", "version": {"$lte": version}}, sort=[("version", -1)])
+    if base is None:
+        return {}, []
+    tasks, order = _state(_unpack(base["snapshot"]))
+    if only is not None:
+        tasks = {key: record for key, record in tasks.items() if key in only}
+        order = [key for key in order if key in tasks]
+    deltas = collection.find(
+        {"project": project_name, "version": {"$gt": base["version"], "$lte": version}}, {"delta": 1}
+    ).sort("version", 1)
+    for doc in deltas:
+        tasks, order = apply_delta(tasks, order, doc["delta"], only)
+    return tasks, order
+
+#Task records of a version in plan order
+def version_records(db, project_name, version):
+    tasks, order = load_version(db, project_name, version)
+    return [tasks[t] for t in order if t in tasks]
+
+def list_versions(db, project_name):
+    return list(db[HISTORY_COLLECTION].find(
+        {"project": project_name}, {"_id": 0, "delta": 0, "snapshot": 0}
+    ).sort("version", -1))
+
+#Field-level differences between two versions; only the tasks touched in between are rebuilt
+@traced("history.diff")
+def diff_versions(db, project_name, old_version, new_version):
+    if old_version > new_version:
+        old_version, new_version = new_version, old_version
+    touched = set()
+    for doc in db[HISTORY_COLLECTION].find(
+        {"project": project_name, "version": {"$gt": old_version, "$lte": new_version}}, {"delta": 1}
+    ):
+        touched.update(task_id for task_id, _ in doc["delta"]["changed"])
+        touched.update(doc["delta"]["removed"])
+    if not touched:
+        return []
+    before, _ = load_version(db, project_name, old_version, only=touched)
+    after, _ = load_version(db, project_name, new_version, only=touched)
+    rows = []
+    for task_id in sorted(touched):
+        old, new = before.get(task_id), after.get(task_id)
+        if old is None and new is None:
+            continue
+        if old is None:
+            rows.append({"Task_ID": task_id, "Change": "added", "Field": "", "Before": "", "After": new.get("Task", "")})
+        elif new is None:
+            rows.append({"Task_ID": task_id, "Change": "removed", "Field": "", "Before": old.get("Task", ""), "After": ""})
+        else:
+            for field in sorted(set(old) | set(new)):
+                if not _same(old.get(field), new.get(field)):
+                    rows.append({"Task_ID": task_id, "Change": "changed", "Field": field, "Before": old.get(field), "After": new.get(field)})
+    return rows
@@ -0,0 +1,86 @@
+import io
+import json
+import logging
+import pandas as pd
+from pymongo import UpdateOne, DeleteMany
+from backend.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********Resource profiles: bulk import, batched saves & cascading removal...************
+
+RESOURCE_COLLECTION = "resources"
+ROLES = ["Developer", "Designer", "Manager", "Tester", "Other"]
+AVAILABILITY = ["Available", "Assigned"]
+
+def _split_skills(skills):
+    if isinstance(skills, (list, tuple)):
+        return [str(s).strip() for s in skills if str(s).strip()]
+    if not isinstance(skills, str):
+        return []
+    return [s.strip() for s in skills.replace(";", ",").split(",") if s.strip()]
+
+#Normalise one profile; returns None when it has no name
+def make_resource(name, role=None, skills=None, availability=None):
+    name = str(name or "").strip()
+    if not name or name == "nan":
+        return None
+    role = str(role or "").strip().title()
+    availability = str(availability or "").strip().title()
+    return {
+        "name": name,
+        "role": role if role in ROLES else "Other",
+        "skills": _split_skills(skills),
+        "availability": availability if availability in AVAILABILITY else "Available",
+    }
+
+#Profiles from an uploaded CSV (name, role, skills, availability columns) or JSON list; returns (profiles, errors)
+def parse_resource_file(file):
+    raw = file.getvalue() if hasattr(file, "getvalue") else file.read()
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8-sig")
+    if getattr(file, "name", "").lower().endswith(".json"):
+        data = json.loads(raw)
+        rows = data.get("resources", []) if isinstance(data, dict) else data
+    else:
+        df = pd.read_csv(io.StringIO(raw), dtype=str).fillna("")
+        df.columns = [c.strip().lower() for c in df.columns]
+        rows = df.to_dict("records")
+
+    profiles, errors = {}, []
+    for i, row in enumerate(rows, start=1):
+        row = {str(k).strip().lower(): v for k, v in row.items()}
+        profile = make_resource(row.get("name"), row.get("role"), row.get("skills"), row.get("availability") or row.get("status"))
+        if profile is None:
+            errors.append(f"Row {i}: missing name")
+            continue
+        profiles[profile["name"]] = profile  # later rows win
+    return list(profiles.values()), errors
+
+#Upsert and delete profiles in a single bulk_write
+@traced("resources.save")
+def save_resources(db, profiles, deleted_names=()):
+    operations = [UpdateOne({"name": p["name"]}, {"$set": p}, upsert=True) for p in profiles]
+    if deleted_names:
+        operations.append(DeleteMany({"name": {"$in": list(deleted_names)}}))
+    if not operations:
+        return None
+    return db[RESOURCE_COLLECTION].bulk_write(operations, ordered=False)
+
+#Unassign removed resources from every project with one update_many per collection
+@traced("resources.unassign")
+def unassign_resources(db, names):
+    from backend.db_utils import list_projects
+    from backend.workload_utils import WORKLOAD_COLLECTION
+    names = list(names)
+    if not names:
+        return 0
+    modified = 0
+    for project in list_projects(db):
+        modified += db[project].update_many({"Resource": {"$in": names}}, {"$set": {"Resource": ""}}).modified_count
+    db[WORKLOAD_COLLECTION].delete_many({"resource": {"$in": names}})
+    return modified
+
+def load_resources(db):
+    return list(db[RESOURCE_COLLECTION].find({}, {"_id": 0}))
@@ -0,0 +1,108 @@
+import re
+import numpy as np
+from backend.tracing import traced
+
+
+#*********Monte Carlo schedule risk over the dependency DAG...************
+
+# Triangular duration spread per module as (optimistic, pessimistic) multipliers of the estimate
+MODULE_UNCERTAINTY = {
+    "UI": (0.85, 1.5),
+    "Design": (0.8, 1.6),
+    "Rigging": (0.85, 1.8),
+    "Animation": (0.85, 1.9),
+    "Development": (0.8, 2.0),
+    "VFX/SFX": (0.85, 1.8),
+}
+DEFAULT_UNCERTAINTY = (0.85, 1.6)
+
+HOURS_PER_DAY = 8
+_UNIT_DAYS = {"h": 1 / HOURS_PER_DAY, "d": 1, "w": 5, "m": 21}
+_ESTIMATE_RE = re.compile(r"([\d.]+)\s*(h|hr|hrs|hour|hours|d|day|days|w|wk|wks|week|weeks|m|mo|month|months)\b", re.I)
+
+#"2 days" -> 2.0, "4 hrs" -> 0.5, "1 week" -> 5.0 working days; NaN when unparseable
+def parse_estimated_days(text):
+    match = _ESTIMATE_RE.search(str(text))
+    if not match:
+        return np.nan
+    return float(match.group(1)) * _UNIT_DAYS[match.group(2)[0].lower()]
+
+#Topological level of each task: 0 for tasks without prerequisites
+def topological_levels(schedule):
+    level = np.zeros(len(schedule.ids), dtype=np.int64)
+    for i in schedule.order:
+        if schedule.parents[i]:
+            level[i] = 1 + max(level[p] for p in schedule.parents[i])
+    return level
+
+#Edges grouped by the level of their child, sorted by child so np.maximum.reduceat can fold them
+def _edges_by_level(schedule, level):
+    groups = []
+    for lvl in range(1, int(level.max(initial=0)) + 1):
+        children = np.nonzero(level == lvl)[0]
+        parents = [schedule.parents[c] for c in children]
+        counts = np.array([len(p) for p in parents])
+        edge_child = np.repeat(children, counts)
+        edge_parent = np.fromiter((p for ps in parents for p in ps), dtype=np.int64, count=counts.sum())
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        groups.append((children, edge_parent, edge_child, offsets))
+    return groups
+
+#Sample durations and propagate start/finish level by level for many iterations at once
+@traced("risk.simulate")
+def simulate_schedule(schedule, modules, estimates=None, iterations=10000, seed=None, batch_size=2000):
+    n = len(schedule.ids)
+    rng = np.random.default_rng(seed)
+    planned = schedule.duration.astype(np.float64)
+    if estimates is not None:
+        estimates = np.asarray(estimates, dtype=np.float64)
+        planned = np.where(np.isfinite(estimates) & (estimates > 0), estimates, planned)
+    spread = np.array([MODULE_UNCERTAINTY.get(str(m), DEFAULT_UNCERTAINTY) for m in modules], dtype=np.float64).reshape(n, 2)
+    low, high = planned * spread[:, 0], planned * spread[:, 1]
+    earliest = schedule.start.astype(np.float64)
+
+    level = topological_levels(schedule)
+    groups = _edges_by_level(schedule, level)
+    roots = np.nonzero(level == 0)[0]
+
+    completion = np.empty(iterations)
+    critical_counts = np.zeros(n)
+    # Arrays are task-major (tasks x iterations) so selecting a level's tasks reads contiguous rows
+    for first in range(0, iterations, batch_size):
+        size = min(batch_size, iterations - first)
+        durations = rng.triangular(low[:, None], planned[:, None], high[:, None], size=(n, size))
+        start = np.repeat(earliest[:, None], size, axis=1)
+        finish = np.empty((n, size))
+        finish[roots] = start[roots] + durations[roots]
+
+        # Forward pass: a task starts at its planned start or when its last prerequisite finishes
+        for children, edge_parent, edge_child, offsets in groups:
+            ready = np.maximum.reduceat(finish[edge_parent], offsets, axis=0)
+            start[children] = np.maximum(start[children], ready)
+            finish[children] = start[children] + durations[children]
+
+        project_finish = finish.max(axis=0)
+        completion[first:first + size] = project_finish
+
+        # Backward pass: walk from the last-finishing task through the prerequisites that set each start
+        critical = finish >= project_finish[None, :] - 1e-9
+        for children, edge_parent, edge_child, offsets in reversed(groups):
+            binding = critical[edge_child] & (finish[edge_parent] >= start[edge_child] - 1e-9)
+            np.logical_or.at(critical, edge_parent, binding)
+        critical_counts += critical.sum(axis=1)
+
+    return {"completion": completion, "criticality": critical_counts / iterations}
+
+#Percentile completion dates and the tasks most often on the critical path
+def summarize_risk(schedule, result, percentiles=(50, 80, 95), top=10):
+    # A finish of x working days means the last day worked is index ceil(x) - 1
+    finish_days = np.ceil(np.percentile(result["completion"], percentiles)).astype(np.int64) - 1
+    dates = dict(zip(percentiles, schedule.to_date(finish_days)))
+    order = np.argsort(-result["criticality"])[:top]
+    critical = [(schedule.ids[i], float(result["criticality"][i])) for i in order if result["criticality"][i] > 0]
+    return {"dates": dates, "critical_tasks": critical}
+
+#Share of iterations finishing on or before the target date
+def probability_on_time(schedule, result, target_date):
+    target = schedule.to_index(target_date, "backward") + 1
+    return float(np.mean(result["completion"] <= target))
@@ -0,0 +1,212 @@
+import heapq
+import logging
+from datetime import date
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+#*********Incremental dependency-aware rescheduling over the working-day calendar...************
+
+def _as_list(deps):
+    if isinstance(deps, str):
+        return [d.strip() for d in deps.split(",") if d.strip()]
+    if isinstance(deps, (list, tuple, np.ndarray)):
+        return [str(d).strip() for d in deps if str(d).strip()]
+    return []
+
+def _to_day(values):
+    return pd.to_datetime(pd.Series(values)).values.astype("datetime64[D]")
+
+#Rows with both a Start and an End; undated tasks (e.g. a row just added in the editor) are left out of the schedule
+def dated_rows(df):
+    starts = pd.to_datetime(df["Start"], errors="coerce")
+    ends = pd.to_datetime(df["End"], errors="coerce")
+    return np.nonzero((starts.notna() & ends.notna()).to_numpy())[0]
+
+#Fingerprint of the task graph; the schedule must be rebuilt when it changes (including when a task gains or loses its dates)
+def graph_signature(df):
+    return hash((tuple(df["Task_ID"].astype(str)), tuple(map(str, df["Task_Dependency"])), tuple(dated_rows(df))))
+
+class Schedule:
+    # Dates are stored as working-day indices from `origin`; durations are inclusive working days.
+    # `rows` are the positions in df of the scheduled (dated) tasks, aligned with `ids`
+    def __init__(self, df, holidays=()):
+        self.calendar = np.busdaycalendar(holidays=np.array([str(h) for h in holidays], dtype="datetime64[D]"))
+        self.rows = dated_rows(df)
+        if len(self.rows) < len(df):
+            logger.info(f"{len(df) - len(self.rows)} task(s) without Start/End left out of the schedule")
+        df = df.iloc[self.rows]
+        self.ids = df["Task_ID"].astype(str).tolist()
+        self.index = {task_id: i for i, task_id in enumerate(self.ids)}
+        n = len(self.ids)
+
+        self.parents = [[] for _ in range(n)]
+        self.children = [[] for _ in range(n)]
+        for i, deps in enumerate(df["Task_Dependency"]):
+            for dep in _as_list(deps):
+                j = self.index.get(dep)
+                if j is not None and j != i and j not in self.parents[i]:
+                    self.parents[i].append(j)
+                    self.children[j].append(i)
+
+        starts = np.busday_offset(_to_day(df["Start"]), 0, roll="forward", busdaycal=self.calendar)
+        ends = np.busday_offset(_to_day(df["End"]), 0, roll="backward", busdaycal=self.calendar)
+        self.origin = starts.min() if n else np.datetime64(date.today(), "D")
+        self.start = np.busday_count(self.origin, starts, busdaycal=self.calendar).astype(np.int64)
+        self.end = np.maximum(np.busday_count(self.origin, ends, busdaycal=self.calendar), self.start)
+        self.duration = self.end - self.start + 1
+
+        self.order = self._topological_order()
+        self.position = np.empty(n, dtype=np.int64)
+        self.position[self.order] = np.arange(n)
+        # tail[i]: working days of the longest chain of successors after task i (independent of dates)
+        self.tail = np.zeros(n, dtype=np.int64)
+        for i in reversed(self.order):
+            if self.children[i]:
+                self.tail[i] = max(self.tail[c] + self.duration[c] for c in self.children[i])
+
+    #Kahn's algorithm; edges inside a cycle are dropped so the rest of the plan still schedules
+    def _topological_order(self):
+        indegree = np.array([len(p) for p in self.parents], dtype=np.int64)
+        ready = [i for i in range(len(self.ids)) if indegree[i] == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            for c in self.children[i]:
+                indegree[c] -= 1
+                if indegree[c] == 0:
+                    ready.append(c)
+        if len(order) < len(self.ids):
+            placed = set(order)
+            for i in range(len(self.ids)):
+                if i not in placed:
+                    logger.warning(f"Task {self.ids[i]} is part of a dependency cycle; ignoring its cyclic dependencies")
+                    for p in [p for p in self.parents[i] if p not in placed]:
+                        self.parents[i].remove(p)
+                        self.children[p].remove(i)
+                    order.append(i)
+                    placed.add(i)
+        return order
+
+    def to_date(self, index):
+        return np.busday_offset(self.origin, index, roll="forward", busdaycal=self.calendar).astype(object)
+
+    def to_index(self, day, roll="forward"):
+        day = np.busday_offset(np.datetime64(pd.to_datetime(day).date(), "D"), 0, roll=roll, busdaycal=self.calendar)
+        return int(np.busday_count(self.origin, day, busdaycal=self.calendar))
+
+    #Shift every downstream task that now starts before its prerequisites end (only later, never earlier)
+    def _propagate(self, source):
+        changed = set()
+        heap = [(self.position[c], c) for c in self.children[source]]
+        heapq.heapify(heap)
+        queued = {c for _, c in heap}
+        while heap:
+            _, i = heapq.heappop(heap)
+            earliest = max(self.end[p] for p in self.parents[i]) + 1
+            if earliest <= self.start[i]:
+                continue
+            self.start[i] = earliest
+            self.end[i] = earliest + self.duration[i] - 1
+            changed.add(i)
+            for c in self.children[i]:
+                if c not in queued:
+                    queued.add(c)
+                    heapq.heappush(heap, (self.position[c], c))
+        return changed
+
+    #A duration change only affects the tails of the task's ancestors
+    def _update_tails(self, source):
+        heap = [(-self.position[p], p) for p in self.parents[source]]
+        heapq.heapify(heap)
+        queued = {p for _, p in heap}
+        while heap:
+            _, i = heapq.heappop(heap)
+            queued.discard(i)
+            tail = max(self.tail[c] + self.duration[c] for c in self.children[i])
+            if tail == self.tail[i]:
+                continue
+            self.tail[i] = tail
+            for p in self.parents[i]:
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-self.position[p], p))
+
+    #Apply new Start/End dates of one task; returns the Task_IDs whose dates changed
+    def update_task(self, task_id, start=None, end=None):
+        i = self.index[task_id]
+        if start is not None:
+            self.start[i] = self.to_index(start, "forward")
+        if end is not None:
+            self.end[i] = self.to_index(end, "backward")
+        self.end[i] = max(self.end[i], self.start[i])
+        duration = self.end[i] - self.start[i] + 1
+        if duration != self.duration[i]:
+            self.duration[i] = duration
+            self._update_tails(i)
+        return {task_id} | {self.ids[c] for c in self._propagate(i)}
+
+    #A blocked task cannot resume before today; it keeps its duration
+    def block_task(self, task_id, today=None):
+        i = self.index[task_id]
+        resume = self.to_index(today or date.today(), "forward")
+        if resume <= self.start[i]:
+            return set()
+        self.start[i] = resume
+        self.end[i] = resume + self.duration[i] - 1
+        return {task_id} | {self.ids[c] for c in self._propagate(i)}
+
+    #Total float in working days against the current project finish
+    def slack(self):
+        if not len(self.ids):
+            return np.zeros(0, dtype=np.int64)
+        return self.end.max() - self.tail - self.end
+
+    def critical_path(self):
+        critical = np.nonzero(self.slack() == 0)[0]
+        return [self.ids[i] for i in sorted(critical, key=lambda i: self.position[i])]
+
+    def dates(self, task_ids):
+        rows = [self.index[t] for t in task_ids]
+        starts = self.to_date(self.start[rows])
+        ends = self.to_date(self.end[rows])
+        return {t: (s, e) for t, s, e in zip(task_ids, starts, ends)}
+
+#Holidays are the weekdays in the planned range that are not net working days
+def holidays_from_working_days(net_working_days):
+    if not net_working_days:
+        return []
+    net = set(pd.to_datetime(pd.Series(net_working_days)).dt.date)
+    weekdays = pd.bdate_range(min(net), max(net)).date
+    return [d for d in weekdays if d not in net]
+
+#Start/End/Progress edits between two versions of the same task table, as (Task_ID, field, new value)
+def find_schedule_edits(before, after):
+    if len(before) != len(after) or list(before["Task_ID"].astype(str)) != list(after["Task_ID"].astype(str)):
+        return None
+    edits = []
+    for field in ["Start", "End", "Progress"]:
+        if field not in before.columns or field not in after.columns:
+            continue
+        old = before[field].astype(str).to_numpy()
+        new = after[field].astype(str).to_numpy()
+        for row in np.nonzero(old != new)[0]:
+            edits.append((str(after["Task_ID"].iloc[row]), field, after[field].iloc[row]))
+    return edits
+
+#Apply editor edits to the schedule; returns {Task_ID: (start, end)} for every task that moved
+def apply_schedule_edits(schedule, edits, today=None):
+    moved = set()
+    for task_id, field, value in edits:
+        if task_id not in schedule.index:
+            continue
+        if field == "Start":
+            moved |= schedule.update_task(task_id, start=value)
+        elif field == "End":
+            moved |= schedule.update_task(task_id, end=value)
+        elif field == "Progress" and str(value).strip().upper() == "BLOCKED":
+            moved |= schedule.block_task(task_id, today)
+    return schedule.dates(sorted(moved, key=schedule.index.get))
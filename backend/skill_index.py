@@ -0,0 +1,148 @@
+import re
+import logging
+from backend.resource_utils import ROLES, AVAILABILITY
+
+logger = logging.getLogger(__name__)
+
+
+#*********Inverted index over resource skills, roles & availability (bitset per token)...************
+
+_OPERATORS = {"and", "or", "not"}
+
+def normalize_skill(skill):
+    return re.sub(r"\s+", " ", str(skill).strip().lower())
+
+def _profile_tokens(profile):
+    tokens = {f"skill:{normalize_skill(s)}" for s in profile.get("skills", []) if normalize_skill(s)}
+    tokens.add(f"role:{normalize_skill(profile.get('role', ''))}")
+    tokens.add(f"status:{normalize_skill(profile.get('availability', ''))}")
+    return tokens
+
+#Parse "Unity AND NOT animation, Available": commas and AND intersect, OR unions, NOT excludes the term it precedes
+def parse_query(query):
+    clauses = []
+    for part in re.split(r"[,&]", query or ""):
+        # Operands alternate with the AND/OR between them
+        pieces = re.split(r"\s+(AND|OR)\s+", part.strip(), flags=re.IGNORECASE)
+        group, pending_or = [], False
+        for i, piece in enumerate(pieces):
+            if i % 2:
+                pending_or = piece.lower() == "or"
+                continue
+            words = piece.split()
+            negate = False
+            while words and words[0].lower() == "not":
+                negate, words = not negate, words[1:]
+            words = [w for w in words if w.lower() not in _OPERATORS]
+            if words:
+                term = (normalize_skill(" ".join(words)), negate)
+                if pending_or and group:
+                    group[-1].append(term)
+                else:
+                    group.append([term])
+            pending_or = False
+        clauses.extend(group)
+    return clauses  # AND of OR-groups of (term, negated)
+
+class SkillIndex:
+    def __init__(self, profiles=()):
+        self._postings = {}   # token -> bitset (int) of slots
+        self._slots = {}      # name -> slot
+        self._profiles = []   # slot -> profile or None
+        self._free = []
+        self._all = 0
+        self.sync(profiles)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _add(self, profile):
+        slot = self._free.pop() if self._free else len(self._profiles)
+        if slot == len(self._profiles):
+            self._profiles.append(None)
+        bit = 1 << slot
+        for token in _profile_tokens(profile):
+            self._postings[token] = self._postings.get(token, 0) | bit
+        self._profiles[slot] = dict(profile)
+        self._slots[profile["name"]] = slot
+        self._all |= bit
+
+    def _remove(self, name):
+        slot = self._slots.pop(name)
+        mask = ~(1 << slot)
+        for token in _profile_tokens(self._profiles[slot]):
+            bits = self._postings.get(token, 0) & mask
+            if bits:
+                self._postings[token] = bits
+            else:
+                self._postings.pop(token, None)
+        self._profiles[slot] = None
+        self._all &= mask
+        self._free.append(slot)
+
+    #Bring the index in line with the profiles, re-indexing only those that changed; returns how many did
+    def sync(self, profiles):
+        profiles = {p["name"]: p for p in profiles if p.get("name")}
+        changed = 0
+        for name in [n for n in self._slots if n not in profiles]:
+            self._remove(name)
+            changed += 1
+        for name, profile in profiles.items():
+            slot = self._slots.get(name)
+            if slot is not None and self._profiles[slot] == profile:
+                continue
+            if slot is not None:
+                self._remove(name)
+            self._add(profile)
+            changed += 1
+        if changed:
+            logger.debug(f"Skill index: {changed} profile(s) re-indexed, {len(self)} indexed")
+        return changed
+
+    #Bitset of a single term: a status or role when it names one, else skills equal to or starting with it
+    def _term_bits(self, term):
+        if term.title() in AVAILABILITY:
+            return self._postings.get(f"status:{term}", 0)
+        if term.title() in ROLES:
+            return self._postings.get(f"role:{term}", 0) | self._postings.get(f"skill:{term}", 0)
+        bits = self._postings.get(f"skill:{term}", 0)
+        for token, posting in self._postings.items():
+            if token.startswith(f"skill:{term}"):
+                bits |= posting
+        return bits
+
+    def _names(self, bits):
+        names = []
+        while bits:
+            low = bits & -bits
+            names.append(self._profiles[low.bit_length() - 1]["name"])
+            bits ^= low
+        return names
+
+    #Names matching the boolean query; an empty query matches everyone
+    def match(self, query):
+        bits = self._all
+        for group in parse_query(query):
+            group_bits = 0
+            for term, negated in group:
+                term_bits = self._term_bits(term)
+                group_bits |= (self._all & ~term_bits) if negated else term_bits
+            bits &= group_bits
+        return self._names(bits)
+
+    #(name, score) for every resource matching at least one positive term, best first; score is the share of terms matched
+    def rank(self, query):
+        clauses = parse_query(query)
+        terms = [term for group in clauses for term, negated in group if not negated]
+        if not terms:
+            return [(name, 1.0) for name in sorted(self.match(query))]
+        excluded = 0
+        for group in clauses:
+            for term, negated in group:
+                if negated:
+                    excluded |= self._term_bits(term)
+        scores = {}
+        for term in terms:
+            for name in self._names(self._term_bits(term) & ~excluded):
+                scores[name] = scores.get(name, 0) + 1
+        return sorted(((name, count / len(terms)) for name, count in scores.items()), key=lambda item: (-item[1], item[0]))
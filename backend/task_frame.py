@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+#*********Typed task frame kept in session state...************
+
+# Session state holds tasks in this compact form: low-cardinality text columns are categoricals,
+# Start/End are datetime64 and dependencies are Arrow list<int32> codes into the Task_ID categories,
+# so row slices and reorders keep their dependencies.
+# Pages convert it once at load and build display frames from it instead of re-parsing.
+PROGRESS_STATES = ["PENDING", "IN PROGRESS", "COMPLETED", "BLOCKED"]
+CATEGORY_COLUMNS = ["Sprint", "Module", "Resource", "Progress", "Domain", "Estimated Time"]
+DATE_COLUMNS = ["Start", "End"]
+DEPENDENCY_CODES = "Dependency_Codes"
+
+def _as_list(deps):
+    if isinstance(deps, str):
+        return [d.strip() for d in deps.split(",") if d.strip()]
+    if isinstance(deps, (list, tuple, np.ndarray)):
+        return [str(d).strip() for d in deps if str(d).strip()]
+    return []
+
+#Categorical of the given text values; `extra` categories are always present
+def as_category(values, extra=()):
+    values = pd.Series(values).fillna("").astype(str)
+    return pd.Categorical(values, categories=list(dict.fromkeys(list(extra) + sorted(values.unique()))))
+
+def is_task_frame(df):
+    return DEPENDENCY_CODES in df.columns
+
+#Convert a loaded/generated/edited task table to the typed frame (a no-op if it already is one)
+def to_task_frame(df):
+    if is_task_frame(df):
+        return df
+    frame = df.copy()
+    if "Resource" not in frame.columns:
+        frame["Resource"] = ""
+    if "Progress" not in frame.columns:
+        frame["Progress"] = "PENDING"
+    if "Module" not in frame.columns:
+        frame["Module"] = ""
+    if "Task_Dependency" not in frame.columns:
+        frame["Task_Dependency"] = [[] for _ in range(len(frame))]
+
+    for col in DATE_COLUMNS:
+        if col in frame.columns:
+            frame[col] = pd.to_datetime(frame[col], errors="coerce").dt.normalize()
+
+    deps = [_as_list(d) for d in frame["Task_Dependency"]]
+    if "Task_ID" in frame.columns:
+        ids = frame["Task_ID"].fillna("").astype(str).str.strip()
+    else:
+        ids = pd.Series([""] * len(frame), index=frame.index)
+    # Dependencies on unknown Task_IDs are kept as extra categories so nothing is lost on save
+    categories = list(dict.fromkeys(list(ids) + [d for ds in deps for d in ds]))
+    code_of = {task_id: code for code, task_id in enumerate(categories)}
+    frame["Task_ID"] = pd.Categorical(ids, categories=categories)
+    codes = pa.array([[code_of[d] for d in ds] for ds in deps], type=pa.list_(pa.int32()))
+    position = frame.columns.get_loc("Task_Dependency")
+    frame = frame.drop(columns=["Task_Dependency"])
+    frame.insert(position, DEPENDENCY_CODES, pd.arrays.ArrowExtensionArray(codes))
+
+    for col in CATEGORY_COLUMNS:
+        if col in frame.columns:
+            extra = PROGRESS_STATES if col == "Progress" else [""] if col == "Resource" else []
+            frame[col] = as_category(frame[col].values, extra)
+    return frame
+
+#Dependencies of every row as lists of Task_IDs
+def dependency_lists(frame):
+    ids = np.asarray(frame["Task_ID"].cat.categories, dtype=object)
+    # pa.array goes through the public __arrow_array__ protocol; it may hand back a chunked array
+    codes = pa.array(frame[DEPENDENCY_CODES].array)
+    if isinstance(codes, pa.ChunkedArray):
+        codes = codes.combine_chunks()
+    if not len(codes):
+        return []
+    names = ids[codes.flatten().to_numpy()].tolist()
+    offsets = (codes.offsets.to_numpy() - codes.offsets[0].as_py()).tolist()
+    return [names[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+#Plain frame for editors, charts and the scheduler: text columns as str, dependencies comma-joined
+def display_frame(frame):
+    view = frame.drop(columns=[DEPENDENCY_CODES])
+    view.insert(frame.columns.get_loc(DEPENDENCY_CODES), "Task_Dependency", [", ".join(d) for d in dependency_lists(frame)])
+    view["Task_ID"] = view["Task_ID"].astype(str)
+    for col in CATEGORY_COLUMNS:
+        if col in view.columns and col != "Progress":
+            view[col] = view[col].astype(str)
+    return view
+
+#Records ready for MongoDB: dependencies as Task_ID lists, missing dates as None
+def task_records(df):
+    if not is_task_frame(df):
+        return df.to_dict("records")
+    frame = df.drop(columns=[DEPENDENCY_CODES]).astype({col: object for col in CATEGORY_COLUMNS + ["Task_ID"] if col in df.columns})
+    for col in DATE_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].astype(object).where(frame[col].notna(), None)
+    records = frame.to_dict("records")
+    for record, deps in zip(records, dependency_lists(df)):
+        record["Task_Dependency"] = deps
+    return records
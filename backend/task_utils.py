@@ -0,0 +1,92 @@
+import pandas as pd
+from backend.task_frame import to_task_frame, display_frame
+
+
+#*********Functions for preparing task tables for the editors & charts...************
+
+#Editable view of a task table: typed frame rendered for the task editor & charts
+def prepare_tasks_df(df):
+    df = display_frame(to_task_frame(df))
+
+    # Add Y index for Gantt chart
+    df["Y_Index"] = list(range(len(df)))
+    return df
+
+#prepare_tasks_df of the session's tasks_df, built once per tasks_df (pages replace tasks_df on every change)
+def session_tasks_view(state):
+    cached = state.get("tasks_view")
+    if cached is None or cached[0] is not state["tasks_df"]:
+        cached = (state["tasks_df"], prepare_tasks_df(state["tasks_df"]))
+        state["tasks_view"] = cached
+    # Shallow copy: pages may add columns without touching the cached view
+    return cached[1].copy(deep=False)
+
+
+#*********Scoped editing: edit one sprint/module/page, merge the delta back by Task_ID...************
+
+EDIT_SCOPES = ["All tasks", "Sprint", "Module", "Page"]
+# Rows per page in the "Page" scope; projects larger than this open scoped by sprint
+EDIT_PAGE_SIZE = 200
+
+#Values to pick from for a scope (sprint/module names or page numbers)
+def scope_options(df, kind):
+    if kind in ("Sprint", "Module") and kind in df.columns:
+        return sorted(df[kind].astype(str).unique())
+    if kind == "Page":
+        return list(range(1, max(1, -(-len(df) // EDIT_PAGE_SIZE)) + 1))
+    return []
+
+#Rows of the editable view that belong to the scope
+def scope_rows(df, kind, value):
+    if kind in ("Sprint", "Module") and kind in df.columns:
+        return df[df[kind].astype(str) == str(value)]
+    if kind == "Page":
+        start = (int(value) - 1) * EDIT_PAGE_SIZE
+        return df.iloc[start:start + EDIT_PAGE_SIZE]
+    return df
+
+#Fold an edited scope into the full view; returns (merged, changed_ids, deleted_ids).
+# Rows are matched by index label (the editor keeps the scope's labels and gives added rows new ones),
+# so repeated or blank Task_IDs in imported plans still merge row by row
+def merge_scope_edits(full, scope, edited, ignore=("Y_Index",)):
+    edited = edited.copy()
+    edited["Task_ID"] = edited["Task_ID"].fillna("").astype(str).str.strip()
+    is_kept = edited.index.isin(scope.index)
+
+    # New rows without an id get the next free T<n>
+    taken = set(full["Task_ID"].astype(str)) | set(edited["Task_ID"])
+    numbers = [int(i[1:]) for i in taken if i[:1] == "T" and i[1:].isdigit()]
+    next_id = max(numbers + [0]) + 1
+    for row in edited.index[~is_kept & (edited["Task_ID"] == "")]:
+        edited.at[row, "Task_ID"] = f"T{next_id}"
+        next_id += 1
+
+    kept = edited[is_kept]
+    added = edited[~is_kept]
+    removed = scope.index.difference(kept.index)
+
+    # Only cells that differ are written back
+    columns = [c for c in edited.columns if c in full.columns and c not in ignore]
+    before = full.loc[kept.index, columns]
+    after = kept[columns].copy()
+    for column in columns:
+        # Added rows turn the editor's date columns into objects; compare them as dates again
+        if pd.api.types.is_datetime64_any_dtype(before[column]):
+            after[column] = pd.to_datetime(after[column], errors="coerce").astype(before[column].dtype)
+    differs = before.astype(str).values != after.astype(str).values
+    changed_rows = differs.any(axis=1)
+    merged = full.copy()
+    if changed_rows.any():
+        for j, column in enumerate(columns):
+            rows = differs[:, j]
+            if rows.any():
+                merged.loc[before.index[rows], column] = after[column].values[rows]
+    changed_ids = set(kept["Task_ID"].values[changed_rows]) | set(added["Task_ID"])
+
+    merged = merged.drop(removed)
+    if not added.empty:
+        merged = pd.concat([merged, added.reindex(columns=merged.columns)], ignore_index=True)
+    # Deleted (or renamed) ids that no longer name any task
+    gone = set(full.loc[removed, "Task_ID"].astype(str)) | set(before["Task_ID"].astype(str).values[changed_rows])
+    deleted_ids = sorted(gone - set(merged["Task_ID"].astype(str)))
+    return merged.reset_index(drop=True), changed_ids, deleted_ids
@@ -0,0 +1,121 @@
+import json
+import math
+import time
+import logging
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pymongo import monitoring
+
+
+#*********Lightweight stage timing (spans) with structured JSON logs...************
+
+logger = logging.getLogger("tracing")
+
+MAX_RECORDS = 5000
+
+# Process-wide ring buffer of finished spans
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+
+# Records list of the Streamlit session currently running (see bind_session)
+_session_records = ContextVar("trace_session_records", default=None)
+
+#Attach a list (usually kept in st.session_state) that receives every span of this run
+def bind_session(records):
+    _session_records.set(records)
+
+#Collect the spans of the enclosed block in a new list, e.g. a background job's, to hand back with its result
+@contextmanager
+def collect_spans():
+    records = []
+    token = _session_records.set(records)
+    try:
+        yield records
+    finally:
+        _session_records.reset(token)
+
+def record_span(name, duration_ms, status="ok", **fields):
+    entry = {"span": name, "ms": round(duration_ms, 3), "status": status, "ts": time.time(), **fields}
+    with _lock:
+        _records.append(entry)
+    session = _session_records.get()
+    if session is not None:
+        session.append(entry)
+        if len(session) > MAX_RECORDS:
+            del session[:len(session) - MAX_RECORDS]
+    logger.info(json.dumps(entry, default=str))
+    return entry
+
+#Time the enclosed block:  with span("groq.generate_tasks"): ...
+@contextmanager
+def span(name, **fields):
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield fields
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        record_span(name, (time.perf_counter() - started) * 1000, status, **fields)
+
+#Decorator form of span; defaults to the function's qualified name
+def traced(name=None):
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+#Pass to MongoClient(event_listeners=[...]) so every command becomes a span
+class MongoTraceListener(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record_span(f"mongo.{event.command_name}", event.duration_micros / 1000, database=event.database_name)
+
+    def failed(self, event):
+        record_span(f"mongo.{event.command_name}", event.duration_micros / 1000, "error", database=event.database_name)
+
+mongo_listener = MongoTraceListener()
+
+
+#*********Aggregation for the performance panel...************
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+#Per-stage call count, total/mean/p50/p95/last latency (ms); defaults to the process-wide buffer
+def stage_stats(records=None):
+    if records is None:
+        with _lock:
+            records = list(_records)
+    by_stage = {}
+    for entry in records:
+        by_stage.setdefault(entry["span"], []).append(entry)
+    stats = []
+    for stage, entries in by_stage.items():
+        durations = sorted(e["ms"] for e in entries)
+        stats.append({
+            "Stage": stage,
+            "Calls": len(entries),
+            "Errors": sum(e["status"] == "error" for e in entries),
+            "Total (s)": round(sum(durations) / 1000, 3),
+            "Mean (ms)": round(sum(durations) / len(durations), 1),
+            "p50 (ms)": round(_percentile(durations, 50), 1),
+            "p95 (ms)": round(_percentile(durations, 95), 1),
+            "Last (ms)": round(entries[-1]["ms"], 1),
+        })
+    return sorted(stats, key=lambda s: s["Total (s)"], reverse=True)
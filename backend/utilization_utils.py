@@ -0,0 +1,64 @@
+import logging
+import numpy as np
+import pandas as pd
+from backend.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********Portfolio utilization: resource x working-day matrix over all projects...************
+
+PORTFOLIO_FIELDS = {"_id": 0, "Task_ID": 1, "Task": 1, "Resource": 1, "Start": 1, "End": 1, "Sprint": 1, "Module": 1}
+
+#Assigned tasks of the given projects (all by default), reading only the fields the matrix needs
+@traced("utilization.load")
+def load_portfolio_tasks(db, projects=None):
+    from backend.db_utils import list_projects
+    frames = []
+    for project in projects if projects is not None else list_projects(db):
+        docs = list(db[project].find({"Resource": {"$nin": ["", None]}}, PORTFOLIO_FIELDS))
+        if docs:
+            frame = pd.DataFrame(docs)
+            frame["Project"] = project
+            frames.append(frame)
+    columns = [c for c in PORTFOLIO_FIELDS if c != "_id"] + ["Project"]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(frames, ignore_index=True).reindex(columns=columns)
+    df["Start"] = pd.to_datetime(df["Start"], errors="coerce")
+    df["End"] = pd.to_datetime(df["End"], errors="coerce")
+    df["Sprint"] = df["Sprint"].fillna("").astype(str)
+    return df
+
+#Working days from start to end inclusive
+def working_days(start, end):
+    start = np.datetime64(pd.Timestamp(start).date(), "D")
+    end = np.datetime64(pd.Timestamp(end).date(), "D") + 1
+    return np.busday_offset(start, np.arange(np.busday_count(start, end)), roll="forward")
+
+#Concurrent tasks per row and working day: each task adds +1/-1 at its first/after-last working day, then a cumulative sum
+@traced("utilization.matrix")
+def utilization_matrix(df, start, end, by="Resource"):
+    days = working_days(start, end)
+    if df.empty or len(days) == 0:
+        return pd.DataFrame(index=pd.Index([], name=by), columns=pd.DatetimeIndex(days))
+    starts = df["Start"].values.astype("datetime64[D]")
+    ends = df["End"].values.astype("datetime64[D]")
+    valid = ~np.isnat(starts) & ~np.isnat(ends) & (ends >= starts)
+    codes, labels = pd.factorize(df[by].fillna("").astype(str).to_numpy()[valid], sort=True)
+    # Working-day positions on the calendar; busday_count rolls weekend starts forward and ends back
+    first = np.clip(np.busday_count(days[0], starts[valid]), 0, len(days))
+    after_last = np.clip(np.busday_count(days[0], ends[valid] + 1), 0, len(days))
+    keep = after_last > first
+    diff = np.zeros((len(labels), len(days) + 1), dtype=np.int32)
+    np.add.at(diff, (codes[keep], first[keep]), 1)
+    np.add.at(diff, (codes[keep], after_last[keep]), -1)
+    matrix = np.cumsum(diff[:, :-1], axis=1)
+    return pd.DataFrame(matrix, index=pd.Index(labels, name=by), columns=pd.DatetimeIndex(days))
+
+#Sum a day matrix into ISO-week buckets (busy task-days per week) for long horizons
+def weekly_buckets(matrix):
+    if matrix.empty:
+        return matrix
+    weeks = matrix.columns - pd.to_timedelta(matrix.columns.weekday, unit="D")
+    return matrix.T.groupby(weeks).sum().T
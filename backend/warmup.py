@@ -0,0 +1,62 @@
+import time
+import logging
+import threading
+from backend.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+#*********Background warm-up of the embedding model & domain classifiers...************
+
+# Measured from the first import in this server process (serve.py imports it at launch)
+_first_run = time.perf_counter()
+_status = {"state": "idle", "steps": [], "ready_s": None}
+_status_lock = threading.Lock()
+_started = False
+
+def _load_embeddings():
+    from backend.classification_embeddings import get_embeddings
+    get_embeddings().embed_query("warm up")
+
+def _load_model(model_path):
+    from backend.home_utils import load_domain_model
+    load_domain_model(model_path)
+
+def _steps():
+    from backend.home_utils import model_path_for_domain
+    paths = dict.fromkeys(model_path_for_domain(d) for d in ["Game Development", "Web Development", "Custom"])
+    return [("Embedding model", _load_embeddings)] + [(path, lambda path=path: _load_model(path)) for path in paths]
+
+def _run():
+    steps = _steps()
+    with _status_lock:
+        _status["state"] = "warming"
+        _status["total"] = len(steps)
+    for name, load in steps:
+        started = time.perf_counter()
+        error = None
+        try:
+            with span("warmup.load", step=name):
+                load()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Warm-up of {name} failed: {error}")
+        with _status_lock:
+            _status["steps"].append({"step": name, "seconds": time.perf_counter() - started, "error": error})
+    with _status_lock:
+        _status["state"] = "ready" if not any(s["error"] for s in _status["steps"]) else "degraded"
+        _status["ready_s"] = time.perf_counter() - _first_run
+    logger.info(f"Warm-up finished in {_status['ready_s']:.1f}s: {_status['steps']}")
+
+#Start loading the models in the background, once per process
+def start_warmup():
+    global _started
+    with _status_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_run, name="model-warmup", daemon=True).start()
+
+def warmup_status():
+    with _status_lock:
+        return {**_status, "steps": list(_status["steps"])}
@@ -0,0 +1,75 @@
+import logging
+import numpy as np
+import pandas as pd
+from backend.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+#*********Per-resource, per-ISO-week workload kept next to the project collections...************
+
+WORKLOAD_COLLECTION = "workload_summary"
+# Busy days above this in one week (across projects) count as overbooked
+WEEKLY_CAPACITY_DAYS = 5
+
+#Summary rows of one project: tasks and distinct busy working days per resource and ISO week
+def workload_rows(project_name, df):
+    if df.empty or not {"Resource", "Start", "End"} <= set(df.columns):
+        return []
+    resources = df["Resource"].fillna("").astype(str).str.strip().to_numpy()
+    starts = pd.to_datetime(df["Start"], errors="coerce").values.astype("datetime64[D]")
+    ends = pd.to_datetime(df["End"], errors="coerce").values.astype("datetime64[D]")
+    keep = (resources != "") & ~np.isnat(starts) & ~np.isnat(ends) & (ends >= starts)
+    if not keep.any():
+        return []
+    resources, starts, ends = resources[keep], starts[keep], ends[keep]
+
+    # One entry per task per calendar day, then weekends dropped
+    lengths = (ends - starts).astype(np.int64) + 1
+    task = np.repeat(np.arange(len(starts)), lengths)
+    offset = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    days = starts[task] + offset
+    working = np.is_busday(days)
+    days = pd.DatetimeIndex(days[working])
+    frame = pd.DataFrame({"resource": resources[task[working]], "task": task[working], "day": days})
+    iso = days.isocalendar()
+    frame["week"] = iso["year"].astype(str).values + "-W" + iso["week"].astype(str).str.zfill(2).values
+    frame["week_start"] = days - pd.to_timedelta(days.weekday, unit="D")
+
+    summary = frame.groupby(["resource", "week", "week_start"]).agg(tasks=("task", "nunique"), busy_days=("day", "nunique")).reset_index()
+    return [
+        {"project": project_name, "resource": r.resource, "week": r.week, "week_start": r.week_start.to_pydatetime(),
+         "tasks": int(r.tasks), "busy_days": int(r.busy_days)}
+        for r in summary.itertuples()
+    ]
+
+#Replace one project's rows; called from every task save so the summary never needs a full scan
+@traced("workload.update_project")
+def update_project_workload(db, project_name, df):
+    collection = db[WORKLOAD_COLLECTION]
+    rows = workload_rows(project_name, df)
+    collection.delete_many({"project": project_name})
+    if rows:
+        collection.insert_many(rows)
+    return len(rows)
+
+#Recompute the summary from every project (for databases saved before it existed)
+def rebuild_workload(db):
+    from backend.db_utils import list_projects, load_project_tasks
+    db[WORKLOAD_COLLECTION].delete_many({})
+    return sum(update_project_workload(db, name, load_project_tasks(db, name)) for name in list_projects(db))
+
+#Workload across projects per resource and week, optionally from a given week on
+@traced("workload.load")
+def load_workload(db, since=None):
+    query = {"week_start": {"$gte": pd.Timestamp(since).to_pydatetime()}} if since is not None else {}
+    rows = list(db[WORKLOAD_COLLECTION].find(query, {"_id": 0}))
+    if not rows:
+        return pd.DataFrame(columns=["Resource", "Week", "Week Start", "Tasks", "Busy Days", "Projects", "Overbooked"])
+    df = pd.DataFrame(rows)
+    summary = df.groupby(["resource", "week", "week_start"]).agg(
+        tasks=("tasks", "sum"), busy_days=("busy_days", "sum"), projects=("project", lambda p: ", ".join(sorted(set(p))))
+    ).reset_index()
+    summary.columns = ["Resource", "Week", "Week Start", "Tasks", "Busy Days", "Projects"]
+    summary["Overbooked"] = summary["Busy Days"] > WEEKLY_CAPACITY_DAYS
+    return summary.sort_values(["Week Start", "Resource"]).reset_index(drop=True)
@@ -0,0 +1,146 @@
+"""Compare embedding backends (fp32 / int8) and torch thread settings on speed and classification quality.
+
+Run from the repository root:
+
+    python -m benchmarks.embedding_backends --backends fp32 int8 --threads 0 1 --output embeddings.json
+    python -m benchmarks.embedding_backends --labeled tasks.csv
+
+Every backend x thread setting runs in its own process (torch's thread count is
+process-wide), in the order given; the first one is the baseline. Each measures
+model load time, single-query latency (the classify_module path) and batch
+throughput (the dedup/index path) on synthetic task names. Each saved domain
+model in models/ then classifies the same texts, and predictions are compared
+with the baseline's. With --labeled (a training CSV: task text, module) the
+models' accuracy is reported as well.
+"""
+import argparse
+import json
+import logging
+import platform
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import joblib
+import numpy as np
+
+from backend.classification_embeddings import mean_cosine
+from benchmarks.synthetic import generate_project
+
+logger = logging.getLogger(__name__)
+
+DOMAIN_MODELS = ["models/game_dev.pkl", "models/web_dev.pkl", "models/modelsvm.pkl"]
+
+
+def _percentile(values, pct):
+    return float(np.percentile(values, pct)) * 1000
+
+#Runs in a fresh process, so the model (and torch's process-wide thread count) is loaded with these settings only
+def measure_backend(backend, threads, texts, queries):
+    from backend import classification_embeddings
+    from backend.classification_embeddings import get_embeddings, embedding_info
+    classification_embeddings.EMBEDDING_BACKEND = backend
+    classification_embeddings.EMBEDDING_THREADS = threads
+    started = time.perf_counter()
+    embeddings = get_embeddings()
+    load_seconds = time.perf_counter() - started
+
+    embeddings.embed_query(queries[0])  # warm-up
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        embeddings.embed_query(query)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+    batch_seconds = time.perf_counter() - started
+    return vectors, {
+        "backend": backend,
+        # int8 falls back to fp32 when its probe embeddings drift
+        "loaded_backend": embedding_info()["backend"],
+        "probe_cosine": embedding_info()["probe_cosine"],
+        "threads": threads,
+        "load_s": load_seconds,
+        "query_p50_ms": _percentile(latencies, 50),
+        "query_p95_ms": _percentile(latencies, 95),
+        "texts_per_s": len(texts) / batch_seconds,
+    }
+
+def load_models():
+    models = {}
+    for path in DOMAIN_MODELS:
+        try:
+            models[path] = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Skipping {path}: {str(e)}")
+    return models
+
+def compare_models(models, vectors, baseline, labels=None):
+    quality = {}
+    quality["cosine_to_baseline"] = mean_cosine(vectors, baseline)
+    for path, model in models.items():
+        predicted = model.predict(vectors)
+        entry = {"agreement_with_baseline": float(np.mean(predicted == model.predict(baseline)))}
+        if labels is not None:
+            entry["accuracy"] = float(np.mean(predicted == labels))
+        quality[path] = entry
+    return quality
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends and thread settings.")
+    parser.add_argument("--backends", nargs="+", default=["fp32", "int8"], choices=["fp32", "int8"], help="The first is the baseline")
+    parser.add_argument("--threads", type=int, nargs="+", default=[0], help="Torch threads (0 = default)")
+    parser.add_argument("--texts", type=int, default=2000, help="Synthetic task names for the batch run")
+    parser.add_argument("--queries", type=int, default=200, help="Single-query latency samples")
+    parser.add_argument("--labeled", help="CSV of task text, module used to measure accuracy")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    labels = None
+    if args.labeled:
+        from backend.ml_utils import read_data
+        data = read_data(args.labeled)
+        texts, labels = data[0].astype(str).tolist(), data[1].astype(str).to_numpy()
+    else:
+        texts = generate_project(args.texts, seed=0)["Task"].tolist()
+    queries = texts[:args.queries]
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "texts": len(texts),
+        "results": [],
+    }
+    models = load_models()
+    baseline = None
+    context = multiprocessing.get_context("spawn")
+    for backend in args.backends:
+        for threads in args.threads:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                vectors, result = pool.submit(measure_backend, backend, threads, texts, queries).result()
+            if baseline is None:
+                baseline = vectors
+            result.update(compare_models(models, vectors, baseline, labels))
+            report["results"].append(result)
+            fallback = "" if result["loaded_backend"] == backend else f" (fell back to {result['loaded_backend']})"
+            print(f"{backend}{fallback} {threads or 'default':>8} threads  load {result['load_s']:.1f}s  "
+                  f"query p50 {result['query_p50_ms']:.1f}ms p95 {result['query_p95_ms']:.1f}ms  "
+                  f"{result['texts_per_s']:.0f} texts/s  cosine {result['cosine_to_baseline']:.4f}")
+            for path in DOMAIN_MODELS:
+                if path in result:
+                    accuracy = f"  accuracy {100 * result[path]['accuracy']:.1f}%" if "accuracy" in result[path] else ""
+                    print(f"    {path:<24} agreement {100 * result[path]['agreement_with_baseline']:.1f}%{accuracy}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main()
@@ -0,0 +1,244 @@
+"""Standalone benchmark runner for the planner's hot stages.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --sizes 10 1000 50000 --output bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json
+
+Every stage is timed on synthetic projects from `benchmarks/synthetic.py` and the
+results are written as JSON so runs from different versions can be compared.
+The Mongo stages run against `mongomock` (pip install mongomock) instead of a live cluster.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic import generate_project
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10, 1000, 50000]
+
+# Stages that are too slow to run on every size by default (tasks above the limit are skipped)
+STAGE_LIMITS = {
+    "classify_module": 200,
+    "gantt_chart": 500,
+}
+
+
+#*********Stage setup: each returns a zero-argument callable to be timed...************
+
+# Raised by a stage that cannot measure what it is meant to (reported as skipped)
+class StageSkipped(Exception):
+    pass
+
+def stage_classify_module(df, args):
+    import joblib
+    from backend.home_utils import classify_module
+    try:
+        model = joblib.load(args.model)
+    except Exception as e:
+        raise StageSkipped(f"cannot load {args.model}: {str(e)}")
+    tasks = df["Task"].tolist()
+    # classify_module returns "Uncategorized" on errors; timing that path would not be classification speed
+    errors = []
+    classify_module(tasks[0], model, errors)  # untimed: also loads the embedding model
+    if errors:
+        raise StageSkipped(errors[0])
+
+    def run():
+        modules = [classify_module(task, model, errors) for task in tasks]
+        if errors:
+            raise StageSkipped(f"{len(errors)} task(s) failed to classify: {errors[0]}")
+        return modules
+    return run
+
+def stage_working_days(df, args):
+    from backend.home_utils import get_working_days
+    start = datetime.strptime(df["Start"].min(), "%Y-%m-%d").date()
+    end = datetime.strptime(df["End"].max(), "%Y-%m-%d").date()
+    holidays = [start + timedelta(days=d) for d in range(0, (end - start).days, 30)]
+
+    # Same work the Home page does when building the holiday picker and net working days
+    def run():
+        all_working_days = get_working_days(start, end)
+        return [d for d in all_working_days if d not in holidays]
+    return run
+
+def stage_prepare_tasks_df(df, args):
+    from backend.task_utils import prepare_tasks_df
+    return lambda: prepare_tasks_df(df.copy())
+
+def stage_task_frame(df, args):
+    from backend.task_frame import to_task_frame
+    return lambda: to_task_frame(df)
+
+# Chart stages clear the figure cache so they time a cold build
+def stage_timeline_chart(df, args):
+    from backend.task_utils import prepare_tasks_df
+    from backend.chart_utils import build_timeline_chart, clear_figure_cache
+    prepared = prepare_tasks_df(df.copy())
+    return lambda: (clear_figure_cache(), build_timeline_chart(prepared))
+
+# A rerun that changes the sprint selection: the per-sprint traces are already built
+def stage_timeline_sprint_filter(df, args):
+    from backend.task_utils import prepare_tasks_df
+    from backend.chart_utils import build_timeline_chart, clear_figure_cache
+    prepared = prepare_tasks_df(df.copy())
+    sprints = sorted(prepared["Sprint"].unique())
+    clear_figure_cache()
+    build_timeline_chart(prepared)
+    selections = iter(range(1 << 30))
+    return lambda: build_timeline_chart(prepared, sprints[:next(selections) % len(sprints) + 1])
+
+def stage_gantt_chart(df, args):
+    from backend.task_utils import prepare_tasks_df
+    from backend.chart_utils import build_gantt_chart, clear_figure_cache
+    prepared = prepare_tasks_df(df.copy())
+    return lambda: (clear_figure_cache(), build_gantt_chart(prepared))
+
+def stage_mongo_save(df, args):
+    import mongomock
+    from backend.db_utils import save_project_tasks
+    db = mongomock.MongoClient()["benchmark"]
+    # Times the Mongo write only; the duration index update is background embedding work
+    return lambda: save_project_tasks(db, "project", df.copy(), update_index=False)
+
+def stage_mongo_load(df, args):
+    import mongomock
+    from backend.db_utils import save_project_tasks, load_project_tasks
+    db = mongomock.MongoClient()["benchmark"]
+    save_project_tasks(db, "project", df.copy(), update_index=False)
+    return lambda: load_project_tasks(db, "project")
+
+def stage_schedule_build(df, args):
+    from backend.scheduler import Schedule
+    return lambda: Schedule(df)
+
+def stage_reschedule_edit(df, args):
+    import pandas as pd
+    from backend.scheduler import Schedule, apply_schedule_edits
+    schedule = Schedule(df)
+    task_id = df["Task_ID"].iloc[0]
+
+    # One End-date edit on an early task, pushed a week later each run
+    def run():
+        end = schedule.dates([task_id])[task_id][1]
+        return apply_schedule_edits(schedule, [(task_id, "End", pd.Timestamp(end) + pd.Timedelta(days=7))])
+    return run
+
+STAGES = {
+    "classify_module": stage_classify_module,
+    "working_days": stage_working_days,
+    "prepare_tasks_df": stage_prepare_tasks_df,
+    "task_frame": stage_task_frame,
+    "timeline_chart": stage_timeline_chart,
+    "timeline_sprint_filter": stage_timeline_sprint_filter,
+    "gantt_chart": stage_gantt_chart,
+    "mongo_save": stage_mongo_save,
+    "mongo_load": stage_mongo_load,
+    "schedule_build": stage_schedule_build,
+    "reschedule_edit": stage_reschedule_edit,
+}
+
+
+#*********Running, reporting & comparing...************
+
+def time_stage(name, df, args):
+    result = {"stage": name, "tasks": len(df)}
+    limit = STAGE_LIMITS.get(name)
+    if limit and len(df) > limit and not args.no_limits:
+        result["skipped"] = f"above the {limit}-task limit (use --no-limits)"
+        return result
+    try:
+        run = STAGES[name](df, args)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+    except ImportError as e:
+        result["skipped"] = f"missing dependency: {e.name}"
+        return result
+    except StageSkipped as e:
+        result["skipped"] = str(e)
+        return result
+    result.update({
+        "seconds": timings,
+        "min": min(timings),
+        "mean": sum(timings) / len(timings),
+        "per_task_ms": 1000 * min(timings) / max(1, len(df)),
+    })
+    return result
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(r["stage"], r["tasks"]): r for r in baseline["results"] if "min" in r}
+    print(f"\nComparison against {baseline_path} ({baseline.get('revision')})")
+    for r in current["results"]:
+        old = previous.get((r["stage"], r["tasks"]))
+        if "min" not in r or old is None:
+            continue
+        ratio = r["min"] / old["min"] if old["min"] else float("inf")
+        flag = "  <-- slower" if ratio > 1.2 else ""
+        print(f"{r['stage']:<18}{r['tasks']:>8}  {old['min']:>10.4f}s -> {r['min']:>10.4f}s  x{ratio:.2f}{flag}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the planner's hot stages on synthetic projects.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Task counts to generate")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model", default="models/modelsvm.pkl", help="Domain model used for classification")
+    parser.add_argument("--no-limits", action="store_true", help="Run slow stages on every size")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+    # Anything that still reaches the duration index writes a throwaway file, not the app's index
+    from backend import duration_index
+    with tempfile.TemporaryDirectory(prefix="benchmark_index_") as index_dir:
+        duration_index.INDEX_PATH = os.path.join(index_dir, "duration_index.npz")
+        for size in args.sizes:
+            df = generate_project(size, seed=args.seed)
+            for name in args.stages:
+                result = time_stage(name, df, args)
+                report["results"].append(result)
+                if "skipped" in result:
+                    print(f"{name:<18}{size:>8}  skipped: {result['skipped']}")
+                else:
+                    print(f"{name:<18}{size:>8}  min {result['min']:.4f}s  mean {result['mean']:.4f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main()
@@ -0,0 +1,65 @@
+import random
+import pandas as pd
+from datetime import date, timedelta
+from backend.home_utils import get_working_days
+
+
+#*********Synthetic project generators used by the benchmark runner...************
+
+MODULES = ["UI", "Design", "Rigging", "Animation", "Development", "VFX/SFX"]
+PROGRESS = ["PENDING", "IN PROGRESS", "COMPLETED", "BLOCKED"]
+ROLES = ["Developer", "Designer", "Manager", "Tester", "Other"]
+SKILLS = ["Python", "UI/UX", "Unity", "Animation", "Blender", "React", "MongoDB", "QA", "Rigging", "VFX"]
+VERBS = ["Design", "Implement", "Test", "Review", "Document", "Refactor", "Deploy", "Prototype"]
+NOUNS = ["landing page", "login flow", "player controller", "inventory system", "REST API",
+         "character rig", "particle effects", "database schema", "settings menu", "build pipeline"]
+
+#Build a list of resource profiles shaped like the `resources` collection
+def generate_resources(n_resources, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Resource {i + 1}",
+            "role": rng.choice(ROLES),
+            "skills": rng.sample(SKILLS, rng.randint(1, 4)),
+            "availability": rng.choice(["Available", "Assigned"]),
+        }
+        for i in range(n_resources)
+    ]
+
+#Build a task table shaped like the LLM output, with a random dependency DAG
+def generate_project(n_tasks, start=None, sprint_days=14, max_deps=3, n_resources=None, seed=0):
+    rng = random.Random(seed)
+    start = start or date.today()
+    n_resources = n_resources or max(2, n_tasks // 20)
+    resources = [r["name"] for r in generate_resources(n_resources, seed)]
+
+    # Calendar grows on demand so every dependency is respected, however deep the chains get
+    working_days = get_working_days(start, start + timedelta(days=60))
+
+    tasks = []
+    end_index = []
+    for i in range(n_tasks):
+        # Dependencies only point backwards, so the graph is always acyclic
+        window = range(max(0, i - 200), i)
+        deps = rng.sample(window, min(len(window), rng.randint(0, max_deps)))
+        first = max((end_index[d] + 1 for d in deps), default=rng.randint(0, 5))
+        duration = rng.randint(1, 5)
+        last = first + duration - 1
+        while last >= len(working_days):
+            working_days += get_working_days(working_days[-1] + timedelta(days=1), working_days[-1] + timedelta(days=365))
+        end_index.append(last)
+        sprint = (working_days[first] - start).days // sprint_days + 1
+        tasks.append({
+            "Sprint": f"Sprint {sprint}",
+            "Task_ID": f"T{i + 1}",
+            "Task": f"{rng.choice(VERBS)} {rng.choice(NOUNS)} #{i + 1}",
+            "Module": rng.choice(MODULES),
+            "Task_Dependency": [f"T{d + 1}" for d in sorted(deps)],
+            "Estimated Time": f"{duration} days",
+            "Start": working_days[first].strftime("%Y-%m-%d"),
+            "End": working_days[last].strftime("%Y-%m-%d"),
+            "Resource": rng.choice(resources),
+            "Progress": rng.choice(PROGRESS),
+        })
+    return pd.DataFrame(tasks)
@@ -1,190 +1,263 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import datetime, date, time
-from pymongo import MongoClient
-from urllib.parse import quote_plus
-from dotenv import load_dotenv
-import os
-
-# Load environment variables
-load_dotenv()
-
-# Get credentials and escape
-username = quote_plus(os.getenv("MONGO_USER"))
-password = quote_plus(os.getenv("MONGO_PASS"))
-cluster = os.getenv("MONGO_CLUSTER")
-DB_NAME = os.getenv("MONGO_DB")
-
-# Build Mongo URI
-uri = f"mongodb+srv://{username}:{password}@{cluster}/{DB_NAME}?retryWrites=true&w=majority"
-try:
-    client = MongoClient(uri,serverSelectionTimeoutMS=5000)
-    client.server_info()  # Test connection
-    db = client[DB_NAME]
-except Exception as e:
-    st.error(f"❌ Failed to connect to MongoDB: {e}")
-    st.stop()
-
-# ---------------- Streamlit Setup ----------------
-st.set_page_config("📋 Task Plan", layout="wide", page_icon="📁")
-st.title("📋 Project Task Schedule")
-
-# ---------------- Load or Select Collection ----------------
-# Initialize is_ai_generated if not present
-if "is_ai_generated" not in st.session_state:
-    st.session_state.is_ai_generated = False
-
-# Show dropdown unless tasks are AI-generated
-if not st.session_state.is_ai_generated:
-    st.markdown("### 📁 Select a Task Collection")
-    collections = db.list_collection_names()
-    if not collections:
-        st.error("❌ No Projects found in database.")
-        st.stop()
-
-    # Use current project_name as default if available
-    default_index = (
-        collections.index(st.session_state.project_name)
-        if "project_name" in st.session_state and st.session_state.project_name in collections
-        else 0
-    )
-    selected_collection = st.selectbox(
-        "🔽 Choose Project",
-        collections,
-        index=default_index,
-        key="collection_select"
-    )
-
-    # Update session state if collection changes
-    if "project_name" not in st.session_state or st.session_state.project_name != selected_collection:
-        st.session_state.project_name = selected_collection
-        collection = db[selected_collection]
-        data = list(collection.find({}))
-        if not data:
-            st.warning(f"⚠️ Selected Project '{selected_collection}' is empty.")
-            st.stop()
-        for doc in data:
-            doc.pop("_id", None)
-        st.session_state.tasks_df = pd.DataFrame(data)
-else:
-    # AI-generated tasks: show project name
-    if "project_name" not in st.session_state:
-        st.error("⚠️ `project_name` not found in session. Please define it on the Home page.")
-        st.stop()
-    st.markdown(f"### 📋 Working on Project: {st.session_state.project_name}")
-
-# ---------------- Continue With Loaded tasks_df ----------------
-df = st.session_state.tasks_df
-
-# Ensure required columns
-required_columns = ["Task", "Start", "End", "Sprint"]
-if not all(col in df.columns for col in required_columns):
-    st.error(f"❌ Missing required columns: {set(required_columns) - set(df.columns)}")
-    st.stop()
-
-if "Resource" not in df.columns:
-    df["Resource"] = ""
-if "Progress" not in df.columns:
-    df["Progress"] = "PENDING"
-if "Task_Dependency" not in df.columns:
-    df["Task_Dependency"] = [[] for _ in range(len(df))]
-if "Module" not in df.columns:
-    df["Module"] = ""
-
-# Convert dates
-df["Start"] = pd.to_datetime(df["Start"]).dt.date
-df["End"] = pd.to_datetime(df["End"]).dt.date
-
-# Format dependencies for editing
-df["Task_Dependency"] = df["Task_Dependency"].apply(
-    lambda x: ", ".join(x) if isinstance(x, list) else x
-)
-
-# Add Y index for Gantt chart
-df["Y_Index"] = list(range(len(df)))
-
-# ---------------- Editable Table ----------------
-st.markdown("### ✍️ Editable Task Table")
-
-edited_df = st.data_editor(
-    df,
-    num_rows="dynamic",
-    use_container_width=True,
-    key="editable_table",
-    column_config={
-        "Progress": st.column_config.SelectboxColumn(
-            "Progress",
-            options=["PENDING", "IN PROGRESS", "COMPLETED", "BLOCKED"],
-            required=True,
-        ),
-        "Task_Dependency": st.column_config.TextColumn(
-            "Task Dependency (comma-separated Task_IDs)"
-        ),
-    },
-)
-
-# Update session_state with edited DataFrame
-
-
-# ---------------- Save to Collection ----------------
-def fix_for_mongo(record):
-    record.pop("_id", None)
-    for k in ["Start", "End"]:
-        if isinstance(record.get(k), date) and not isinstance(record.get(k), datetime):
-            record[k] = datetime.combine(record[k], time.min)
-    if isinstance(record.get("Task_Dependency"), str):
-        record["Task_Dependency"] = [x.strip() for x in record["Task_Dependency"].split(",") if x.strip()]
-    return record
-
-col1, col2 = st.columns([1, 1])
-
-with col1:
-    if st.button("💾 Save Project"):
-        st.session_state.tasks_df = edited_df
-        if "project_name" not in st.session_state:
-            st.error("⚠️ `project_name` not found in session.")
-
-        else:
-            try:
-                project_name = st.session_state.project_name
-                collection = db[project_name]
-                records = edited_df.to_dict("records")
-                cleaned = [fix_for_mongo(r) for r in records]
-                collection.delete_many({})  # Clear existing data
-                collection.insert_many(cleaned)
-                st.success(f"✅ Project `{project_name}` saved!")
-            except Exception as e:
-                st.error(f"❌ Failed to save to DataBase: {e}")
-
-with col2:
-    csv = edited_df.to_csv(index=False).encode("utf-8")
-    st.download_button("⬇️ Download CSV", csv, "project_tasks.csv", "text/csv")
-
-# ---------------- Gantt Chart ----------------
-st.markdown("### 📊 Gantt Chart")
-selected_sprint = st.multiselect(
-    "Select Sprints",
-    options=edited_df["Sprint"].unique(),
-    default=edited_df["Sprint"].unique()
-)
-filtered_df = edited_df[edited_df["Sprint"].isin(selected_sprint)]
-fig = px.timeline(
-    filtered_df,
-    x_start="Start",
-    x_end="End",
-    y="Task",
-    color="Sprint",
-    title="🗓️ Project Timeline",
-    hover_data=["Resource", "Progress", "Task_Dependency", "Module"]
-)
-fig.update_yaxes(autorange="reversed")
-fig.update_layout(height=min(800, 40 * len(filtered_df)))
-st.plotly_chart(fig, use_container_width=True)
-
-# ---------------- Reset Session State ----------------
-if st.button("🔄 Reset and Select New Project"):
-    st.session_state.pop("tasks_df", None)
-    st.session_state.pop("project_name", None)
-    st.session_state.pop("is_ai_generated", None)
+import streamlit as st
+import pandas as pd
+from pymongo import MongoClient
+from urllib.parse import quote_plus
+from dotenv import load_dotenv
+import os
+from backend.db_utils import list_projects, load_project_tasks, save_project_tasks, save_task_changes
+from backend.task_utils import session_tasks_view, EDIT_SCOPES, EDIT_PAGE_SIZE, scope_options, scope_rows, merge_scope_edits
+from backend.task_frame import to_task_frame
+from backend.chart_utils import build_timeline_chart
+from backend.scheduler import Schedule, graph_signature, find_schedule_edits, apply_schedule_edits, holidays_from_working_days
+from backend.tracing import mongo_listener
+from backend.duration_index import bootstrap_index_async
+from backend.feedback_utils import find_module_corrections, record_corrections_async
+from backend.perf_panel import render_perf_panel
+
+# Load environment variables
+load_dotenv()
+
+# Get credentials and escape
+username = quote_plus(os.getenv("MONGO_USER"))
+password = quote_plus(os.getenv("MONGO_PASS"))
+cluster = os.getenv("MONGO_CLUSTER")
+DB_NAME = os.getenv("MONGO_DB")
+
+# Build Mongo URI
+uri = f"mongodb+srv://{username}:{password}@{cluster}/{DB_NAME}?retryWrites=true&w=majority"
+try:
+    client = MongoClient(uri,serverSelectionTimeoutMS=5000, event_listeners=[mongo_listener])
+    client.server_info()  # Test connection
+    db = client[DB_NAME]
+except Exception as e:
+    st.error(f"❌ Failed to connect to MongoDB: {e}")
+    st.stop()
+bootstrap_index_async(db)
+
+# ---------------- Streamlit Setup ----------------
+st.set_page_config("📋 Task Plan", layout="wide", page_icon="📁")
+st.title("📋 Project Task Schedule")
+render_perf_panel()
+
+# ---------------- Load or Select Collection ----------------
+# Initialize is_ai_generated if not present
+if "is_ai_generated" not in st.session_state:
+    st.session_state.is_ai_generated = False
+
+# Show dropdown unless tasks are AI-generated
+if not st.session_state.is_ai_generated:
+    st.markdown("### 📁 Select a Task Collection")
+    collections = list_projects(db)
+    if not collections:
+        st.error("❌ No Projects found in database.")
+        st.stop()
+
+    # Use current project_name as default if available
+    default_index = (
+        collections.index(st.session_state.project_name)
+        if "project_name" in st.session_state and st.session_state.project_name in collections
+        else 0
+    )
+    selected_collection = st.selectbox(
+        "🔽 Choose Project",
+        collections,
+        index=default_index,
+        key="collection_select"
+    )
+
+    # Update session state if collection changes
+    if "project_name" not in st.session_state or st.session_state.project_name != selected_collection:
+        st.session_state.project_name = selected_collection
+        data = load_project_tasks(db, selected_collection)
+        if data.empty:
+            st.warning(f"⚠️ Selected Project '{selected_collection}' is empty.")
+            st.stop()
+        st.session_state.tasks_df = to_task_frame(data)
+        st.session_state.pop("module_baseline", None)
+        st.session_state.pop("edit_scope", None)
+        st.session_state.pop("schedule_applied", None)
+        if "editor_key" in st.session_state:
+            st.session_state.pop(st.session_state.editor_key, None)
+        # Tasks as stored; later saves only write the ones edited since
+        st.session_state.persisted_project = selected_collection
+        st.session_state.dirty_task_ids, st.session_state.deleted_task_ids = set(), set()
+else:
+    # AI-generated tasks: show project name
+    if "project_name" not in st.session_state:
+        st.error("⚠️ `project_name` not found in session. Please define it on the Home page.")
+        st.stop()
+    st.markdown(f"### 📋 Working on Project: {st.session_state.project_name}")
+
+# ---------------- Continue With Loaded tasks_df ----------------
+df = st.session_state.tasks_df
+
+# Modules as classified or last saved; changes against them are fed back to the classifier
+if "module_baseline" not in st.session_state and {"Task_ID", "Module"} <= set(df.columns):
+    st.session_state.module_baseline = df[["Task_ID", "Module"]].copy()
+
+# Ensure required columns
+required_columns = ["Task", "Start", "End", "Sprint"]
+if not all(col in df.columns for col in required_columns):
+    st.error(f"❌ Missing required columns: {set(required_columns) - set(df.columns)}")
+    st.stop()
+
+df = session_tasks_view(st.session_state)
+
+# ---------------- Editable Table ----------------
+st.markdown("### ✍️ Editable Task Table")
+
+# Large plans are edited one sprint, module or page at a time; edits are merged back into the full table by Task_ID
+def fold_scope_edits():
+    if "working_df" in st.session_state:
+        st.session_state.tasks_df = to_task_frame(st.session_state.working_df)
+    if "editor_key" in st.session_state:
+        st.session_state.pop(st.session_state.editor_key, None)
+
+st.session_state.setdefault("dirty_task_ids", set())
+st.session_state.setdefault("deleted_task_ids", set())
+if st.session_state.get("edit_scope") not in EDIT_SCOPES:
+    st.session_state.edit_scope = "Sprint" if len(df) > EDIT_PAGE_SIZE else "All tasks"
+scope_col, value_col = st.columns([2, 1])
+scope_kind = scope_col.radio("Edit", EDIT_SCOPES, key="edit_scope", horizontal=True, on_change=fold_scope_edits)
+scope_value = None
+if scope_kind != "All tasks":
+    scope_value = value_col.selectbox(scope_kind, scope_options(df, scope_kind), key=f"edit_scope_{scope_kind}", on_change=fold_scope_edits)
+scope_df = scope_rows(df, scope_kind, scope_value)
+st.session_state.editor_key = f"editable_table_{scope_kind}_{scope_value}"
+if scope_kind != "All tasks":
+    st.caption(f"Editing {len(scope_df)} of {len(df)} tasks.")
+
+edited_scope = st.data_editor(
+    scope_df,
+    num_rows="dynamic",
+    use_container_width=True,
+    key=st.session_state.editor_key,
+    column_config={
+        "Progress": st.column_config.SelectboxColumn(
+            "Progress",
+            options=["PENDING", "IN PROGRESS", "COMPLETED", "BLOCKED"],
+            required=True,
+        ),
+        "Task_Dependency": st.column_config.TextColumn(
+            "Task Dependency (comma-separated Task_IDs)"
+        ),
+        "Start": st.column_config.DateColumn("Start"),
+        "End": st.column_config.DateColumn("End"),
+    },
+)
+edited_df, changed_ids, deleted_ids = merge_scope_edits(df, scope_df, edited_scope)
+st.session_state.working_df = edited_df
+st.session_state.dirty_task_ids |= changed_ids
+st.session_state.deleted_task_ids |= set(deleted_ids)
+st.session_state.deleted_task_ids -= changed_ids  # an id deleted earlier and now re-added is saved again
+
+# ---------------- Reschedule Downstream Tasks ----------------
+if "Task_ID" in edited_df.columns and not edited_df.empty:
+    signature = graph_signature(edited_df)
+    schedule_columns = [c for c in ["Task_ID", "Start", "End", "Progress"] if c in edited_df.columns]
+    # Edits are diffed against the table as last applied to the schedule, so each edit (or its undo) is applied once
+    applied = st.session_state.get("schedule_applied")
+    if st.session_state.get("schedule_signature") != signature or applied is None:
+        # Task graph changed (new project, rows or dependencies edited): rebuild once
+        holidays = holidays_from_working_days(st.session_state.get("net_working_days"))
+        st.session_state.schedule = Schedule(edited_df, holidays)
+        st.session_state.schedule_signature = signature
+    else:
+        edits = find_schedule_edits(applied, edited_df)
+        if edits:
+            moved = apply_schedule_edits(st.session_state.schedule, edits)
+            rows = {task_id: i for i, task_id in enumerate(edited_df["Task_ID"].astype(str))}
+            # Tasks the schedule placed differently from the table: dependents pushed back, blocked or weekend-rolled tasks
+            shifted = {}
+            for task_id, (start, end) in moved.items():
+                shown = edited_df["Start"].iat[rows[task_id]], edited_df["End"].iat[rows[task_id]]
+                if (pd.Timestamp(start), pd.Timestamp(end)) != tuple(pd.Timestamp(d).normalize() for d in shown):
+                    shifted[task_id] = (start, end)
+            if shifted:
+                rescheduled = edited_df.copy()
+                start_col, end_col = rescheduled.columns.get_loc("Start"), rescheduled.columns.get_loc("End")
+                for task_id, (start, end) in shifted.items():
+                    rescheduled.iat[rows[task_id], start_col] = pd.Timestamp(start)
+                    rescheduled.iat[rows[task_id], end_col] = pd.Timestamp(end)
+                st.session_state.tasks_df = to_task_frame(rescheduled)
+                st.session_state.schedule_applied = rescheduled[schedule_columns].copy()
+                st.session_state.dirty_task_ids |= set(shifted)
+                st.session_state.reschedule_notice = f"🔁 Rescheduled {len(shifted)} task(s)."
+                del st.session_state[st.session_state.editor_key]  # edits are now part of tasks_df
+                st.rerun()
+    st.session_state.schedule_applied = edited_df[schedule_columns].copy()
+
+    if "reschedule_notice" in st.session_state:
+        st.info(st.session_state.pop("reschedule_notice"))
+    schedule = st.session_state.schedule
+    critical_path = schedule.critical_path()
+    st.caption(
+        f"🧭 Critical path ({len(critical_path)} tasks): "
+        + " → ".join(critical_path[:30]) + (" …" if len(critical_path) > 30 else "")
+    )
+    with st.expander("⏳ Slack per task (working days)"):
+        st.dataframe(
+            pd.DataFrame({"Task_ID": schedule.ids, "Slack": schedule.slack()}).sort_values("Slack"),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+# ---------------- Save to Collection ----------------
+col1, col2 = st.columns([1, 1])
+
+with col1:
+    if st.button("💾 Save Project"):
+        st.session_state.tasks_df = to_task_frame(edited_df)
+        if "project_name" not in st.session_state:
+            st.error("⚠️ `project_name` not found in session.")
+
+        else:
+            try:
+                project_name = st.session_state.project_name
+                dirty, deleted = st.session_state.dirty_task_ids, st.session_state.deleted_task_ids
+                if st.session_state.get("persisted_project") == project_name:
+                    # Only the tasks edited since the last load/save are written
+                    save_task_changes(db, project_name, edited_df, dirty - deleted, deleted)
+                    notice = f"✅ Project `{project_name}` saved ({len(dirty - deleted)} changed, {len(deleted)} deleted)."
+                else:
+                    save_project_tasks(db, project_name, edited_df)
+                    notice = f"✅ Project `{project_name}` saved!"
+                if "module_baseline" in st.session_state:
+                    record_corrections_async(find_module_corrections(st.session_state.module_baseline, edited_df))
+                    st.session_state.module_baseline = edited_df[["Task_ID", "Module"]].copy()
+                st.session_state.persisted_project = project_name
+                st.session_state.dirty_task_ids, st.session_state.deleted_task_ids = set(), set()
+                st.session_state.save_notice = notice
+                del st.session_state[st.session_state.editor_key]  # the saved table is the new baseline
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Failed to save to DataBase: {e}")
+
+    if "save_notice" in st.session_state:
+        st.success(st.session_state.pop("save_notice"))
+
+with col2:
+    csv = edited_df.to_csv(index=False).encode("utf-8")
+    st.download_button("⬇️ Download CSV", csv, "project_tasks.csv", "text/csv")
+
+# ---------------- Gantt Chart ----------------
+st.markdown("### 📊 Gantt Chart")
+selected_sprint = st.multiselect(
+    "Select Sprints",
+    options=edited_df["Sprint"].unique(),
+    default=edited_df["Sprint"].unique()
+)
+fig = build_timeline_chart(edited_df, selected_sprint)
+st.plotly_chart(fig, use_container_width=True)
+
+# ---------------- Reset Session State ----------------
+if st.button("🔄 Reset and Select New Project"):
+    st.session_state.pop("tasks_df", None)
+    st.session_state.pop("module_baseline", None)
+    st.session_state.pop("project_name", None)
+    st.session_state.pop("is_ai_generated", None)
+    st.session_state.pop("persisted_project", None)
+    st.session_state.pop("edit_scope", None)
+    st.session_state.pop("working_df", None)
+    st.session_state.pop("schedule_applied", None)
     st.rerun()
\ No newline at end of file
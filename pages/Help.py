@@ -1,133 +1,169 @@
-import streamlit as st
-
-st.set_page_config("📖 Help - Project Work Planner", layout="wide", page_icon="❓")
-st.title("🛠️ Help Center - Project Work Planner")
-
-# --- Tabs for Help and Chatbot ---
-tab1, tab2 = st.tabs(["📖 Help Guide", "💬 Chatbot Support"])
-
-# ----------------------- TAB 1: HELP GUIDE -----------------------
-with tab1:
-    st.markdown("""
-Welcome to the **Project Work Planner**! This tool helps you break down your project into actionable tasks, organize them into sprints, manage dependencies, and track progress effectively.
-
----
-
-## 🔧 Features Overview
-
-### 🗂️ Project Setup
-- **Project Name**: Title of your project.
-- **Project Description**: Provide a short overview. If not available, type `na` or `none`.
-- **Start & End Dates**: Define your project timeline.
-
-### 📌 Task Management
-- **Sprint**: Group tasks into time-boxed sprints.
-- **Task ID**: Unique ID like `T1`, `T2`.
-- **Module**: Category (UI, Dev, Design, etc.)
-- **Dependencies**: Tasks that must be completed first.
-- **Estimated Time**: e.g., `3 days`, `4 hrs`.
-
-### ⛑️ Resource Management
-- Assign team members.
-- Conflicts are flagged if a resource is already busy.
-
-### 📊 Visualization
-- Gantt chart view of timelines.
-- Status tracking for `PENDING`, `IN PROGRESS`, etc.
-
-### 📤 Data Storage
-- Save and load data from MongoDB (optional).
-- Export plans to CSV/JSON.
-
----
-
-## ❓ FAQs
-
-**Q: No description yet?**  
-A: Enter `na` or `none`.
-
-**Q: How are dependencies handled?**  
-A: The planner will auto-adjust start dates based on the selected dependencies.
-
-**Q: Can I edit tasks after creating them?**  
-A: Yes, all task fields are editable in the planner table.
-
----
-
-## 📫 Contact Support
-
-- 📧 Email: `shivamshar03@gmail.com`
-- 💻 GitHub: [@shivamshar03](https://github.com/shivamshar03)
-
----
-    """)
-
-# ----------------------- TAB 2: CHATBOT -----------------------
-with tab2:
-    st.subheader("💬 Project Help Assistant")
-    st.caption("Ask me anything about using the Project Work Planner.")
-
-    from langchain_groq import ChatGroq
-    from langchain.schema import HumanMessage, SystemMessage
-    from dotenv import  load_dotenv
-
-    load_dotenv()
-
-
-    # --- Initialize Chat Model ---
-    chat = ChatGroq(model_name="llama3-70b-8192")
-
-    # --- Contextual System Prompt ---
-    context_prompt = SystemMessage(
-        content="""
-You are an AI help assistant embedded in the **Project Work Planner**, an internal project management tool built for Carina Soft Labs Inc.
-
-Your job is to help employees understand how to:
-- Create and manage software projects across multiple sprints.
-- Add, edit, or delete project tasks and organize them by module (UI, Design, Rigging, Animation, Development, VFX/SFX).
-- Assign tasks to specific developers while detecting resource conflicts if someone is already working on another project.
-- Use task dependencies so a task starts only after its dependent tasks are completed.
-- Use estimated time and date ranges to visualize work in a Gantt chart.
-- Export project plans as CSV or JSON, or store them in MongoDB.
-- Use 'na' or 'none' when a project description is not provided.
-- Track status using flags like `PENDING`, `IN PROGRESS`, `COMPLETED`, and `BLOCKED`.
-
-You're a knowledgeable, helpful assistant that understands Carina Soft Labs' internal workflow standards.
-
-FAQs you should handle confidently:
-- "How are developers assigned?" → Based on their availability; conflicts are flagged.
-- "Can I skip descriptions?" → Yes. Just enter `na` or `none`.
-- "What if two tasks overlap?" → Use dependencies and proper estimation to avoid overlap.
-- "Can I view the full timeline?" → Use the Gantt chart feature.
-- "How is data stored?" → In a MongoDB database if available, or exported manually.
-
-Always give clear, friendly, and helpful responses. Assume the user is a team member at Carina Soft Labs Inc.
-"""
-    )
-
-    # --- Chat History Handling ---
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
-
-    # Display Previous Messages
-    for msg in st.session_state.chat_history:
-        with st.chat_message(msg["role"]):
-            st.markdown(msg["content"])
-
-    # Chat Input
-    user_query = st.chat_input("Ask your question here...")
-
-    if user_query:
-        # st.chat_message("user").markdown(user_query)
-        st.session_state.chat_history.append({"role": "user", "content": user_query})
-
-        # Send system context + user message
-        response = chat([
-            context_prompt,
-            *[HumanMessage(content=msg["content"]) for msg in st.session_state.chat_history if msg["role"] == "user"]
-        ])
-
-        reply = response.content
-        st.chat_message("assistant").markdown(reply)
-        st.session_state.chat_history.append({"role": "assistant", "content": reply})
-
+import streamlit as st
+
+st.set_page_config("📖 Help - Project Work Planner", layout="wide", page_icon="❓")
+st.title("🛠️ Help Center - Project Work Planner")
+
+# --- Help Guide (also indexed for the chatbot) ---
+help_guide = """
+Welcome to the **Project Work Planner**! This tool helps you break down your project into actionable tasks, organize them into sprints, manage dependencies, and track progress effectively.
+
+---
+
+## 🔧 Features Overview
+
+### 🗂️ Project Setup
+- **Project Name**: Title of your project.
+- **Project Description**: Provide a short overview. If not available, type `na` or `none`.
+- **Start & End Dates**: Define your project timeline.
+
+### 📌 Task Management
+- **Sprint**: Group tasks into time-boxed sprints.
+- **Task ID**: Unique ID like `T1`, `T2`.
+- **Module**: Category (UI, Dev, Design, etc.)
+- **Dependencies**: Tasks that must be completed first.
+- **Estimated Time**: e.g., `3 days`, `4 hrs`.
+
+### ⛑️ Resource Management
+- Assign team members.
+- Conflicts are flagged if a resource is already busy.
+
+### 📊 Visualization
+- Gantt chart view of timelines.
+- Status tracking for `PENDING`, `IN PROGRESS`, etc.
+
+### 📤 Data Storage
+- Save and load data from MongoDB (optional).
+- Export plans to CSV/JSON.
+
+---
+
+## ❓ FAQs
+
+**Q: No description yet?**  
+A: Enter `na` or `none`.
+
+**Q: How are dependencies handled?**  
+A: The planner will auto-adjust start dates based on the selected dependencies.
+
+**Q: Can I edit tasks after creating them?**  
+A: Yes, all task fields are editable in the planner table.
+
+---
+
+## 📫 Contact Support
+
+- 📧 Email: `shivamshar03@gmail.com`
+- 💻 GitHub: [@shivamshar03](https://github.com/shivamshar03)
+
+---
+"""
+
+# --- Tabs for Help and Chatbot ---
+tab1, tab2 = st.tabs(["📖 Help Guide", "💬 Chatbot Support"])
+
+# ----------------------- TAB 1: HELP GUIDE -----------------------
+with tab1:
+    st.markdown(help_guide)
+
+# ----------------------- TAB 2: CHATBOT -----------------------
+with tab2:
+    st.subheader("💬 Project Help Assistant")
+    st.caption("Ask me anything about using the Project Work Planner.")
+
+    from dotenv import  load_dotenv
+    from backend.llm_provider import get_provider
+    from backend.chat_utils import split_history, build_chat_messages, update_summary
+    from backend.tracing import span
+    from backend.help_index import HelpIndex, split_markdown_sections
+
+    load_dotenv()
+
+
+    # --- Chat Model (the shared LLM provider: one client, retries and a concurrency cap) ---
+    chat = get_provider()
+
+    # --- Contextual System Prompt (only the top-k relevant knowledge sections are appended) ---
+    context_prompt = """
+You are an AI help assistant embedded in the **Project Work Planner**, an internal project management tool built for Carina Soft Labs Inc.
+You're a knowledgeable, helpful assistant that understands Carina Soft Labs' internal workflow standards.
+Answer using the help sections below. Always give clear, friendly, and helpful responses. Assume the user is a team member at Carina Soft Labs Inc.
+"""
+
+    assistant_knowledge = """
+### What the assistant helps with
+- Create and manage software projects across multiple sprints.
+- Add, edit, or delete project tasks and organize them by module (UI, Design, Rigging, Animation, Development, VFX/SFX).
+- Assign tasks to specific developers while detecting resource conflicts if someone is already working on another project.
+- Use task dependencies so a task starts only after its dependent tasks are completed.
+- Use estimated time and date ranges to visualize work in a Gantt chart.
+- Export project plans as CSV or JSON, or store them in MongoDB.
+- Use 'na' or 'none' when a project description is not provided.
+- Track status using flags like `PENDING`, `IN PROGRESS`, `COMPLETED`, and `BLOCKED`.
+
+**Q: How are developers assigned?**
+A: Based on their availability; conflicts are flagged.
+
+**Q: Can I skip descriptions?**
+A: Yes. Just enter `na` or `none`.
+
+**Q: What if two tasks overlap?**
+A: Use dependencies and proper estimation to avoid overlap.
+
+**Q: Can I view the full timeline?**
+A: Use the Gantt chart feature.
+
+**Q: How is data stored?**
+A: In a MongoDB database if available, or exported manually.
+"""
+
+    # --- Local index over the guide + past answers (shared across sessions) ---
+    @st.cache_resource
+    def get_help_index():
+        return HelpIndex(split_markdown_sections(help_guide + "\n" + assistant_knowledge))
+
+    help_index = get_help_index()
+
+    # --- Chat History Handling ---
+    if "chat_history" not in st.session_state:
+        st.session_state.chat_history = []
+    if "chat_summary" not in st.session_state:
+        st.session_state.chat_summary = ""
+        st.session_state.chat_summarized = 0  # messages already folded into the summary
+
+    # Display Previous Messages
+    for msg in st.session_state.chat_history:
+        with st.chat_message(msg["role"]):
+            st.markdown(msg["content"])
+
+    # Chat Input
+    user_query = st.chat_input("Ask your question here...")
+
+    if user_query:
+        st.chat_message("user").markdown(user_query)
+        st.session_state.chat_history.append({"role": "user", "content": user_query})
+
+        # Near-duplicate first questions are answered from the local cache (later ones depend on this conversation)
+        first_turn = len(st.session_state.chat_history) == 1 and not st.session_state.chat_summary
+        cached_answer, sections, query_vector = help_index.search(user_query, first_turn=first_turn)
+        if cached_answer:
+            reply = cached_answer
+            st.chat_message("assistant").markdown(reply)
+        else:
+            # Send system context + relevant sections + rolling summary + recent turns that fit the token budget
+            system_prompt = context_prompt + "\nRelevant help sections:\n\n" + "\n\n".join(sections)
+            _, window = split_history(st.session_state.chat_history)
+            messages = build_chat_messages(system_prompt, st.session_state.chat_summary, window)
+
+            # Stream the reply as tokens arrive
+            with st.chat_message("assistant"):
+                with span("groq.help_chat"):
+                    reply = st.write_stream(chat.stream(messages, call="help_chat"))
+            help_index.add_answer(user_query, reply, query_vector, first_turn)
+        st.session_state.chat_history.append({"role": "assistant", "content": reply})
+
+        # Fold turns that dropped out of the window into the summary for the next question
+        older, _ = split_history(st.session_state.chat_history)
+        pending = older[st.session_state.chat_summarized:]
+        if pending:
+            st.session_state.chat_summary = update_summary(chat, st.session_state.chat_summary, pending)
+            st.session_state.chat_summarized = len(older)
@@ -0,0 +1,114 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+import logging
+from backend.db_utils import get_db, list_projects
+from backend.utilization_utils import load_portfolio_tasks, utilization_matrix, weekly_buckets
+from backend.perf_panel import render_perf_panel
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ---------------- Page Setup ----------------
+st.set_page_config("📈 Portfolio Utilization", layout="wide", page_icon="📈")
+st.title("📈 Portfolio Utilization")
+render_perf_panel()
+
+# One client per server process instead of a new connection on every widget interaction
+@st.cache_resource
+def get_portfolio_db():
+    return get_db()
+
+try:
+    db = get_portfolio_db()
+except Exception as e:
+    st.error(f"❌ Failed to connect to MongoDB: {e}")
+    logger.error(f"MongoDB connection failed: {str(e)}")
+    st.stop()
+
+# ---------------- Load Assigned Tasks ----------------
+if st.button("🔄 Reload projects") or "portfolio_tasks" not in st.session_state:
+    with st.spinner("🔄 Loading assigned tasks from all projects..."):
+        st.session_state.portfolio_tasks = load_portfolio_tasks(db, list_projects(db))
+tasks = st.session_state.portfolio_tasks
+
+def has_dates(tasks):
+    return bool((tasks["Start"].notna() & tasks["End"].notna()).any())
+
+if tasks.empty or not has_dates(tasks):
+    st.info("ℹ️ No assigned tasks with dates in any project. Assign resources on the Resources page first.")
+    st.stop()
+
+# ---------------- Filters ----------------
+col1, col2, col3 = st.columns([2, 2, 1])
+projects = col1.multiselect("📁 Projects", sorted(tasks["Project"].unique()), placeholder="All projects")
+if projects:
+    tasks = tasks[tasks["Project"].isin(projects)]
+sprints = col2.multiselect("🏁 Sprints", sorted(tasks["Sprint"].unique()), placeholder="All sprints")
+if sprints:
+    tasks = tasks[tasks["Sprint"].isin(sprints)]
+bucket = col3.radio("Bucket", ["Week", "Day"], horizontal=True)
+
+if not has_dates(tasks):
+    st.info("ℹ️ None of the selected tasks has both a start and an end date.")
+    st.stop()
+tasks = tasks[tasks["Start"].notna() & tasks["End"].notna()]
+first_day, last_day = tasks["Start"].min(), tasks["End"].max()
+horizon = st.date_input(
+    "📅 Horizon",
+    value=(first_day.date(), min(last_day, first_day + pd.DateOffset(years=2)).date()),
+    min_value=first_day.date(),
+    max_value=last_day.date(),
+)
+if len(horizon) != 2:
+    st.stop()
+start, end = horizon
+
+matrix = utilization_matrix(tasks, start, end)
+if matrix.empty:
+    st.info("ℹ️ No assigned work in this horizon.")
+    st.stop()
+
+# ---------------- Summary ----------------
+overbooked_days = int((matrix.values > 1).sum())
+busy_share = float((matrix.values > 0).mean())
+m1, m2, m3 = st.columns(3)
+m1.metric("Resources", len(matrix))
+m2.metric("Average Utilization", f"{busy_share:.0%}", help="Share of working days with at least one task")
+m3.metric("Overbooked Resource-Days", overbooked_days, help="Working days with more than one concurrent task")
+
+# ---------------- Heatmap ----------------
+def utilization_heatmap(matrix, bucket, height):
+    view = weekly_buckets(matrix) if bucket == "Week" else matrix
+    label = "Task-days in week" if bucket == "Week" else "Concurrent tasks"
+    fig = go.Figure(go.Heatmap(
+        z=view.values,
+        x=view.columns,
+        y=view.index,
+        colorscale="YlOrRd",
+        zmin=0,
+        colorbar=dict(title=label),
+        hovertemplate="%{y}<br>%{x|%d %b %Y}<br>" + label + ": %{z}<extra></extra>",
+    ))
+    fig.update_layout(height=height, margin=dict(l=10, r=10, t=30, b=10), yaxis=dict(autorange="reversed"))
+    return fig
+
+st.markdown(f"### 🔥 Resource × {'Week' if bucket == 'Week' else 'Working Day'}")
+st.plotly_chart(utilization_heatmap(matrix, bucket, max(300, min(18 * len(matrix), 1600))), use_container_width=True)
+
+# ---------------- Drill-down ----------------
+st.markdown("### 🔍 Drill-down by Project & Sprint")
+busiest = matrix.sum(axis=1).sort_values(ascending=False).index.tolist()
+resource = st.selectbox("👤 Resource (busiest first)", busiest)
+resource_tasks = tasks[tasks["Resource"].astype(str) == resource].copy()
+resource_tasks["Project / Sprint"] = resource_tasks["Project"] + " · " + resource_tasks["Sprint"]
+breakdown = utilization_matrix(resource_tasks, start, end, by="Project / Sprint")
+st.plotly_chart(utilization_heatmap(breakdown, bucket, max(250, 30 * len(breakdown))), use_container_width=True)
+
+in_horizon = resource_tasks[(resource_tasks["End"] >= pd.Timestamp(start)) & (resource_tasks["Start"] <= pd.Timestamp(end))]
+st.dataframe(
+    in_horizon[["Project", "Sprint", "Task_ID", "Task", "Start", "End"]].sort_values("Start"),
+    use_container_width=True,
+    hide_index=True,
+)
@@ -0,0 +1,82 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+from backend.scheduler import Schedule, graph_signature, holidays_from_working_days
+from backend.risk_utils import parse_estimated_days, simulate_schedule, summarize_risk, probability_on_time
+from backend.task_utils import session_tasks_view
+from backend.perf_panel import render_perf_panel
+
+# --- Streamlit UI ---
+st.set_page_config("🎲 Schedule Risk", layout="wide", page_icon="🎲")
+st.title("🎲 Schedule Risk Analysis")
+render_perf_panel()
+
+# --- Check if data is loaded ---
+if "tasks_df" not in st.session_state:
+    st.warning("⚠️ No tasks found. Please generate or select a project first.")
+    st.stop()
+
+df = session_tasks_view(st.session_state)
+required_columns = ["Task_ID", "Task", "Start", "End"]
+if not all(col in df.columns for col in required_columns) or df.empty:
+    st.error(f"❌ Missing required columns: {set(required_columns) - set(df.columns)}")
+    st.stop()
+
+# --- Reuse the task editor's schedule when the task graph is unchanged ---
+if st.session_state.get("schedule_signature") == graph_signature(df):
+    schedule = st.session_state.schedule
+else:
+    schedule = Schedule(df, holidays_from_working_days(st.session_state.get("net_working_days")))
+if len(schedule.rows) < len(df):
+    st.warning(f"⚠️ {len(df) - len(schedule.rows)} task(s) without Start/End dates are left out of the simulation.")
+if not schedule.ids:
+    st.stop()
+
+planned_end = schedule.to_date(schedule.end.max())
+target_date = st.session_state.get("end_date", planned_end)
+
+col1, col2 = st.columns([1, 1])
+iterations = col1.select_slider("Iterations", options=[1000, 5000, 10000, 20000, 50000], value=10000)
+target_date = col2.date_input("🏁 Target End Date", value=target_date)
+use_history = "Historical Days" in df.columns and st.checkbox("📚 Prefer durations of similar completed tasks", value=True)
+
+if st.button("🎲 Run Simulation"):
+    scheduled = df.iloc[schedule.rows]
+    modules = scheduled["Module"] if "Module" in scheduled.columns else [""] * len(scheduled)
+    estimates = scheduled["Estimated Time"].map(parse_estimated_days) if "Estimated Time" in scheduled.columns else None
+    if use_history:
+        history = pd.to_numeric(scheduled["Historical Days"], errors="coerce")
+        estimates = history if estimates is None else history.fillna(estimates)
+    with st.spinner("🎲 Simulating schedules..."):
+        result = simulate_schedule(schedule, modules, estimates, iterations=iterations)
+    st.session_state.risk_result = result
+
+if "risk_result" in st.session_state and len(st.session_state.risk_result["criticality"]) == len(schedule.ids):
+    result = st.session_state.risk_result
+    summary = summarize_risk(schedule, result)
+
+    # --- Completion percentiles ---
+    cols = st.columns(4)
+    for col, (pct, day) in zip(cols, summary["dates"].items()):
+        col.metric(f"P{pct} completion", day.strftime("%d-%b-%Y"), f"{np.busday_count(planned_end, day, busdaycal=schedule.calendar)} working days vs plan", delta_color="inverse")
+    cols[3].metric("Chance to finish by target", f"{100 * probability_on_time(schedule, result, target_date):.0f}%")
+
+    # --- Completion distribution ---
+    finish_dates = schedule.to_date(np.ceil(result["completion"]).astype(np.int64) - 1)
+    fig = px.histogram(x=pd.to_datetime(finish_dates), nbins=40, title="Simulated Project Completion Dates")
+    fig.add_vline(x=pd.Timestamp(target_date).timestamp() * 1000, line_dash="dash", line_color="red")
+    fig.update_layout(xaxis_title="Completion date", yaxis_title="Iterations", height=400)
+    st.plotly_chart(fig, use_container_width=True)
+
+    # --- Tasks most often on the critical path ---
+    st.markdown("### 🧭 Tasks Most Often on the Critical Path")
+    tasks_by_id = dict(zip(df["Task_ID"].astype(str), df["Task"]))
+    st.dataframe(
+        pd.DataFrame(
+            [(task_id, tasks_by_id.get(task_id, ""), round(100 * share, 1)) for task_id, share in summary["critical_tasks"]],
+            columns=["Task_ID", "Task", "Critical in % of runs"],
+        ),
+        hide_index=True,
+        use_container_width=True,
+    )
@@ -1,55 +1,95 @@
-import streamlit as st
-import pandas as pd
-from pymongo import MongoClient
-from urllib.parse import quote_plus
-from dotenv import load_dotenv
-import os
-
-# Load environment variables
-load_dotenv()
-
-# Get credentials and escape
-username = quote_plus(os.getenv("MONGO_USER"))
-password = quote_plus(os.getenv("MONGO_PASS"))
-cluster = os.getenv("MONGO_CLUSTER")
-DB_NAME = os.getenv("MONGO_DB")
-
-# Build Mongo URI
-uri = f"mongodb+srv://{username}:{password}@{cluster}/{DB_NAME}?retryWrites=true&w=majority"
-client = MongoClient(uri)
-db = client[DB_NAME]
-
-# ---------------- Page Setup ----------------
-st.set_page_config("📂 Projects Viewer", layout="wide", page_icon="🗂️")
-st.title("📂 Project Work Plan Sheets Viewer")
-
-# ---------------- Collection Selection ----------------
-collections = db.list_collection_names()
-
-if not collections:
-    st.error("❌ No Project found in the database.")
-    st.stop()
-
-selected_collection = st.selectbox("🔽 Select Project", collections)
-
-# ---------------- Load Data ----------------
-collection = db[selected_collection]
-data = list(collection.find({}))
-
-if not data:
-    st.warning("⚠️ This Project is empty.")
-    st.stop()
-
-# Drop ObjectId for display
-for doc in data:
-    doc.pop("_id", None)
-
-df = pd.DataFrame(data)
-
-# ---------------- Show Data ----------------
-st.markdown(f"### 📄 Data in `{selected_collection}`")
-st.dataframe(df, use_container_width=True)
-
-# ---------------- Download as CSV ----------------
-csv_data = df.to_csv(index=False).encode("utf-8")
-st.download_button("⬇️ Download CSV", csv_data, f"{selected_collection}.csv", "text/csv")
+import streamlit as st
+import pandas as pd
+from pymongo import MongoClient
+from urllib.parse import quote_plus
+from dotenv import load_dotenv
+import os
+from backend.tracing import mongo_listener
+from backend.db_utils import list_projects
+from backend.plan_history import list_versions, version_records, diff_versions
+from backend.task_frame import to_task_frame, display_frame
+from backend.perf_panel import render_perf_panel
+
+# Load environment variables
+load_dotenv()
+
+# Get credentials and escape
+username = quote_plus(os.getenv("MONGO_USER"))
+password = quote_plus(os.getenv("MONGO_PASS"))
+cluster = os.getenv("MONGO_CLUSTER")
+DB_NAME = os.getenv("MONGO_DB")
+
+# Build Mongo URI
+uri = f"mongodb+srv://{username}:{password}@{cluster}/{DB_NAME}?retryWrites=true&w=majority"
+client = MongoClient(uri, event_listeners=[mongo_listener])
+db = client[DB_NAME]
+
+# ---------------- Page Setup ----------------
+st.set_page_config("📂 Projects Viewer", layout="wide", page_icon="🗂️")
+st.title("📂 Project Work Plan Sheets Viewer")
+render_perf_panel()
+
+# ---------------- Collection Selection ----------------
+collections = list_projects(db)
+
+if not collections:
+    st.error("❌ No Project found in the database.")
+    st.stop()
+
+selected_collection = st.selectbox("🔽 Select Project", collections)
+
+# ---------------- Load Data ----------------
+collection = db[selected_collection]
+data = list(collection.find({}))
+
+if not data:
+    st.warning("⚠️ This Project is empty.")
+    st.stop()
+
+# Drop ObjectId for display
+for doc in data:
+    doc.pop("_id", None)
+
+df = display_frame(to_task_frame(pd.DataFrame(data)))
+
+# ---------------- Show Data ----------------
+st.markdown(f"### 📄 Data in `{selected_collection}`")
+st.dataframe(df, use_container_width=True)
+
+# ---------------- Download as CSV ----------------
+csv_data = df.to_csv(index=False).encode("utf-8")
+st.download_button("⬇️ Download CSV", csv_data, f"{selected_collection}.csv", "text/csv")
+
+# ---------------- Version History ----------------
+st.markdown("### 🕘 Version History")
+versions = list_versions(db, selected_collection)
+if not versions:
+    st.info("ℹ️ No saved versions yet; a version is recorded every time the project is saved.")
+    st.stop()
+
+history_df = pd.DataFrame(versions)[["version", "saved_at", "kind", "tasks_count", "changed_count", "removed_count"]]
+history_df.columns = ["Version", "Saved At", "Stored As", "Tasks", "Changed", "Removed"]
+st.dataframe(history_df, use_container_width=True, hide_index=True)
+
+version_numbers = [v["version"] for v in versions]
+view_col, old_col, new_col = st.columns(3)
+view_version = view_col.selectbox("👁️ View version", version_numbers)
+old_version = old_col.selectbox("Compare from", version_numbers, index=min(1, len(version_numbers) - 1))
+new_version = new_col.selectbox("Compare to", version_numbers, index=0)
+
+with st.expander(f"📄 Plan as of version {view_version}"):
+    version_df = pd.DataFrame(version_records(db, selected_collection, view_version))
+    if version_df.empty:
+        st.warning("⚠️ This version has no tasks.")
+    else:
+        version_df = display_frame(to_task_frame(version_df))
+        st.dataframe(version_df, use_container_width=True)
+        st.download_button("⬇️ Download this version", version_df.to_csv(index=False).encode("utf-8"),
+                           f"{selected_collection}_v{view_version}.csv", "text/csv")
+
+st.markdown(f"#### 🔀 Changes from version {min(old_version, new_version)} to {max(old_version, new_version)}")
+changes = diff_versions(db, selected_collection, old_version, new_version)
+if changes:
+    st.dataframe(pd.DataFrame(changes).astype(str), use_container_width=True, hide_index=True)
+else:
+    st.info("ℹ️ No differences between these versions.")
@@ -0,0 +1,13 @@
+import sys
+from streamlit.web import cli as stcli
+from backend.warmup import start_warmup
+
+
+#*********Start the app with the model warm-up already running...************
+
+# Usage: python serve.py [streamlit options]
+# The warm-up thread starts with the server process, so the first visitor doesn't wait for the models
+if __name__ == "__main__":
+    start_warmup()
+    sys.argv = ["streamlit", "run", "Home.py", *sys.argv[1:]]
+    sys.exit(stcli.main())
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+import pytest
+
+# backend/ is imported from the repository root, as the Streamlit pages do
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+# Nothing a test saves may reach the app's duration index in the working directory
+@pytest.fixture(autouse=True)
+def duration_index_path(tmp_path, monkeypatch):
+    from backend import duration_index
+    path = str(tmp_path / "duration_index.npz")
+    monkeypatch.setattr(duration_index, "INDEX_PATH", path)
+    monkeypatch.setattr(duration_index, "_index", None)
+    return path
+
+
+class WordEmbeddings:
+    # Bag-of-words vectors over a small vocabulary: texts sharing a word are similar, others are not
+    vocabulary = ["login", "page", "shader", "level", "design", "api", "cache",
+                  "sprint", "add", "plan", "resource", "export", "csv"]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(word in str(text).lower()) for word in self.vocabulary]
+
+
+# Stands in for the MiniLM embeddings model
+@pytest.fixture
+def word_embeddings():
+    return WordEmbeddings()
@@ -0,0 +1,23 @@
+import pandas as pd
+from backend.chart_utils import build_gantt_chart, clear_figure_cache, invalid_task_ids
+
+
+def tasks():
+    return pd.DataFrame({
+        "Task_ID": ["T1", "T2", "T3"],
+        "Task": ["Login page", "Shader pass", "Level design"],
+        "Start": pd.to_datetime(["2024-01-01", None, "2024-01-08"]),
+        "End": pd.to_datetime(["2024-01-03", "2024-01-05", None]),
+        "Resource": ["Ana", "Ben", "Ana"],
+        "Progress": ["COMPLETED", "PENDING", "IN PROGRESS"],
+        "Task_Dependency": ["", "T1", "T2"],
+        "Y_Index": [0, 1, 2],
+    })
+
+
+def test_invalid_task_ids_reported_even_when_figure_is_cached():
+    clear_figure_cache()
+    df = tasks()
+    first = build_gantt_chart(df)
+    assert build_gantt_chart(df) is first
+    assert invalid_task_ids(df) == ["T2", "T3"]
@@ -0,0 +1,69 @@
+import pytest
+from backend import classification_embeddings
+from backend.classification_embeddings import get_embeddings, embedding_info, mean_cosine
+
+langchain_huggingface = pytest.importorskip("langchain_huggingface")
+
+
+class FakeHuggingFaceEmbeddings:
+    # Stands in for the hub model download
+    def __init__(self, model_name, model_kwargs=None):
+        self.model_name = model_name
+
+
+@pytest.fixture
+def fresh_embeddings(monkeypatch):
+    monkeypatch.setattr(langchain_huggingface, "HuggingFaceEmbeddings", FakeHuggingFaceEmbeddings)
+    get_embeddings.cache_clear()
+    yield monkeypatch
+    get_embeddings.cache_clear()
+
+
+def test_one_model_per_process(fresh_embeddings):
+    fresh_embeddings.setattr(classification_embeddings, "EMBEDDING_BACKEND", "fp32")
+    assert get_embeddings() is get_embeddings()
+    assert embedding_info()["backend"] == "fp32"
+
+
+def test_unknown_backend_loads_fp32(fresh_embeddings):
+    fresh_embeddings.setattr(classification_embeddings, "EMBEDDING_BACKEND", "fp16")
+    get_embeddings()
+    assert embedding_info()["backend"] == "fp32"
+
+
+def test_mean_cosine():
+    assert mean_cosine([[1, 0], [0, 2]], [[2, 0], [0, 1]]) == pytest.approx(1.0)
+    assert mean_cosine([[1, 0]], [[0, 1]]) == pytest.approx(0.0)
+
+
+def tiny_sentence_transformer(name, device=None):
+    import torch
+
+    class TinySentenceTransformer(torch.nn.Module):
+        # Letter counts through a Linear layer, enough for quantize_dynamic to have something to convert
+        def __init__(self):
+            super().__init__()
+            torch.manual_seed(0)
+            self.linear = torch.nn.Linear(26, 64)
+
+        def encode(self, texts, convert_to_numpy=True, show_progress_bar=False):
+            counts = torch.tensor([[t.lower().count(chr(97 + i)) for i in range(26)] for t in texts], dtype=torch.float32)
+            with torch.no_grad():
+                return self.linear(counts).numpy()
+
+    return TinySentenceTransformer()
+
+
+@pytest.mark.parametrize("min_cosine, backend", [(0.9, "int8"), (1.01, "fp32")])
+def test_int8_is_checked_against_fp32(fresh_embeddings, min_cosine, backend):
+    torch = pytest.importorskip("torch")
+    sentence_transformers = pytest.importorskip("sentence_transformers")
+    fresh_embeddings.setattr(sentence_transformers, "SentenceTransformer", tiny_sentence_transformer)
+    fresh_embeddings.setattr(classification_embeddings, "EMBEDDING_BACKEND", "int8")
+    fresh_embeddings.setattr(classification_embeddings, "INT8_MIN_COSINE", min_cosine)
+    embeddings = get_embeddings()
+    assert embedding_info()["backend"] == backend
+    assert embedding_info()["probe_cosine"] > 0.9
+    quantized = isinstance(embeddings.model.linear, torch.ao.nn.quantized.dynamic.Linear)
+    assert quantized == (backend == "int8")
+    assert len(embeddings.embed_query("Design the main menu")) == 64
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+from backend import db_utils, plan_history
+from backend.db_utils import save_project_tasks, save_task_changes, load_project_tasks
+from backend.duration_index import get_duration_index
+
+mongomock = pytest.importorskip("mongomock")
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(plan_history, "_latest", {})
+    monkeypatch.setattr(plan_history, "_indexed", False)
+    return mongomock.MongoClient()["db"]
+
+
+@pytest.fixture
+def index_updates(monkeypatch):
+    calls = []
+    monkeypatch.setattr(db_utils, "_update_duration_index", lambda project_name, df: calls.append(project_name))
+    return calls
+
+
+def tasks(ids):
+    return pd.DataFrame({"Task_ID": ids, "Task": [f"Task {i}" for i in range(len(ids))], "Sprint": "Sprint 1",
+                         "Start": "2024-01-01", "End": "2024-01-02", "Progress": "PENDING"})
+
+
+def test_duration_index_update_is_optional(db, index_updates):
+    assert save_project_tasks(db, "demo", tasks(["T1", "T2"])) == 2
+    assert save_project_tasks(db, "bench", tasks(["T1", "T2"]), update_index=False) == 2
+    # Repeated ids fall back to a full rewrite, which passes the setting on
+    save_task_changes(db, "bench", tasks(["T1", "T1"]), {"T1"}, update_index=False)
+    assert index_updates == ["demo"]
+    assert len(load_project_tasks(db, "bench")) == 2
+
+
+def test_index_path_is_redirected(duration_index_path):
+    assert get_duration_index().path == duration_index_path
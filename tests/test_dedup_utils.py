@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from backend.dedup_utils import deduplicate_tasks, find_duplicate_clusters
+
+
+def test_clusters_across_blocks_keep_the_earliest_row():
+    vectors = np.array([[1, 0], [0, 1], [1, 0], [0.6, 0.8], [1, 0]], dtype=np.float32)
+    clusters = find_duplicate_clusters(vectors, threshold=0.99, block_size=2)
+    assert clusters == [[0, 2, 4]]
+
+
+def test_duplicates_are_merged_and_dependencies_rewritten(word_embeddings):
+    df = pd.DataFrame({
+        "Task_ID": ["T1", "T2", "T3", "T4"],
+        "Task": ["Login page", "Shader pass", "Build the login page", "Cache api"],
+        "Task_Dependency": [[], ["T1"], ["T2"], ["T3"]],
+    })
+    result, merged = deduplicate_tasks(df, word_embeddings)
+    assert merged == [["Login page", "Build the login page"]]
+    assert result["Task_ID"].tolist() == ["T1", "T2", "T4"]
+    deps = dict(zip(result["Task_ID"], result["Task_Dependency"]))
+    # T4 now points at the kept task; T1 inherited T3's prerequisite, and the T1 <-> T2 cycle lost one edge
+    assert deps["T4"] == ["T1"]
+    assert (deps["T1"] == ["T2"]) != (deps["T2"] == ["T1"])
+
+
+def test_distinct_tasks_are_left_alone(word_embeddings):
+    df = pd.DataFrame({"Task": ["Login page", "Shader pass"]})
+    result, merged = deduplicate_tasks(df, word_embeddings)
+    assert merged == [] and result is df
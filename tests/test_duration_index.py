@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from backend.duration_index import DurationIndex
+
+
+def tasks(progress, names=("Login page", "Shader pass", "Level design")):
+    return pd.DataFrame({
+        "Task": list(names),
+        "Module": ["UI", "VFX", "Design"],
+        "Start": ["2024-01-01", "2024-01-01", "2024-01-08"],
+        "End": ["2024-01-03", "2024-01-05", "2024-01-08"],
+        "Progress": progress,
+    })
+
+
+def test_update_empty_index_without_completed_tasks(word_embeddings):
+    index = DurationIndex(word_embeddings, path=None)
+    assert index.update_project("fresh", tasks(["PENDING"] * 3)) == 0
+    assert len(index) == 0
+    assert np.isnan(index.predict(["Login page"], ["UI"])).all()
+
+
+def test_update_replaces_project_entries(word_embeddings):
+    index = DurationIndex(word_embeddings, path=None)
+    assert index.update_project("alpha", tasks(["COMPLETED"] * 3)) == 3
+    assert index.vectors.shape == (3, len(word_embeddings.vocabulary))
+    # Completed work of a project that is later reopened leaves the index
+    assert index.update_project("alpha", tasks(["PENDING"] * 3)) == 0
+    assert len(index) == 0 and index.vectors.shape[0] == 0
+
+
+def test_predict_uses_similar_completed_tasks(word_embeddings):
+    index = DurationIndex(word_embeddings, path=None)
+    index.update_project("alpha", tasks(["COMPLETED"] * 3))
+    index.update_project("beta", tasks(["COMPLETED"] * 3, names=("Login page api", "Shader level", "Level design")))
+    days = index.predict(["Login page"], ["UI"])
+    assert abs(days[0] - 3.0) < 1e-6
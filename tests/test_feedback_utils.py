@@ -0,0 +1,62 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from backend import home_utils
+from backend.feedback_utils import FeedbackStore, find_module_corrections
+
+
+def test_corrections_need_a_domain():
+    before = pd.DataFrame({"Task_ID": ["T1", "T2"], "Task": ["Login", "Shader"], "Module": ["UI", "VFX"]})
+    after = before.assign(Module=["Backend", "VFX"])
+    assert find_module_corrections(before, after) == []
+    assert find_module_corrections(before, after, domain="Web Development") == [("Login", "Backend", "Web Development")]
+    tagged = after.assign(Domain=["Game Development ", "Game Development"])
+    assert find_module_corrections(before, tagged, domain="Web Development") == [("Login", "Backend", "Game Development")]
+
+
+def base_model(path):
+    rng = np.random.default_rng(0)
+    X = np.vstack([rng.normal(0, 1, (40, 4)), rng.normal(4, 1, (40, 4))]).astype(np.float32)
+    y = np.array(["UI"] * 40 + ["VFX"] * 40)
+    joblib.dump(make_pipeline(StandardScaler(), SVC()).fit(X, y), path)
+
+
+def add_correction(store, model_path, task, module, vector):
+    store._execute(
+        "INSERT INTO corrections (model_path, domain, task, module, vector, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        (model_path, "Custom", task, module, np.asarray(vector, dtype=np.float32).tobytes(), "2024-01-01T00:00:00"),
+    )
+
+
+def test_updates_go_to_overlay_and_start_from_trained_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(home_utils, "MODEL_OVERLAY_DIR", str(tmp_path / "updated"))
+    model_path = str(tmp_path / "custom.pkl")
+    base_model(model_path)
+    trained = open(model_path, "rb").read()
+    store = FeedbackStore(db_path=str(tmp_path / "feedback.sqlite3"), interval=3600)
+
+    add_correction(store, model_path, "Odd task", "VFX", [0.2] * 4)
+    assert store.apply_pending() == [model_path]
+    assert open(model_path, "rb").read() == trained  # the tracked model is never rewritten
+    assert os.path.exists(home_utils.overlay_path(model_path))
+    first_support = home_utils.load_domain_model(model_path)[-1].support_vectors_.shape[0]
+
+    # Nothing new: nothing refit
+    assert store.apply_pending() == []
+    # Another round refits the trained model on both corrections instead of the previous update
+    add_correction(store, model_path, "Other task", "UI", [3.8] * 4)
+    store.apply_pending()
+    assert store.pending() == 0
+    second_support = home_utils.load_domain_model(model_path)[-1].support_vectors_.shape[0]
+    base_support = home_utils.load_base_model(model_path)[-1].support_vectors_.shape[0]
+    assert second_support <= base_support + 2 and first_support <= base_support + 1
+
+    # Retraining drops the stale overlay; the next update rebuilds it from the stored corrections
+    home_utils.forget_domain_model(model_path)
+    assert not os.path.exists(home_utils.overlay_path(model_path))
+    assert store.apply_pending() == [model_path]
+    home_utils.forget_domain_model(model_path)
@@ -0,0 +1,31 @@
+import json
+from backend.help_index import HelpIndex, split_markdown_sections
+
+
+GUIDE = "# Sprints\nAdd a sprint from the Home page.\n---\n**Q: How do I export?**\nUse Download CSV."
+
+
+def test_sections_split_at_headings_and_faq():
+    assert split_markdown_sections(GUIDE) == ["# Sprints\nAdd a sprint from the Home page.", "**Q: How do I export?**\nUse Download CSV."]
+
+
+def test_only_first_turn_answers_are_cached_and_served(tmp_path, word_embeddings):
+    path = tmp_path / "qa.json"
+    index = HelpIndex(split_markdown_sections(GUIDE), word_embeddings, cache_path=str(path))
+    question = "How do I add a sprint to my plan?"
+    _, _, vector = index.search(question)
+    index.add_answer(question, "Follow-up answer", vector, first_turn=False)
+    assert index.search(question)[0] is None
+    index.add_answer(question, "Use the sprint field.", vector)
+    assert index.search(question)[0] == "Use the sprint field."
+    assert index.search(question, first_turn=False)[0] is None
+
+
+def test_entries_without_first_turn_flag_are_dropped(tmp_path, word_embeddings):
+    path = tmp_path / "qa.json"
+    path.write_text(json.dumps([
+        {"question": "How do I add a sprint?", "answer": "old, from someone's conversation"},
+        {"question": "How do I export csv files?", "answer": "Download CSV.", "first_turn": True},
+    ]))
+    index = HelpIndex([], word_embeddings, cache_path=str(path))
+    assert [qa["answer"] for qa in index.qa_pairs] == ["Download CSV."]
@@ -0,0 +1,20 @@
+import io
+import pytest
+from backend.home_utils import extract_text_from_pdfs, get_working_days
+
+pytest.importorskip("PyPDF2")
+
+
+def test_pdf_problems_are_collected_not_shown():
+    broken = io.BytesIO(b"not a pdf")
+    broken.name = "broken.pdf"
+    warnings = []
+    assert extract_text_from_pdfs([broken], warnings) == ""
+    assert warnings[0].startswith("Error reading PDF file broken.pdf")
+    assert warnings[-1] == "No text extracted from uploaded PDFs. Please check the files."
+
+
+def test_working_days_skip_weekends():
+    from datetime import date
+    days = get_working_days(date(2024, 1, 5), date(2024, 1, 8))
+    assert days == [date(2024, 1, 5), date(2024, 1, 8)]
@@ -0,0 +1,29 @@
+import time
+from backend.job_queue import JobQueue
+from backend.tracing import collect_spans, span
+
+
+def runner(params, files, progress):
+    with span("pipeline.stage", step=params["step"]):
+        progress(50, "Working")
+    return {"tasks": [], "warnings": []}
+
+
+def wait(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_spans_are_returned_with_the_result(tmp_path):
+    with collect_spans() as session:
+        queue = JobQueue(db_path=str(tmp_path / "jobs.sqlite3"), workers=1, runner=runner)
+        job = wait(queue, queue.submit("demo", {"step": "one"}))
+    assert job["status"] == "done"
+    assert [(s["span"], s["step"]) for s in job["result"]["trace"]] == [("pipeline.stage", "one")]
+    # The worker thread never wrote into the submitting session's list
+    assert session == []
@@ -0,0 +1,61 @@
+import json
+import pytest
+from backend.llm_provider import LLMProvider, ReplayProvider, prompt_key
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FlakyProvider(LLMProvider):
+    name = "flaky"
+
+    def __init__(self, failures, error=RateLimitError, **kwargs):
+        super().__init__(base_delay=0, max_delay=0, **kwargs)
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def _complete(self, messages, call):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("try again")
+        return "done", 3, 1
+
+
+def test_provider_without_complete_fails_on_creation():
+    class Incomplete(LLMProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_retryable_errors_are_retried():
+    provider = FlakyProvider(failures=2, max_retries=3)
+    assert provider.complete("hello") == "done"
+    assert provider.calls == 3
+
+
+def test_retries_stop_at_the_limit_and_on_bad_requests():
+    provider = FlakyProvider(failures=5, max_retries=2)
+    with pytest.raises(RateLimitError):
+        provider.complete("hello")
+    assert provider.calls == 3
+    provider = FlakyProvider(failures=1, error=ValueError, max_retries=3)
+    with pytest.raises(ValueError):
+        provider.complete("hello")
+    assert provider.calls == 1
+
+
+def test_replay_matches_prompts_then_rotates_per_call(tmp_path):
+    path = tmp_path / "replay.jsonl"
+    recorded = [{"messages": [{"role": "human", "content": "plan a game"}], "call": "generate", "response": "A"},
+                {"messages": [{"role": "human", "content": "plan a site"}], "call": "generate", "response": "B"}]
+    path.write_text("\n".join(json.dumps(entry) for entry in recorded) + "\n")
+    provider = ReplayProvider(path=str(path), latency_ms=0)
+    assert provider.complete("plan a site", call="generate") == "B"
+    assert prompt_key("plan a site") == prompt_key([{"role": "human", "content": "plan a site"}])
+    assert [provider.complete("something new", call="generate") for _ in range(3)] == ["A", "B", "A"]
+    with pytest.raises(LookupError):
+        provider.complete("hello", call="help")
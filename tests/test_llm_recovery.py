@@ -0,0 +1,60 @@
+import json
+import pytest
+from backend.llm_recovery import salvage_tasks, merge_tasks, validate_dependencies, recover_task_list
+
+
+def task(task_id, deps=(), name=None):
+    return {"Sprint": "Sprint 1", "Task_ID": task_id, "Task": name or f"Task {task_id}",
+            "Start": "2024-01-01", "End": "2024-01-02", "Task_Dependency": list(deps)}
+
+
+def test_salvage_skips_brackets_in_leading_prose():
+    text = "Here is the plan [JSON]:\n```json\n" + json.dumps([task("T1"), task("T2")]) + "\n```"
+    result = salvage_tasks(text)
+    assert [t["Task_ID"] for t in result["tasks"]] == ["T1", "T2"]
+    assert not result["truncated"] and not result["invalid"]
+
+
+def test_salvage_keeps_complete_objects_of_truncated_output():
+    text = json.dumps([task("T1"), task("T2")])[:-40]
+    result = salvage_tasks(text)
+    assert [t["Task_ID"] for t in result["tasks"]] == ["T1"]
+    assert result["truncated"]
+
+
+def test_salvage_reports_invalid_entries():
+    bad = {**task("T2"), "End": "2023-12-01"}
+    result = salvage_tasks(json.dumps([task("T1"), bad]))
+    assert len(result["tasks"]) == 1
+    assert result["invalid"][0]["problem"] == "ends before it starts"
+
+
+def test_empty_task_list_is_an_error():
+    with pytest.raises(RuntimeError, match="empty task list"):
+        recover_task_list("```json\n[]\n```", lambda *args: "")
+
+
+def test_merge_renumbers_colliding_ids_and_remaps_dependencies():
+    merged = merge_tasks([task("T1"), task("T2")], [task("T2", name="Other"), task("T3", deps=["T2"]), task("T1")])
+    assert [t["Task_ID"] for t in merged] == ["T1", "T2", "T4", "T3"]
+    assert merged[3]["Task_Dependency"] == ["T4"]
+
+
+def test_validate_dependencies_drops_unknown_self_and_cyclic_edges():
+    tasks = [task("T1", deps=["T3", "T1"]), task("T2", deps=["T1", "T9"]), task("T3", deps=["T2"])]
+    assert validate_dependencies(tasks) == 3
+    assert sum(len(t["Task_Dependency"]) for t in tasks) == 2
+
+
+def test_recover_requests_only_missing_part():
+    first = json.dumps([task("T1"), task("T2")])[:-40]
+    calls = []
+
+    def regenerate(tasks, invalid, truncated):
+        calls.append(([t["Task_ID"] for t in tasks], truncated))
+        return json.dumps([task("T2"), task("T3", deps=["T2"])])
+
+    tasks, notes = recover_task_list(first, regenerate)
+    assert calls == [(["T1"], True)]
+    assert [t["Task_ID"] for t in tasks] == ["T1", "T2", "T3"]
+    assert notes
@@ -0,0 +1,35 @@
+import io
+import joblib
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+from backend.ml_utils import read_domain_data, train_domain_models
+
+
+def test_read_domain_data_strips_domains_and_skips_header():
+    csv = "text,module,domain\nLogin page,UI,Game Development \nREST api,Backend, Web Development\n"
+    df = read_domain_data(io.StringIO(csv))
+    assert list(df["domain"]) == ["Game Development", "Web Development"]
+    assert list(df.index) == [0, 1]
+
+
+def test_train_domain_models_uses_positions_and_stripped_domains(tmp_path, word_embeddings):
+    game = [("Login page", "UI"), ("Shader pass", "VFX"), ("Level shader", "VFX"), ("Page login", "UI")] * 3
+    web = [("REST api", "Backend"), ("Cache layer", "Backend"), ("Landing page", "Frontend"), ("Login page", "Frontend")] * 3
+    df = pd.DataFrame(
+        [(text, module, "Game Development ") for text, module in game]
+        + [(text, module, "Web Development") for text, module in web],
+        columns=["text", "module", "domain"])
+    # A filtered frame: labels no longer match row positions
+    df.index = range(100, 100 + len(df))
+    paths = {"Game Development": str(tmp_path / "game_dev.pkl"), "Web Development": str(tmp_path / "web_dev.pkl")}
+
+    result = train_domain_models(df, embeddings=word_embeddings, workers=1,
+                                 path_for_domain=lambda domain: paths.get(domain, str(tmp_path / "modelsvm.pkl")))
+
+    assert result["installed"], result["report"]
+    assert sorted(entry["Model"] for entry in result["report"]) == sorted(paths.values())
+    assert set(joblib.load(paths["Game Development"]).classes_) == {"UI", "VFX"}
+    assert set(joblib.load(paths["Web Development"]).classes_) == {"Backend", "Frontend"}
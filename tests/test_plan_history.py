@@ -0,0 +1,50 @@
+import pytest
+from backend import plan_history
+from backend.plan_history import record_version, version_records, diff_versions, list_versions
+
+mongomock = pytest.importorskip("mongomock")
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(plan_history, "_latest", {})
+    monkeypatch.setattr(plan_history, "_indexed", False)
+    return mongomock.MongoClient()["db"]
+
+
+def tasks(n):
+    return [{"Task_ID": f"T{i}", "Task": f"Task {i}", "Sprint": "Sprint 1"} for i in range(1, n + 1)]
+
+
+def test_versions_rebuild_and_diff(db):
+    first = tasks(30)
+    assert record_version(db, "demo", first) == 1
+    second = [dict(t) for t in first[:-1]]
+    second[0]["Task"] = "Renamed"
+    assert record_version(db, "demo", second) == 2
+    assert record_version(db, "demo", second) is None
+    assert version_records(db, "demo", 1) == first
+    assert version_records(db, "demo", 2) == second
+    changes = {(row["Task_ID"], row["Change"]) for row in diff_versions(db, "demo", 1, 2)}
+    assert changes == {("T1", "changed"), ("T30", "removed")}
+
+
+def test_blank_and_duplicate_ids_are_kept(db):
+    records = tasks(3) + [{"Task_ID": "T2", "Task": "Copy"}, {"Task_ID": "", "Task": "New row"}, {"Task_ID": None, "Task": "Another"}]
+    record_version(db, "demo", records)
+    assert [r["Task"] for r in version_records(db, "demo", 1)] == ["Task 1", "Task 2", "Task 3", "Copy", "New row", "Another"]
+
+
+def test_concurrent_save_takes_the_next_version(db, monkeypatch):
+    record_version(db, "demo", tasks(3))
+    # Another save records version 2 after this one read the latest version
+    stale = iter([1])
+    real = plan_history._latest_version
+    monkeypatch.setattr(plan_history, "_latest_version", lambda d, p: next(stale, None) or real(d, p))
+    db[plan_history.HISTORY_COLLECTION].insert_one({
+        "project": "demo", "version": 2, "kind": "delta",
+        "delta": {"changed": [["T4", {"Task_ID": "T4", "Task": "Task 4"}]], "removed": []},
+    })
+    assert record_version(db, "demo", tasks(5)) == 3
+    assert [v["version"] for v in list_versions(db, "demo")] == [3, 2, 1]
+    assert version_records(db, "demo", 3) == tasks(5)
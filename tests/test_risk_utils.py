@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend import risk_utils
+from backend.risk_utils import parse_estimated_days, simulate_schedule, summarize_risk, probability_on_time
+from backend.scheduler import Schedule
+
+
+def plan():
+    return Schedule(pd.DataFrame({
+        "Task_ID": ["T1", "T2", "T3"],
+        "Task_Dependency": ["", "T1", ""],
+        # T2 is planned to overlap T1, so in every run it waits for T1 to finish
+        "Start": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-01"]),
+        "End": pd.to_datetime(["2024-01-03", "2024-01-03", "2024-01-01"]),
+    }))
+
+
+def test_estimates_in_working_days():
+    assert parse_estimated_days("2 days") == 2
+    assert parse_estimated_days("4 hrs") == 0.5
+    assert parse_estimated_days("1 week") == 5
+    assert np.isnan(parse_estimated_days("soon"))
+
+
+def test_near_certain_durations_follow_the_critical_path(monkeypatch):
+    monkeypatch.setattr(risk_utils, "DEFAULT_UNCERTAINTY", (0.999, 1.001))
+    schedule = plan()
+    # Batches smaller than the run exercise the batch loop
+    result = simulate_schedule(schedule, ["", "", ""], iterations=500, seed=1, batch_size=128)
+    assert result["completion"] == pytest.approx(np.full(500, 5.0), abs=0.01)
+    assert result["criticality"].tolist() == [1.0, 1.0, 0.0]
+
+
+def test_summary_dates_and_on_time_share():
+    schedule = plan()
+    # Finishing after 5 working days means the last day worked is Friday; 5.5 spills into Monday
+    result = {"completion": np.array([5.0] * 60 + [5.5] * 40), "criticality": np.array([1.0, 0.6, 0.0])}
+    summary = summarize_risk(schedule, result)
+    assert {pct: str(day) for pct, day in summary["dates"].items()} == {50: "2024-01-05", 80: "2024-01-08", 95: "2024-01-08"}
+    assert summary["critical_tasks"] == [("T1", 1.0), ("T2", 0.6)]
+    assert probability_on_time(schedule, result, "2024-01-05") == 0.6
+    assert probability_on_time(schedule, result, "2024-01-08") == 1.0
+
+
+def test_longer_estimates_push_completion_and_seed_is_reproducible():
+    schedule = plan()
+    base = simulate_schedule(schedule, ["UI", "UI", "UI"], iterations=2000, seed=7)
+    again = simulate_schedule(schedule, ["UI", "UI", "UI"], iterations=2000, seed=7)
+    assert np.array_equal(base["completion"], again["completion"])
+    # Pessimistic module spreads only ever push the planned finish (5 working days) later on average
+    assert base["completion"].mean() > 5
+    longer = simulate_schedule(schedule, ["UI", "UI", "UI"], estimates=[np.nan, np.nan, 10], iterations=2000, seed=7)
+    assert longer["criticality"][2] == 1.0
+    assert longer["completion"].min() >= 10 * risk_utils.MODULE_UNCERTAINTY["UI"][0] - 1e-9
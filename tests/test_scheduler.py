@@ -0,0 +1,61 @@
+import pandas as pd
+from backend.scheduler import Schedule, graph_signature, find_schedule_edits, apply_schedule_edits
+
+
+def plan():
+    return pd.DataFrame({
+        "Task_ID": ["T1", "T2", "T3"],
+        "Task_Dependency": ["", "T1", ""],
+        "Start": pd.to_datetime(["2024-01-01", "2024-01-04", "2024-01-01"]),
+        "End": pd.to_datetime(["2024-01-03", "2024-01-05", "2024-01-02"]),
+        "Progress": ["PENDING"] * 3,
+    })
+
+
+def test_edit_pushes_dependents():
+    before = plan()
+    schedule = Schedule(before)
+    after = before.copy()
+    after.loc[0, "End"] = pd.Timestamp("2024-01-08")
+    moved = apply_schedule_edits(schedule, find_schedule_edits(before, after))
+    assert set(moved) == {"T1", "T2"}
+    assert pd.Timestamp(moved["T2"][0]) == pd.Timestamp("2024-01-09")
+
+
+def test_edit_and_undo_against_last_applied_table():
+    applied = plan()
+    schedule = Schedule(applied)
+    critical = schedule.critical_path()
+    edited = applied.copy()
+    edited.loc[2, "End"] = pd.Timestamp("2024-01-12")
+    apply_schedule_edits(schedule, find_schedule_edits(applied, edited))
+    assert schedule.critical_path() == ["T3"]
+    # Diffing against the applied table finds nothing new on a rerun, and the undo as an edit
+    assert find_schedule_edits(edited, edited) == []
+    apply_schedule_edits(schedule, find_schedule_edits(edited, applied))
+    assert schedule.critical_path() == critical
+
+
+def test_block_applies_once():
+    applied = plan()
+    schedule = Schedule(applied)
+    edited = applied.copy()
+    edited.loc[0, "Progress"] = "BLOCKED"
+    moved = apply_schedule_edits(schedule, find_schedule_edits(applied, edited), today=pd.Timestamp("2024-01-02"))
+    assert pd.Timestamp(moved["T1"][0]) == pd.Timestamp("2024-01-02")
+    assert find_schedule_edits(edited, edited) == []
+
+
+def test_undated_tasks_are_left_out():
+    df = pd.concat([plan(), pd.DataFrame({"Task_ID": ["T4"], "Task_Dependency": ["T1"], "Start": [None], "End": [None],
+                                          "Progress": ["PENDING"]})], ignore_index=True)
+    schedule = Schedule(df)
+    assert schedule.ids == ["T1", "T2", "T3"]
+    assert list(schedule.rows) == [0, 1, 2]
+    # Dating the new row changes the graph signature, so the page rebuilds the schedule
+    dated = df.copy()
+    dated.loc[3, ["Start", "End"]] = [pd.Timestamp("2024-01-04"), pd.Timestamp("2024-01-04")]
+    assert graph_signature(dated) != graph_signature(df)
+    assert Schedule(dated).ids == ["T1", "T2", "T3", "T4"]
+    # Edits to an undated task are ignored rather than raising
+    assert apply_schedule_edits(schedule, [("T4", "Start", pd.NaT)]) == {}
@@ -0,0 +1,45 @@
+from backend.skill_index import SkillIndex, parse_query
+
+PROFILES = [
+    {"name": "Ana", "role": "Developer", "availability": "Available", "skills": ["Unity", "C#"]},
+    {"name": "Ben", "role": "Designer", "availability": "Available", "skills": ["Unity", "Animation"]},
+    {"name": "Cy", "role": "Designer", "availability": "Assigned", "skills": ["Blender", "Animation"]},
+    {"name": "Di", "role": "Developer", "availability": "Available", "skills": ["React"]},
+]
+
+
+def test_parse_and_not():
+    assert parse_query("Unity AND NOT animation") == [[("unity", False)], [("animation", True)]]
+
+
+def test_parse_leading_not():
+    assert parse_query("NOT Unity") == [[("unity", True)]]
+
+
+def test_parse_or_then_comma():
+    assert parse_query("Unity OR blender, animation") == [[("unity", False), ("blender", False)], [("animation", False)]]
+
+
+def test_parse_multiword_skill():
+    assert parse_query("machine  learning or NOT c#") == [[("machine learning", False), ("c#", True)]]
+
+
+def test_match_boolean_queries():
+    index = SkillIndex(PROFILES)
+    assert index.match("Unity AND NOT animation") == ["Ana"]
+    assert sorted(index.match("NOT Unity")) == ["Cy", "Di"]
+    assert sorted(index.match("Unity OR Blender, Animation")) == ["Ben", "Cy"]
+    assert sorted(index.match("Designer, Available")) == ["Ben"]
+    assert len(index.match("")) == len(PROFILES)
+
+
+def test_match_prefix_and_resync():
+    index = SkillIndex(PROFILES)
+    assert sorted(index.match("anim")) == ["Ben", "Cy"]
+    assert index.sync(PROFILES[:2] + [{**PROFILES[3], "skills": ["React", "Animation"]}]) == 2
+    assert sorted(index.match("animation")) == ["Ben", "Di"]
+
+
+def test_rank_excludes_negated_terms():
+    index = SkillIndex(PROFILES)
+    assert index.rank("Unity, C#, NOT animation") == [("Ana", 1.0)]
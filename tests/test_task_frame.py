@@ -0,0 +1,77 @@
+import pandas as pd
+from backend.task_frame import to_task_frame, dependency_lists, display_frame, task_records
+from backend.task_utils import session_tasks_view, merge_scope_edits, scope_rows, prepare_tasks_df
+
+
+def table():
+    return pd.DataFrame({
+        "Sprint": ["Sprint 1", "Sprint 1", "Sprint 2"],
+        "Task_ID": ["T1", "T2", "T3"],
+        "Task": ["Design", "Build", "Ship"],
+        "Task_Dependency": [[], "T1", ["T1", "T2", "T9"]],
+        "Start": ["2024-01-01", "2024-01-02", "2024-01-05"],
+        "End": ["2024-01-01", "2024-01-04", "2024-01-05"],
+    })
+
+
+def test_dependencies_survive_slices_and_reorders():
+    frame = to_task_frame(table())
+    assert dependency_lists(frame) == [[], ["T1"], ["T1", "T2", "T9"]]
+    assert dependency_lists(frame.iloc[::-1].iloc[:2]) == [["T1", "T2", "T9"], ["T1"]]
+    assert display_frame(frame)["Task_Dependency"].tolist() == ["", "T1", "T1, T2, T9"]
+    assert task_records(frame)[2]["Task_Dependency"] == ["T1", "T2", "T9"]
+
+
+def test_session_view_is_rebuilt_only_for_a_new_tasks_df():
+    state = {"tasks_df": to_task_frame(table())}
+    first = session_tasks_view(state)
+    cached = state["tasks_view"][1]
+    first["Extra"] = 1
+    assert "Extra" not in session_tasks_view(state).columns
+    assert state["tasks_view"][1] is cached
+    state["tasks_df"] = state["tasks_df"].assign(Resource="Ana")
+    assert session_tasks_view(state)["Resource"].tolist() == ["Ana"] * 3
+    assert state["tasks_view"][1] is not cached
+
+
+# What st.data_editor returns: kept rows keep their index labels, added rows get new ones
+def editor_result(scope, drop=(), added=()):
+    edited = scope.drop(index=list(drop))
+    new = pd.DataFrame(list(added), index=range(scope.index.max() + 1, scope.index.max() + 1 + len(added)))
+    return pd.concat([edited, new]) if len(new) else edited
+
+
+def test_merge_scope_edits():
+    full = prepare_tasks_df(table())
+    scope = scope_rows(full, "Sprint", "Sprint 1")
+    edited = editor_result(scope, drop=[0], added=[{"Task": "New", "Sprint": "Sprint 1"}])
+    edited.loc[edited["Task_ID"] == "T2", "Task"] = "Build it"
+    merged, changed, deleted = merge_scope_edits(full, scope, edited)
+    assert deleted == ["T1"]
+    assert changed == {"T2", "T4"}
+    assert merged["Task_ID"].tolist() == ["T2", "T3", "T4"]
+    assert merged.loc[merged["Task_ID"] == "T2", "Task"].item() == "Build it"
+
+
+def test_merge_scope_edits_with_repeated_and_blank_ids():
+    df = table()
+    df["Task_ID"] = ["T1", "T1", ""]
+    full = prepare_tasks_df(df)
+    edited = editor_result(full, drop=[0], added=[{"Task": "New", "Sprint": "Sprint 2"}])
+    edited.loc[2, "Task"] = "Ship it"
+    merged, changed, deleted = merge_scope_edits(full, full, edited)
+    assert merged["Task"].tolist() == ["Build", "Ship it", "New"]
+    assert merged["Task_ID"].tolist() == ["T1", "", "T2"]
+    assert changed == {"", "T2"}
+    # The other T1 row is still there, so nothing is deleted by id
+    assert deleted == []
+
+
+def test_merge_scope_edits_renamed_id_is_deleted():
+    full = prepare_tasks_df(table())
+    edited = full.copy()
+    edited.loc[0, "Task_ID"] = "T7"
+    merged, changed, deleted = merge_scope_edits(full, full, edited)
+    assert merged["Task_ID"].tolist() == ["T7", "T2", "T3"]
+    assert changed == {"T7"}
+    assert deleted == ["T1"]
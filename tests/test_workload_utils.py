@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+from backend.workload_utils import workload_rows, update_project_workload, load_workload
+
+mongomock = pytest.importorskip("mongomock")
+
+
+def tasks(rows):
+    return pd.DataFrame(rows, columns=["Resource", "Start", "End"])
+
+
+def test_rows_count_distinct_working_days_per_week():
+    df = tasks([
+        ("Ann", "2024-01-05", "2024-01-09"),  # Fri, then Mon-Tue of the next week
+        ("Bob", "2024-01-08", "2024-01-09"),
+        ("Bob", "2024-01-09", "2024-01-10"),  # overlaps Bob's other task on Tuesday
+        ("", "2024-01-08", "2024-01-09"),
+        ("Ann", None, "2024-01-09"),
+    ])
+    rows = {(r["resource"], r["week"]): (r["tasks"], r["busy_days"]) for r in workload_rows("demo", df)}
+    assert rows == {("Ann", "2024-W01"): (1, 1), ("Ann", "2024-W02"): (1, 2), ("Bob", "2024-W02"): (2, 3)}
+
+
+def test_saves_replace_a_project_and_load_sums_projects():
+    db = mongomock.MongoClient()["db"]
+    week = ("2024-01-08", "2024-01-12")
+    update_project_workload(db, "alpha", tasks([("Ann", *week), ("Bob", "2024-01-08", "2024-01-08")]))
+    update_project_workload(db, "beta", tasks([("Ann", "2024-01-10", "2024-01-11")]))
+    # Saving alpha again replaces its rows instead of adding to them
+    update_project_workload(db, "alpha", tasks([("Ann", *week)]))
+    summary = load_workload(db)
+    assert summary[["Resource", "Busy Days", "Projects", "Overbooked"]].values.tolist() == [["Ann", 7, "alpha, beta", True]]
+    assert load_workload(db, since="2024-01-15").empty